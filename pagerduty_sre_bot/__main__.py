@@ -5,13 +5,17 @@ import signal
 import sys
 
 from pagerduty_sre_bot.cli import parse_args
+from pagerduty_sre_bot.clients import missing_credentials
 from pagerduty_sre_bot.config import load_config, is_dry_run
 from pagerduty_sre_bot.output import cprint, print_rule
-from pagerduty_sre_bot.history import load_history, save_history
-from pagerduty_sre_bot.compression import compress_history
+from pagerduty_sre_bot.history import load_history
 from pagerduty_sre_bot.monitoring import start_monitoring, stop_monitoring
-from pagerduty_sre_bot.conversation import run_conversation
+from pagerduty_sre_bot import conversation
+from pagerduty_sre_bot.conversation import get_turn_stats, run_conversation
 from pagerduty_sre_bot.cache import cache_clear
+from pagerduty_sre_bot import (
+    answer_cache, fast_path, history_worker, metrics, prefetch, result_store, tool_registry, tool_router,
+)
 
 HELP_TEXT = """
 ╔══════════════════════════════════════════════════════════════════════════╗
@@ -33,13 +37,17 @@ HELP_TEXT = """
 ║    "audit log for today" / "who was paged last 6 hours?"                 ║
 ║  COMMANDS                                                                ║
 ║    help / clear / status / cache clear / exit                            ║
+║    llm: <query>  — skip the instant table answer and ask the assistant   ║
 ╚══════════════════════════════════════════════════════════════════════════╝
 """
 
 
 def print_status(args, config):
     from pagerduty_sre_bot.cache import cache_size
+    from pagerduty_sre_bot.conversation import get_usage_stats
     from pagerduty_sre_bot.history import history_path
+    from pagerduty_sre_bot.result_store import store_size
+    from pagerduty_sre_bot.tokens import model_token_budget
 
     dry = "[bold red]ENABLED[/bold red]" if is_dry_run(args, config) else "[green]disabled[/green]"
     mon = "[green]active[/green]" if args.monitor else "[dim]off[/dim]"
@@ -49,14 +57,85 @@ def print_status(args, config):
         f"[bold]Dry-run:[/bold] {dry} | "
         f"[bold]Monitor:[/bold] {mon} | "
         f"[bold]Cached:[/bold] {cache_size()} | "
+        f"[bold]Stored results:[/bold] {store_size()} | "
         f"[bold]History:[/bold] {'disabled' if args.no_persist else str(history_path(args, config))}"
     )
+    usage = get_usage_stats()
+    pf = prefetch.get_prefetch_stats()
+    ac = answer_cache.get_answer_cache_stats()
+    cprint(
+        f"[bold]LLM calls:[/bold] {usage['calls']} | "
+        f"[bold]Tokens in/out:[/bold] {usage['input_tokens']}/{usage['output_tokens']} | "
+        f"[bold]Prompt cache:[/bold] {usage['cache_hit_rate_pct']}% hits, "
+        f"{usage['cache_read_input_tokens']} read, {usage['cache_creation_input_tokens']} written | "
+        f"[bold]Result tokens saved:[/bold] ~{usage['result_tokens_saved']} | "
+        f"[bold]Prefetch:[/bold] {pf['served']}/{pf['issued']} served | "
+        f"[bold]Answer cache:[/bold] {ac['hits']} hits, {ac['stale']} stale, {ac['entries']} entries"
+    )
+    hedge = conversation.get_hedge_stats()
+    if hedge["hedged"]:
+        cprint(
+            f"[bold]Hedging:[/bold] {hedge['hedged']} hedged ({hedge['hedge_rate_pct']}% of calls), "
+            f"primary won {hedge['primary_wins']}, fallback won {hedge['fallback_wins']}"
+        )
+    turn = get_turn_stats()
+    if turn:
+        budget = model_token_budget(config, turn["model"])
+        prompt = turn["system_tokens"] + turn["tools_tokens"] + turn["history_tokens"]
+        share = f"{round(prompt / budget * 100)}%" if budget else "n/a"
+        cprint(
+            f"[bold]Last turn:[/bold] {turn['rounds']} rounds, in/out {turn['input_tokens']}/{turn['output_tokens']}, "
+            f"cache read/write {turn['cache_read_input_tokens']}/{turn['cache_creation_input_tokens']} | "
+            f"[bold]Prompt est.:[/bold] system ~{turn['system_tokens']}, tools ~{turn['tools_tokens']}, "
+            f"history ~{turn['history_tokens']} ({share} of {budget} budget)"
+        )
+
+
+def _stop_background(args) -> None:
+    stop_monitoring()
+    if args.monitor:
+        from pagerduty_sre_bot import webhooks
+
+        webhooks.stop_receiver()
+    metrics.stop_server()
+    history_worker.shutdown()
 
 
 def main():
     args = parse_args()
     config = load_config(args.config)
     dry_run = is_dry_run(args, config)
+    tool_registry.configure_module(
+        "analytics",
+        slice_hours=config["analytics"]["slice_hours"],
+        max_workers=config["analytics"]["max_parallel_slices"],
+    )
+    conversation.configure(hedge_after_seconds=config["model"]["hedge_after_seconds"])
+    answer_cache.configure(
+        enabled=config["answer_cache"]["enabled"],
+        max_age_seconds=config["answer_cache"]["max_age_seconds"],
+        max_entries=config["answer_cache"]["max_entries"],
+    )
+    fast_path.configure(
+        enabled=config["fast_path"]["enabled"],
+        window_hours=config["defaults"]["time_window_hours"],
+    )
+    prefetch.configure(
+        enabled=config["prefetch"]["enabled"],
+        max_workers=config["prefetch"]["max_workers"],
+    )
+    result_store.configure(
+        offload_chars=config["result_store"]["offload_chars"],
+        max_entries=config["result_store"]["max_entries"],
+    )
+    tool_router.configure(
+        token_budget=config["routing"]["tool_token_budget"],
+        mode=config["routing"]["mode"],
+        top_k=config["routing"]["top_k"],
+        min_confidence=config["routing"]["min_confidence"],
+    )
+
+    metrics.configure(enabled=config["metrics"]["enabled"])
 
     model_primary = config["model"]["primary"]
     model_fallback = config["model"]["fallback"]
@@ -67,17 +146,23 @@ def main():
     cprint(f"  Dry-run : {'[bold red]ENABLED[/bold red]' if dry_run else '[green]disabled[/green]'}")
     cprint(f"  Monitor : {'[bold yellow]active[/bold yellow]' if args.monitor else '[dim]off[/dim]'}")
     cprint(f"  Config  : [dim]{args.config}[/dim]")
+    missing = missing_credentials()
+    if missing:
+        cprint(f"  [yellow]⚠  {', '.join(missing)} not set — features that need it will report an error[/yellow]")
     cprint("  Type [bold]help[/bold] for capabilities, [bold]exit[/bold] to quit\n")
 
-    conversation_history = load_history(args, config)
+    history_worker.start(load_history(args, config), args, config)
+    metrics.start_server(config)
 
     if args.monitor:
+        from pagerduty_sre_bot import webhooks  # its HTTP server is only needed with --monitor
+
         start_monitoring(config)
+        webhooks.start_receiver(config)
 
     def _shutdown(sig, frame):
         cprint("\n[yellow]Shutting down…[/yellow]")
-        stop_monitoring()
-        save_history(conversation_history, args, config)
+        _stop_background(args)
         sys.exit(0)
 
     signal.signal(signal.SIGINT, _shutdown)
@@ -107,8 +192,7 @@ def main():
 
         if q in ("exit", "quit", "q"):
             cprint("[bold]Goodbye! 👋[/bold]")
-            stop_monitoring()
-            save_history(conversation_history, args, config)
+            _stop_background(args)
             break
 
         if q in ("help", "?", "h"):
@@ -116,8 +200,8 @@ def main():
             continue
 
         if q == "clear":
-            conversation_history = []
-            save_history([], args, config)
+            history_worker.reset([])
+            result_store.store_clear()
             cprint("[green]Conversation history cleared.[/green]")
             continue
 
@@ -127,17 +211,31 @@ def main():
 
         if q == "cache clear":
             cache_clear()
+            answer_cache.answer_cache_clear()
             cprint("[green]Cache cleared.[/green]")
             continue
 
         try:
             print_rule()
-            answer, conversation_history = run_conversation(
-                query, conversation_history, config, dry_run
-            )
+            base = history_worker.current()
+            fast_answer = fast_path.try_fast_path(query)
+            if fast_answer is not None:
+                history_worker.commit(base, base + [
+                    {"role": "user", "content": query},
+                    {"role": "assistant", "content": fast_answer},
+                ])
+                print_rule()
+                continue
+            if q.startswith(fast_path.OPT_OUT_PREFIX):
+                query = query[len(fast_path.OPT_OUT_PREFIX):].strip()
+            answer, updated_history = run_conversation(query, base, config, dry_run)
             print_rule()
-            conversation_history = compress_history(conversation_history, config)
-            save_history(conversation_history, args, config)
+            # Compression and saving run on the history worker; the next prompt doesn't wait.
+            turn = get_turn_stats()
+            history_worker.commit(
+                base, updated_history,
+                overhead_tokens=turn.get("system_tokens", 0) + turn.get("tools_tokens", 0),
+            )
         except KeyboardInterrupt:
             cprint("\n[yellow]Interrupted.[/yellow]")
         except Exception as e:
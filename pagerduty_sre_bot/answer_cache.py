@@ -0,0 +1,164 @@
+"""Freshness-aware answer cache for repeated read-only questions.
+
+An answer is stored under the normalised query together with fingerprints
+of the tool results it was built from. A repeat of the question is served
+from cache only after re-running those (read-only) tool calls shows every
+fingerprint unchanged — a few PagerDuty reads instead of a full LLM loop.
+Only turns built from plain reads (list_*/get_* tools) are cached. Turns
+that used any other tool (mutating, LLM-backed, or clock-dependent like
+full_incident_analysis), hit a tool error, resolved a relative time or
+queried a window reaching up to "now", or depend on earlier conversation
+("that incident", "the first one") are never cached.
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timezone
+
+from pagerduty_sre_bot.cache import cache_bypass
+from pagerduty_sre_bot.time_utils import fmt_ts
+from pagerduty_sre_bot.tool_registry import execute_tool, is_mutating
+
+_enabled = True
+_max_age = 600.0
+_max_entries = 100
+_entries: "OrderedDict[str, dict]" = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "stale": 0, "stored": 0}
+_lock = threading.Lock()  # webhook deliveries clear the cache from another thread
+
+# Read-only tools whose results can be re-fetched and compared.
+_FINGERPRINTED_PREFIXES = ("list_", "get_")
+# Utility calls whose output is not PagerDuty data and need no revalidation.
+_UNFINGERPRINTED = {"read_result"}
+# Window arguments; a bound this close to the turn (or later) was anchored on "now".
+_WINDOW_ARGS = ("since", "until", "start", "end")
+_NOW_SLACK_SECONDS = 300
+_FILLER = {"please", "the", "a", "an", "me", "show", "tell", "give", "can", "you", "what", "what's", "whats", "is"}
+# Words that make a question depend on earlier turns.
+_CONTEXT_WORDS = {
+    "it", "its", "that", "this", "those", "these", "them", "they", "same", "previous", "above",
+    "first", "second", "third", "again", "also", "else", "more", "other",
+}
+
+
+def configure(enabled: bool, max_age_seconds: float, max_entries: int) -> None:
+    global _enabled, _max_age, _max_entries
+    _enabled = enabled
+    _max_age = max_age_seconds
+    _max_entries = max_entries
+
+
+def normalise(query: str) -> str:
+    words = re.findall(r"[a-z0-9']+", query.lower().replace("-", " "))
+    return " ".join(w for w in words if w not in _FILLER)
+
+
+def fingerprint(result) -> str:
+    return hashlib.sha1(json.dumps(result, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _cacheable_call(name: str, result) -> bool:
+    if name in _UNFINGERPRINTED:
+        return True
+    if is_mutating(name) or not name.startswith(_FINGERPRINTED_PREFIXES):
+        return False
+    return not (isinstance(result, dict) and "error" in result)
+
+
+def _relative_window(args: dict, now: float) -> bool:
+    """True if a window bound reaches the time of the turn, i.e. the query meant "until now"."""
+    for arg in _WINDOW_ARGS:
+        ts = fmt_ts(args[arg]) if isinstance(args.get(arg), str) else None
+        if ts is None:
+            continue
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+        if ts.timestamp() >= now - _NOW_SLACK_SECONDS:
+            return True
+    return False
+
+
+def _revalidate(calls: list[dict]) -> bool:
+    def unchanged(call: dict) -> bool:
+        # The resource cache could hand back the very data the answer was built from.
+        with cache_bypass():
+            result = execute_tool(call["name"], call["args"])
+        return fingerprint(result) == call["fingerprint"]
+
+    with ThreadPoolExecutor(max_workers=min(4, len(calls))) as pool:
+        return all(pool.map(unchanged, calls))
+
+
+def lookup(query: str) -> dict | None:
+    """
+    Return {"answer", "age_seconds", "revalidated"} for a fresh cached answer,
+    or None (a miss, an expired entry, or data that has changed since).
+    """
+    if not _enabled:
+        return None
+    key = normalise(query)
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            _stats["misses"] += 1
+            return None
+    age = time.time() - entry["stored_at"]
+    fresh = age <= _max_age and _revalidate(entry["calls"])
+    with _lock:
+        # A clear (webhook delivery) during revalidation means the data changed meanwhile.
+        current = _entries.get(key)
+        if not fresh or current is not entry:
+            if current is entry:
+                del _entries[key]
+            _stats["stale"] += 1
+            return None
+        _entries.move_to_end(key)
+        _stats["hits"] += 1
+    return {"answer": entry["answer"], "age_seconds": round(age), "revalidated": len(entry["calls"])}
+
+
+def store(query: str, answer: str, calls: list[tuple[str, dict, dict]]) -> bool:
+    """
+    Cache an answer built from (tool_name, args, result) calls.
+    Returns False when the turn is not cacheable.
+    """
+    if not _enabled or not answer or not calls:
+        return False
+    key = normalise(query)
+    if not key or _CONTEXT_WORDS & set(key.split()):
+        return False
+    if not all(_cacheable_call(name, result) for name, _, result in calls):
+        return False
+    # A relative window ("last 2 hours") resolved to fixed bounds must not be reused by a repeat;
+    # resolve_time calls already fail the allowlist above, this catches bounds computed from the clock.
+    now = time.time()
+    if any(_relative_window(args, now) for _, args, _ in calls):
+        return False
+    tracked = [
+        {"name": name, "args": args, "fingerprint": fingerprint(result)}
+        for name, args, result in calls if name not in _UNFINGERPRINTED
+    ]
+    if not tracked:
+        return False
+    with _lock:
+        _entries[key] = {"answer": answer, "stored_at": now, "calls": tracked}
+        _entries.move_to_end(key)
+        while len(_entries) > _max_entries:
+            _entries.popitem(last=False)
+        _stats["stored"] += 1
+    return True
+
+
+def answer_cache_clear() -> None:
+    with _lock:
+        _entries.clear()
+
+
+def get_answer_cache_stats() -> dict:
+    with _lock:
+        return {**_stats, "entries": len(_entries)}
@@ -1,11 +1,15 @@
 """TTL cache for slow-changing PagerDuty resources."""
 
+import threading
 import time
-from typing import Any, Optional
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
 
 _store: dict[str, Any] = {}
 _expiry: dict[str, float] = {}
 _default_ttl: float = 300.0
+_stats = {"hits": 0, "misses": 0}
+_local = threading.local()
 
 
 def configure(ttl_seconds: float) -> None:
@@ -13,9 +17,23 @@ def configure(ttl_seconds: float) -> None:
     _default_ttl = ttl_seconds
 
 
+@contextmanager
+def cache_bypass() -> Iterator[None]:
+    """Make cache_get miss on this thread, so reads go to PagerDuty (fresh results are still stored)."""
+    _local.bypass = True
+    try:
+        yield
+    finally:
+        _local.bypass = False
+
+
 def cache_get(key: str) -> Optional[Any]:
+    if getattr(_local, "bypass", False):
+        return None
     if key in _store and time.time() < _expiry[key]:
+        _stats["hits"] += 1
         return _store[key]
+    _stats["misses"] += 1
     return None
 
 
@@ -36,4 +54,8 @@ def cache_clear(pattern: str | None = None) -> None:
 
 
 def cache_size() -> int:
-    return len(_store)
\ No newline at end of file
+    return len(_store)
+
+
+def cache_stats() -> dict:
+    return dict(_stats)
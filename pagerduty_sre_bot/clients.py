@@ -1,39 +1,126 @@
-"""Anthropic Claude, PagerDuty REST API v2, and Events API v2 client initialization."""
+"""Anthropic Claude, PagerDuty REST API v2, and Events API v2 clients — built lazily.
+
+Importing this module constructs nothing and needs no API keys. Each client
+is created on first use by its factory:
+
+- get_pd_client(): one shared PagerDuty REST session whose connection pool is
+  sized for the worker pools that fan out API calls, so they reuse warm
+  connections instead of each opening its own
+- get_anthropic_client(): one shared, thread-safe Anthropic client
+- the Events API httpx.Client: shared, built on the first event sent
+
+`pd_client` and `anthropic_client` are proxies over those factories, so
+`from pagerduty_sre_bot.clients import pd_client` keeps working. A missing
+key raises MissingCredentialsError on first use of that client only, so
+offline and analysis-only code paths run without credentials.
+"""
 
 import os
-import httpx
+import threading
+
 from dotenv import load_dotenv
-from anthropic import Anthropic
-import pagerduty
+
+from pagerduty_sre_bot import metrics
 
 load_dotenv(".env")
 
-ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
-PAGERDUTY_API_KEY = os.getenv("PAGERDUTY_API_KEY")
 PAGERDUTY_EMAIL = os.getenv("PAGERDUTY_EMAIL", "")
 
-if not ANTHROPIC_API_KEY or not PAGERDUTY_API_KEY:
-    raise ValueError(
-        "Missing required API keys. Set ANTHROPIC_API_KEY and PAGERDUTY_API_KEY in .env"
-    )
-
-anthropic_client = Anthropic(api_key=ANTHROPIC_API_KEY)
-pd_client = pagerduty.RestApiV2Client(PAGERDUTY_API_KEY, default_from=PAGERDUTY_EMAIL)
-
 # ── Events API v2 ────────────────────────────────────
 EVENTS_API_URL = "https://events.pagerduty.com/v2/enqueue"
 CHANGE_EVENTS_API_URL = "https://events.pagerduty.com/v2/change/enqueue"
 
-_events_http = httpx.Client(timeout=30.0)
+REQUIRED_KEYS = ("ANTHROPIC_API_KEY", "PAGERDUTY_API_KEY")
+
+
+class MissingCredentialsError(ValueError):
+    pass
+
+
+def _require(name: str) -> str:
+    value = os.getenv(name)
+    if not value:
+        raise MissingCredentialsError(f"{name} is not set. Add it to .env to use this feature.")
+    return value
+
+
+def missing_credentials() -> list[str]:
+    """Names of required API keys that are not set."""
+    return [name for name in REQUIRED_KEYS if not os.getenv(name)]
+
+
+# Concurrent PagerDuty calls: analytics slices, prefetch, answer revalidation, daemon workers.
+PD_POOL_SIZE = 32
+
+_lock = threading.Lock()
+_pd = None
+_anthropic = None
+_events_http = None
+
+
+def get_pd_client():
+    """The shared PagerDuty REST client, created on first use."""
+    global _pd
+    if _pd is None:
+        with _lock:
+            if _pd is None:
+                import pagerduty
+                from requests.adapters import HTTPAdapter
+
+                client = pagerduty.RestApiV2Client(_require("PAGERDUTY_API_KEY"), default_from=PAGERDUTY_EMAIL)
+                client.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=PD_POOL_SIZE))
+                client.hooks["response"].append(metrics.record_pd_response)
+                _pd = client
+    return _pd
+
+
+def get_anthropic_client():
+    """The shared Anthropic client, created on first use."""
+    global _anthropic
+    if _anthropic is None:
+        with _lock:
+            if _anthropic is None:
+                from anthropic import Anthropic
+
+                _anthropic = Anthropic(api_key=_require("ANTHROPIC_API_KEY"))
+    return _anthropic
+
+
+def _get_events_http():
+    global _events_http
+    if _events_http is None:
+        with _lock:
+            if _events_http is None:
+                import httpx
+
+                _events_http = httpx.Client(timeout=30.0, event_hooks={"response": [metrics.record_events_response]})
+    return _events_http
+
+
+class _LazyClient:
+    """Forwards attribute access to the client its factory returns."""
+
+    def __init__(self, factory):
+        self._factory = factory
+
+    def __getattr__(self, name: str):
+        return getattr(self._factory(), name)
+
+    def __repr__(self) -> str:
+        return f"<lazy client via {self._factory.__name__}()>"
+
+
+pd_client = _LazyClient(get_pd_client)
+anthropic_client = _LazyClient(get_anthropic_client)
 
 
 def send_event_v2(routing_key: str, payload: dict) -> dict:
     """Send an event to the PagerDuty Events API v2."""
-    resp = _events_http.post(EVENTS_API_URL, json={**payload, "routing_key": routing_key})
+    resp = _get_events_http().post(EVENTS_API_URL, json={**payload, "routing_key": routing_key})
     return {"status_code": resp.status_code, "body": resp.json() if resp.status_code < 500 else resp.text}
 
 
 def send_change_event(routing_key: str, payload: dict) -> dict:
     """Send a change event to the PagerDuty Events API v2."""
-    resp = _events_http.post(CHANGE_EVENTS_API_URL, json={**payload, "routing_key": routing_key})
-    return {"status_code": resp.status_code, "body": resp.json() if resp.status_code < 500 else resp.text}
\ No newline at end of file
+    resp = _get_events_http().post(CHANGE_EVENTS_API_URL, json={**payload, "routing_key": routing_key})
+    return {"status_code": resp.status_code, "body": resp.json() if resp.status_code < 500 else resp.text}
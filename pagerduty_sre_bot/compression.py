@@ -4,23 +4,68 @@ from typing import List
 
 from pagerduty_sre_bot.clients import anthropic_client
 from pagerduty_sre_bot.output import cprint
+from pagerduty_sre_bot.tokens import estimate_history_tokens, estimate_message_tokens, model_token_budget
 
 
-def compress_history(history: List[dict], config: dict) -> List[dict]:
+def _split_point(history: List[dict], keep_tokens: int) -> int:
+    """Index where the newest messages totalling at most keep_tokens begin (never the whole history)."""
+    kept = 0
+    for i in range(len(history) - 1, 0, -1):
+        kept += estimate_message_tokens(history[i])
+        if kept > keep_tokens:
+            return i + 1
+    return 1
+
+
+def _is_prompt(message: dict) -> bool:
+    """A user prompt, as opposed to a user message carrying tool results."""
+    return message.get("role") == "user" and isinstance(message.get("content"), str)
+
+
+def _last_exchange_start(history: List[dict]) -> int:
+    """Index of the newest user prompt (not a tool result), or 0 if there is none."""
+    for i in range(len(history) - 1, -1, -1):
+        if _is_prompt(history[i]):
+            return i
+    return 0
+
+
+def _prompt_boundary(history: List[dict], split: int) -> int:
+    """Move split back to the nearest user prompt so no tool_use is separated from its tool_result."""
+    while split > 0 and not _is_prompt(history[split]):
+        split -= 1
+    return split
+
+
+def compress_history(history: List[dict], config: dict, overhead_tokens: int = 0) -> List[dict]:
     """
-    When history exceeds compress_at, summarise the oldest half into
-    a single assistant message.
+    When the estimated prompt (history plus system/tool overhead) exceeds the
+    primary model's token budget, summarise the oldest messages into a single
+    assistant message, keeping the newest half of the budget verbatim. The
+    deprecated history.compress_at, if still set, also triggers compression
+    once the history reaches that many messages.
     """
-    compress_at = config["history"]["compress_at"]
     max_messages = config["history"]["max_messages"]
+    compress_at = config["history"].get("compress_at")  # deprecated message-count trigger
     fallback_model = config["model"]["fallback"]
+    budget = model_token_budget(config, config["model"]["primary"])
 
-    if len(history) < compress_at:
+    history_tokens = estimate_history_tokens(history)
+    over_count = compress_at is not None and len(history) >= compress_at
+    if len(history) < 2 or (history_tokens + overhead_tokens <= budget and not over_count):
         return history
 
-    half = len(history) // 2
-    old_messages = history[:half]
-    new_messages = history[half:]
+    # Always keep at least the latest user/assistant exchange verbatim, even when
+    # system and tool overhead leave no room for history in the budget.
+    split = _split_point(history, max(0, budget // 2 - overhead_tokens))
+    if over_count:
+        split = max(split, len(history) // 2)  # compress_at summarised the oldest half
+    split = min(split, _last_exchange_start(history))
+    split = _prompt_boundary(history, split)
+    if split <= 0:
+        return history
+    old_messages = history[:split]
+    new_messages = history[split:]
 
     transcript = "\n".join(
         f"{m['role'].upper()}: {str(m.get('content', ''))[:500]}"
@@ -49,7 +94,10 @@ def compress_history(history: List[dict], config: dict) -> List[dict]:
             "content": f"[CONVERSATION SUMMARY — earlier context]\n{summary_text}",
         }
         compressed = [summary_message] + new_messages
-        cprint(f"[dim]Context compressed: {len(old_messages)} messages → 1 summary[/dim]")
+        cprint(
+            f"[dim]Context compressed: {len(old_messages)} messages → 1 summary "
+            f"(~{history_tokens} → ~{estimate_history_tokens(compressed)} tokens, budget {budget})[/dim]"
+        )
         return compressed
     except Exception as e:
         cprint(f"[yellow]⚠  Context compression failed: {e}. Trimming instead.[/yellow]")
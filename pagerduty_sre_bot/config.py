@@ -9,6 +9,7 @@ DEFAULT_CONFIG: dict = {
     "model": {
         "primary": "claude-sonnet-4-20250514",
         "fallback": "claude-haiku-4-5-20251001",
+        "hedge_after_seconds": 0,
     },
     "defaults": {
         "time_window_hours": 24,
@@ -21,14 +22,76 @@ DEFAULT_CONFIG: dict = {
     "monitoring": {
         "poll_interval_seconds": 60,
         "urgency_filter": "high",
+        "state_file": "monitor_state.json",
+        "dedup_capacity": 5000,
+        "max_pages_per_poll": 10,
+        "rules": [],
+        "storm": {
+            "threshold": 10,
+            "window_seconds": 60,
+            "digest_interval_seconds": 30,
+            "group_by": "service",
+            "top_examples": 3,
+        },
+    },
+    "webhooks": {
+        "enabled": False,
+        "host": "127.0.0.1",
+        "port": 8787,
+        "path": "/pagerduty",
+        "secret_env": "PAGERDUTY_WEBHOOK_SECRET",
+        "stale_after_seconds": 600,
+        "scope": {"services": [], "teams": []},
+        "backstop_poll_seconds": 900,
     },
     "cache": {
         "ttl_seconds": 300,
     },
+    "daemon": {
+        "health_host": "127.0.0.1",
+        "health_port": 8788,
+        "log_level": "info",
+        "cache_refresh_seconds": 240,
+        "report_dir": "reports",
+        "reports": [],
+        "shutdown_timeout_seconds": 30,
+    },
+    "metrics": {
+        "enabled": False,
+        "host": "127.0.0.1",
+        "port": 9464,
+    },
+    "routing": {
+        "mode": "bm25",
+        "top_k": 12,
+        "min_confidence": 4.0,
+        "tool_token_budget": 5000,
+    },
+    "answer_cache": {
+        "enabled": True,
+        "max_age_seconds": 600,
+        "max_entries": 100,
+    },
+    "fast_path": {
+        "enabled": True,
+    },
+    "prefetch": {
+        "enabled": True,
+        "max_workers": 4,
+    },
+    "result_store": {
+        "offload_chars": 8000,
+        "max_entries": 50,
+    },
+    "analytics": {
+        "slice_hours": 24,
+        "max_parallel_slices": 8,
+    },
     "history": {
         "file": "conversation_history.json",
         "max_messages": 40,
-        "compress_at": 30,
+        "token_budget": 60000,
+        "model_token_budgets": {},
     },
     "output": {
         "rich_tables": True,
@@ -55,6 +118,9 @@ def load_config(path: str) -> dict:
         with open(p) as f:
             user_cfg = yaml.safe_load(f) or {}
         cfg = _deep_merge(cfg, user_cfg)
+        if "compress_at" in cfg["history"]:
+            print("[WARN] history.compress_at is deprecated; use history.token_budget (compress_at still triggers "
+                  "compression by message count)")
     else:
         with open(p, "w") as f:
             yaml.dump(DEFAULT_CONFIG, f, default_flow_style=False)
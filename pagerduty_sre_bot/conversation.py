@@ -1,58 +1,141 @@
 """LLM conversation loop using Anthropic Claude API with tool use."""
 
 import json
-
-from anthropic import APIStatusError, APIConnectionError
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 from pagerduty_sre_bot.clients import anthropic_client
-from pagerduty_sre_bot.schemas import TOOLS
-from pagerduty_sre_bot.system_prompt import SYSTEM_PROMPT
-from pagerduty_sre_bot.tool_registry import execute_tool
+from pagerduty_sre_bot.system_prompt import SYSTEM_PROMPT, CURRENT_TIME_TEMPLATE
+from pagerduty_sre_bot import answer_cache, metrics, prefetch
+from pagerduty_sre_bot.tool_registry import execute_tool, is_mutating, set_dry_run
 from pagerduty_sre_bot.tool_router import select_tools_for_query
 from pagerduty_sre_bot.history import sanitize_history
 from pagerduty_sre_bot.time_utils import now_utc
-from pagerduty_sre_bot.output import cprint, RICH_AVAILABLE, console
+from pagerduty_sre_bot.output import cprint, render_markdown, StreamRenderer
+from pagerduty_sre_bot.result_encoder import encode_result
+from pagerduty_sre_bot.result_store import offload
+from pagerduty_sre_bot.tokens import estimate_history_tokens, estimate_tokens
 
-try:
-    from rich.markdown import Markdown
-except ImportError:
-    Markdown = None
 
+# ── Prompt Caching ────────────────────────────────────
+# Anthropic caches the prompt prefix in order tools → system → messages.
+# Breakpoints go on the last tool and on the static system text; the
+# per-turn clock is appended after them so it never invalidates the cache.
 
-# ── Schema Converter ──────────────────────────────────
-# Our schemas.py uses OpenAI/Groq format. Anthropic needs a different shape.
+_CACHE_CONTROL = {"type": "ephemeral"}
 
-def _convert_tools_to_anthropic(tools: list[dict]) -> list[dict]:
-    """
-    Convert OpenAI-style tool schemas to Anthropic format.
+_usage: dict[str, int] = {
+    "calls": 0,
+    "cache_hits": 0,
+    "input_tokens": 0,
+    "output_tokens": 0,
+    "cache_read_input_tokens": 0,
+    "cache_creation_input_tokens": 0,
+    "result_tokens_saved": 0,
+}
+_usage_lock = threading.Lock()  # hedge losers record from worker threads
+
+
+_TOKEN_KINDS = {
+    "input_tokens": "input",
+    "output_tokens": "output",
+    "cache_read_input_tokens": "cache_read",
+    "cache_creation_input_tokens": "cache_write",
+}
+
+# Token accounting for the most recent turn: estimated prompt composition
+# (system, tools, history) next to the API's measured usage.
+_last_turn: dict = {}
+
+
+def _with_cache_breakpoint(tools: list[dict]) -> list[dict]:
+    """Mark the end of the tool list as a cache breakpoint."""
+    if not tools:
+        return tools
+    return tools[:-1] + [{**tools[-1], "cache_control": _CACHE_CONTROL}]
 
-    OpenAI:  {"type":"function","function":{"name":"x","description":"y","parameters":{...}}}
-    Anthropic: {"name":"x","description":"y","input_schema":{...}}
+
+def _build_system(static_prompt: str, current_time: str) -> list[dict]:
+    return [
+        {"type": "text", "text": static_prompt, "cache_control": _CACHE_CONTROL},
+        {"type": "text", "text": CURRENT_TIME_TEMPLATE.format(current_time=current_time)},
+    ]
+
+
+def _record_usage(response, answered: bool = True) -> dict:
     """
-    converted = []
-    for t in tools:
-        fn = t.get("function", {})
-        converted.append({
-            "name": fn["name"],
-            "description": fn.get("description", ""),
-            "input_schema": fn.get("parameters", {"type": "object", "properties": {}}),
-        })
-    return converted
+    Accumulate token and prompt-cache usage from a response; returns this call's
+    numbers. Abandoned hedge requests (answered=False) add their tokens but are
+    not counted as calls.
+    """
+    usage = getattr(response, "usage", None)
+    call = {
+        k: getattr(usage, k, 0) or 0
+        for k in ("input_tokens", "output_tokens", "cache_read_input_tokens", "cache_creation_input_tokens")
+    }
+    with _usage_lock:
+        if answered:
+            _usage["calls"] += 1
+            if call["cache_read_input_tokens"]:
+                _usage["cache_hits"] += 1
+        for k, v in call.items():
+            _usage[k] += v
+    model = getattr(response, "model", None) or "unknown"
+    metrics.inc("pdbot_llm_calls_total", model=model)
+    for k, kind in _TOKEN_KINDS.items():
+        metrics.inc("pdbot_llm_tokens_total", call[k], model=model, kind=kind)
+    return call
+
+
+def get_usage_stats() -> dict:
+    """Session-wide LLM token usage and prompt-cache statistics."""
+    stats = dict(_usage)
+    prompt_total = stats["input_tokens"] + stats["cache_read_input_tokens"] + stats["cache_creation_input_tokens"]
+    stats["cache_hit_rate_pct"] = round(stats["cache_hits"] / stats["calls"] * 100, 1) if stats["calls"] else 0.0
+    stats["cached_prompt_pct"] = round(stats["cache_read_input_tokens"] / prompt_total * 100, 1) if prompt_total else 0.0
+    return stats
+
+
+def get_turn_stats() -> dict:
+    """Token accounting for the most recent turn (empty before the first turn)."""
+    return dict(_last_turn)
+
+
+# ── Latency Hedging ───────────────────────────────
+# When enabled, a request to the fallback model is raced against a slow primary.
+
+_hedge_after_seconds = 0.0  # 0 disables hedging
+_hedge_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="llm-hedge")
+_hedge_stats: dict[str, int] = {"hedged": 0, "primary_wins": 0, "fallback_wins": 0}
+
+
+def configure(hedge_after_seconds: float) -> None:
+    global _hedge_after_seconds
+    _hedge_after_seconds = hedge_after_seconds
+
+
+def get_hedge_stats() -> dict:
+    stats = dict(_hedge_stats)
+    calls = _usage["calls"]
+    stats["hedge_rate_pct"] = round(stats["hedged"] / calls * 100, 1) if calls else 0.0
+    return stats
 
 
 # ── LLM Call ──────────────────────────────────────────
 
 def _call_claude(
-        system: str,
+        system: str | list,
         messages: list,
         model: str,
         fallback_model: str | None = None,
         tools: list | None = None,
         max_tokens: int = 4096,
+        stream_to: StreamRenderer | None = None,
 ):
     """
     Call Anthropic Claude API with tool use.
-    Falls back to fallback_model on failure.
+    With stream_to, uses the streaming API and renders text deltas as they arrive.
+    Falls back to fallback_model on failure, and hedges to it when the primary is slow.
     """
     kwargs = dict(
         model=model,
@@ -64,16 +147,153 @@ def _call_claude(
         kwargs["tools"] = tools
         kwargs["tool_choice"] = {"type": "auto"}
 
+    if _hedge_after_seconds and fallback_model and model != fallback_model:
+        return _hedged_create(kwargs, fallback_model, stream_to)
     try:
-        return anthropic_client.messages.create(**kwargs)
-    except (APIStatusError, APIConnectionError) as e:
+        return _create_message(kwargs, stream_to)
+    except _api_errors() as e:
         if fallback_model and model != fallback_model:
-            cprint(f"[yellow]⚠  Primary model failed ({e}), falling back to {fallback_model}…[/yellow]")
-            kwargs["model"] = fallback_model
-            return anthropic_client.messages.create(**kwargs)
+            return _fall_back(kwargs, fallback_model, stream_to, e)
         raise
 
 
+def _api_errors() -> tuple:
+    # Imported here, not at module load, so anthropic stays off the startup path.
+    from anthropic import APIConnectionError, APIStatusError
+    return APIStatusError, APIConnectionError
+
+
+def _fall_back(kwargs: dict, fallback_model: str, stream_to: StreamRenderer | None, error: Exception):
+    if stream_to is not None:
+        stream_to.end_block()
+    cprint(f"[yellow]⚠  Primary model failed ({error}), falling back to {fallback_model}…[/yellow]")
+    return _create_message({**kwargs, "model": fallback_model}, stream_to)
+
+
+def _create_message(kwargs: dict, stream_to: StreamRenderer | None, claim=None, opened=None):
+    """
+    Blocking create, or a streamed request assembled into the same final Message.
+    With claim (hedging) the request is always streamed, and the first content
+    event must win claim() before anything is rendered; a losing stream returns
+    None, closing its connection. opened(stream) lets the hedge close it early.
+    """
+    if stream_to is None and claim is None:
+        return anthropic_client.messages.create(**kwargs)
+    with anthropic_client.messages.stream(**kwargs) as stream:
+        if opened is not None:
+            opened(stream)
+        claimed = claim is None
+        for event in stream:
+            if not claimed and event.type in ("content_block_start", "text"):
+                if not claim():
+                    return None
+                claimed = True
+            if stream_to is None:
+                continue
+            if event.type == "text":
+                stream_to.feed(event.text)
+            elif event.type == "content_block_start" and event.content_block.type == "tool_use":
+                # Tool-use round: close any preamble text so tool lines print cleanly.
+                stream_to.end_block()
+        final = stream.get_final_message()
+    if stream_to is not None:
+        stream_to.end_block()
+    return final
+
+
+def _record_abandoned(stream) -> None:
+    """Count the tokens a closed hedge loser was billed for (input, plus any output so far)."""
+    try:
+        message = stream.current_message_snapshot
+    except Exception:
+        return  # closed before the message started
+    _record_usage(message, answered=False)
+
+
+def _hedged_create(kwargs: dict, fallback_model: str, stream_to: StreamRenderer | None):
+    """
+    Start the primary request; if it has produced neither a response nor a first
+    token within the hedge threshold, also start the fallback model. Both are
+    streamed; the first to produce content wins and the other stream is closed
+    at once, with whatever it was billed recorded in the token stats. Leaving
+    early (an error or KeyboardInterrupt) closes every open stream.
+
+    A primary that fails before the hedge starts falls back like an unhedged
+    call. Once both models have been tried, the last error is raised as is.
+    """
+    lock = threading.Lock()
+    winner: dict = {}
+    streams: dict = {}
+    started = threading.Event()
+
+    def close_losers() -> None:
+        with lock:
+            losers = [s for m, s in streams.items() if m != winner.get("model")]
+        for s in losers:
+            s.close()
+
+    def attempt(model: str):
+        def claim() -> bool:
+            with lock:
+                winner.setdefault("model", model)
+                started.set()
+                won = winner["model"] == model
+            if won:
+                close_losers()
+            return won
+
+        def opened(stream) -> None:
+            with lock:
+                streams[model] = stream
+                lost = "model" in winner and winner["model"] != model
+            if lost:
+                stream.close()
+
+        try:
+            response = _create_message({**kwargs, "model": model}, stream_to, claim, opened)
+        except Exception:
+            with lock:
+                lost = "model" in winner and winner["model"] != model
+            if not lost:
+                raise
+            response = None  # closed under us by the winner
+        if response is None and model in streams:
+            _record_abandoned(streams[model])
+        return response
+
+    try:
+        primary = _hedge_pool.submit(attempt, kwargs["model"])
+        primary.add_done_callback(lambda _: started.set())
+        if started.wait(_hedge_after_seconds):
+            try:
+                return primary.result()
+            except _api_errors() as e:
+                return _fall_back(kwargs, fallback_model, stream_to, e)
+
+        _hedge_stats["hedged"] += 1
+        cprint(f"[dim]  Primary slow (>{_hedge_after_seconds:g}s), hedging with {fallback_model}…[/dim]")
+        pending = {primary, _hedge_pool.submit(attempt, fallback_model)}
+        error: Exception | None = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                try:
+                    response = fut.result()
+                except Exception as e:
+                    error = e
+                    continue
+                if response is not None:
+                    won = "fallback_wins" if winner.get("model") == fallback_model else "primary_wins"
+                    _hedge_stats[won] += 1
+                    return response
+        raise error or RuntimeError("Hedged request produced no response")
+    finally:
+        # Nothing may claim after we leave; streams still running are closed.
+        with lock:
+            winner.setdefault("model", None)
+        close_losers()
+
+
 def _extract_text(response) -> str:
     """Extract all text content from a Claude response."""
     parts = []
@@ -117,38 +337,53 @@ def run_conversation(
     Run one conversation turn using Claude.
     Returns (answer_text, updated_history).
     """
-    # Propagate dry_run to all tool modules that have destructive operations
-    from pagerduty_sre_bot.tools import (
-        incidents, services, users, teams, escalation, schedules,
-        maintenance, config_resources, events, alerts, status_updates,
-        custom_fields, automation, orchestration,
-    )
-    for mod in (
-            incidents, services, users, teams, escalation, schedules,
-            maintenance, config_resources, events, alerts, status_updates,
-            custom_fields, automation, orchestration,
-    ):
-        mod.set_dry_run(dry_run)
+    # Propagate dry_run to tool modules with destructive operations (loaded now or later)
+    set_dry_run(dry_run)
 
     now = now_utc()
     model_primary = config["model"]["primary"]
     model_fallback = config["model"]["fallback"]
 
-    system = SYSTEM_PROMPT.format(
-        current_time=now.strftime("%Y-%m-%dT%H:%M:%SZ"),
-        dry_run_status="ENABLED" if dry_run else "disabled",
+    system = _build_system(
+        SYSTEM_PROMPT.format(dry_run_status="ENABLED" if dry_run else "disabled"),
+        now.strftime("%Y-%m-%dT%H:%M:%SZ"),
     )
 
     # Build messages — Claude uses system separately, not as a message
     messages = list(conversation_history)
     messages.append({"role": "user", "content": user_query})
 
-    # Select and convert tools for this query
-    active_tools_openai = select_tools_for_query(user_query)
-    active_tools = _convert_tools_to_anthropic(active_tools_openai)
+    cached = answer_cache.lookup(user_query)
+    if cached is not None:
+        cprint("\n[bold blue]🤖 Assistant:[/bold blue]")
+        render_markdown(cached["answer"])
+        cprint(
+            f"[dim]  Answered from cache (age {cached['age_seconds']}s, "
+            f"{cached['revalidated']} tool results revalidated), no LLM calls[/dim]"
+        )
+        messages.append({"role": "assistant", "content": cached["answer"]})
+        return cached["answer"], sanitize_history(messages)
+
+    # Select precompiled tool bundles for this query and warm likely data during the first round
+    active_tools = _with_cache_breakpoint(select_tools_for_query(user_query))
+    prefetch.start(user_query, [t["name"] for t in active_tools])
 
     rounds = 0
     answer = ""
+    renderer = StreamRenderer(header="\n[bold blue]🤖 Assistant:[/bold blue]")
+    turn_usage = {"input_tokens": 0, "output_tokens": 0, "cache_read_input_tokens": 0, "cache_creation_input_tokens": 0}
+    turn_saved = 0
+    turn_calls: list[tuple[str, dict, dict]] = []
+    _last_turn.clear()
+    _last_turn.update(
+        turn_usage,
+        model=model_primary,
+        rounds=0,
+        result_tokens_saved=0,
+        system_tokens=estimate_tokens(system),
+        tools_tokens=estimate_tokens(active_tools),
+        history_tokens=estimate_history_tokens(messages),
+    )
 
     while rounds < 10:
         rounds += 1
@@ -159,19 +394,18 @@ def run_conversation(
             model=model_primary,
             fallback_model=model_fallback,
             tools=active_tools,
+            stream_to=renderer,
         )
+        for k, v in _record_usage(response).items():
+            turn_usage[k] += v
 
         if not _has_tool_use(response):
-            # Final answer — no more tool calls
+            # Final answer — already rendered incrementally while streaming
             answer = _extract_text(response)
             messages.append({"role": "assistant", "content": answer})
-
-            cprint("\n[bold blue]🤖 Assistant:[/bold blue]")
-            if answer:
-                if RICH_AVAILABLE and Markdown:
-                    console.print(Markdown(answer))
-                else:
-                    print(answer)
+            answer_cache.store(user_query, answer, turn_calls)
+            if not renderer.started:
+                cprint("\n[bold blue]🤖 Assistant:[/bold blue]")
             break
 
         # ── Process tool calls ──────────────────────────
@@ -189,14 +423,19 @@ def run_conversation(
             tool_use_id = block.id
 
             preview = json.dumps(fn_args, default=str)[:120]
-            cprint(f"  [cyan]⚙  {fn_name}[/cyan]([dim]{preview}…[/dim])")
-
-            result = execute_tool(fn_name, fn_args)
-            result_str = json.dumps(result, indent=2, default=str)
-
-            # Truncate very large results
-            if len(result_str) > 28000:
-                result_str = result_str[:28000] + "\n…[result truncated to fit context]"
+            result = prefetch.take(fn_name, fn_args)
+            source = " [dim](prefetched)[/dim]" if result is not None else ""
+            cprint(f"  [cyan]⚙  {fn_name}[/cyan]([dim]{preview}…[/dim]){source}")
+
+            if result is None:
+                result = execute_tool(fn_name, fn_args)
+            turn_calls.append((fn_name, fn_args, result))
+            if is_mutating(fn_name):
+                prefetch.reset()  # speculative reads may now be stale
+            # Large results are stored out of band behind a preview; anything still
+            # oversized is reduced structurally and stays valid JSON.
+            result_str, saved = encode_result(offload(fn_name, result))
+            turn_saved += saved
 
             tool_results.append({
                 "type": "tool_result",
@@ -210,6 +449,18 @@ def run_conversation(
     else:
         answer = "I reached the maximum tool-call rounds. Please try a more specific question."
 
+    prefetch.reset()
+    _usage["result_tokens_saved"] += turn_saved
+    _last_turn.update(turn_usage, rounds=rounds, result_tokens_saved=turn_saved)
+    metrics.observe("pdbot_llm_rounds", rounds)
+    if turn_usage["cache_read_input_tokens"] or turn_usage["cache_creation_input_tokens"] or turn_saved:
+        cprint(
+            f"[dim]  Tokens: in={turn_usage['input_tokens']} out={turn_usage['output_tokens']} "
+            f"cache_read={turn_usage['cache_read_input_tokens']} "
+            f"cache_write={turn_usage['cache_creation_input_tokens']} "
+            f"result_saved≈{turn_saved}[/dim]"
+        )
+
     # Sanitize for persistence: keep only user text + assistant text
     updated_history = sanitize_history(messages)
     return answer, updated_history
\ No newline at end of file
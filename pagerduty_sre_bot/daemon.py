@@ -0,0 +1,330 @@
+"""Headless monitoring daemon — one asyncio event loop, no TTY.
+
+    python -m pagerduty_sre_bot.daemon --config config.yml
+
+Runs the monitor's watch rules (polling, plus the webhook receiver when
+enabled), scheduled read-only reports and cache refreshers as tasks on a
+single event loop. Blocking PagerDuty calls run in worker threads via
+asyncio.to_thread. Logs are JSON lines on stdout. GET /healthz on the health
+port reports liveness (503 once polling has stalled), and GET /metrics serves
+the Prometheus metrics when they are enabled. SIGTERM/SIGINT stop the tasks,
+flush any pending storm digest and exit cleanly. An invalid monitoring or
+report config exits with status 2 before anything starts; a task that dies
+is logged and stops the daemon with status 1.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import signal
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from pagerduty_sre_bot import metrics, monitoring, webhooks
+from pagerduty_sre_bot.cache import cache_clear
+from pagerduty_sre_bot.clients import missing_credentials
+from pagerduty_sre_bot.config import load_config
+from pagerduty_sre_bot.time_utils import iso_hours_ago, iso_now
+from pagerduty_sre_bot.tool_registry import TOOL_MODULES, execute_tool, is_mutating
+
+log = logging.getLogger("pagerduty_sre_bot.daemon")
+
+# Resource caches kept warm for reports and rule evaluation: cache key prefix → list tool.
+_REFRESHED = {"services:": "list_services", "users:": "list_users"}
+
+_health: dict = {
+    "started_at": time.time(),
+    "polls": 0,
+    "poll_errors": 0,
+    "consecutive_errors": 0,
+    "last_poll_at": None,
+    "reports": {},
+    "cache_refreshes": 0,
+}
+
+
+class _JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(record.created)),
+            "level": record.levelname.lower(),
+            "event": record.getMessage(),
+            **getattr(record, "fields", {}),
+        }
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def _log(event: str, level: int = logging.INFO, **fields) -> None:
+    log.log(level, event, extra={"fields": fields})
+
+
+def _setup_logging(level: str) -> None:
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(_JsonFormatter())
+    log.handlers[:] = [handler]
+    log.setLevel(level.upper())
+    log.propagate = False
+
+
+async def _sleep_or_stop(stop: asyncio.Event, seconds: float) -> bool:
+    """Wait up to `seconds`; True if stop was requested meanwhile."""
+    try:
+        await asyncio.wait_for(stop.wait(), timeout=seconds)
+    except asyncio.TimeoutError:
+        return False
+    return True
+
+
+# ── Tasks ─────────────────────────────────────────────
+
+async def _watch(config: dict, state: dict, stop: asyncio.Event) -> None:
+    poll = config["monitoring"]["poll_interval_seconds"]
+    _log(
+        "monitor_started", poll_interval_seconds=poll, rules=state["rules"],
+        urgencies=state["urgencies"] or "any", watermark=state["watermark"],
+    )
+    while not stop.is_set():
+        if monitoring.poll_due():
+            try:
+                fetched = await asyncio.to_thread(monitoring.poll_once, state)
+                _health.update(polls=_health["polls"] + 1, consecutive_errors=0, last_poll_at=time.time())
+                _log("poll", logging.DEBUG, fetched=fetched, watermark=state["watermark"])
+            except Exception as e:
+                _health["poll_errors"] += 1
+                _health["consecutive_errors"] += 1
+                _log("poll_error", logging.WARNING, error=str(e))
+        if await _sleep_or_stop(stop, poll):
+            break
+    monitoring.flush_storm(force=True)
+    _log("monitor_stopped")
+
+
+async def _flush_digests(stop: asyncio.Event) -> None:
+    while not await _sleep_or_stop(stop, 1):
+        monitoring.flush_storm()
+
+
+def _positive(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
+
+
+def validate_reports(reports) -> None:
+    """Raise ValueError for the first malformed daemon.reports entry, so a bad schedule fails at startup."""
+    if not isinstance(reports, list):
+        raise ValueError("daemon.reports must be a list")
+    names: set[str] = set()
+    for i, report in enumerate(reports):
+        where = f"daemon.reports[{i}]"
+        if not isinstance(report, dict):
+            raise ValueError(f"{where} must be a mapping")
+        name = report.get("name")
+        if not isinstance(name, str) or not name:
+            raise ValueError(f"{where}: name is required")
+        if name in names:
+            raise ValueError(f"{where}: duplicate report name '{name}'")
+        names.add(name)
+        if report.get("tool") not in TOOL_MODULES:
+            raise ValueError(f"{where} ({name}): unknown tool '{report.get('tool')}'")
+        if not _positive(report.get("interval_seconds")):
+            raise ValueError(f"{where} ({name}): interval_seconds must be a positive number")
+        if "window_hours" in report and not _positive(report["window_hours"]):
+            raise ValueError(f"{where} ({name}): window_hours must be a positive number")
+        if not isinstance(report.get("args") or {}, dict):
+            raise ValueError(f"{where} ({name}): args must be a mapping")
+
+
+def _run_report(report: dict, report_dir: Path) -> Path:
+    args = dict(report.get("args") or {})
+    if report.get("window_hours"):
+        args.setdefault("since", iso_hours_ago(report["window_hours"]))
+        args.setdefault("until", iso_now())
+    result = execute_tool(report["tool"], args)
+    if isinstance(result, dict) and "error" in result:
+        raise RuntimeError(result["error"])
+    report_dir.mkdir(parents=True, exist_ok=True)
+    path = report_dir / f"{report['name']}-{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}.json"
+    path.write_text(json.dumps({"report": report["name"], "tool": report["tool"], "args": args, "result": result},
+                               indent=2, default=str))
+    return path
+
+
+async def _report(report: dict, report_dir: Path, stop: asyncio.Event) -> None:
+    name = report["name"]
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            path = await asyncio.to_thread(_run_report, report, report_dir)
+            _health["reports"][name] = {"last_run_at": time.time(), "ok": True}
+            _log("report", name=name, path=str(path), seconds=round(time.perf_counter() - started, 2))
+        except Exception as e:
+            _health["reports"][name] = {"last_run_at": time.time(), "ok": False, "error": str(e)}
+            _log("report_error", logging.WARNING, name=name, error=str(e))
+        if await _sleep_or_stop(stop, report["interval_seconds"]):
+            break
+
+
+def _refresh_caches() -> None:
+    for prefix, tool in _REFRESHED.items():
+        cache_clear(prefix)
+        result = execute_tool(tool, {})
+        if isinstance(result, dict) and "error" in result:
+            raise RuntimeError(f"{tool}: {result['error']}")
+
+
+async def _refresh(interval: float, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        try:
+            await asyncio.to_thread(_refresh_caches)
+            _health["cache_refreshes"] += 1
+            _log("cache_refreshed", logging.DEBUG, caches=list(_REFRESHED.values()))
+        except Exception as e:
+            _log("cache_refresh_error", logging.WARNING, error=str(e))
+        if await _sleep_or_stop(stop, interval):
+            break
+
+
+# ── Health endpoint ───────────────────────────────────
+
+def health(poll_interval: float) -> tuple[int, dict]:
+    """(HTTP status, body): 503 once no poll has succeeded for three intervals and push is not live."""
+    now = time.time()
+    last = _health["last_poll_at"] or _health["started_at"]
+    stalled = now - last > 3 * poll_interval and not monitoring.push_healthy()
+    body = {
+        "status": "degraded" if stalled else "ok",
+        "uptime_seconds": round(now - _health["started_at"]),
+        "seconds_since_poll": round(now - _health["last_poll_at"]) if _health["last_poll_at"] else None,
+        "push_active": monitoring.push_healthy(),
+        **{k: v for k, v in _health.items() if k not in ("started_at", "last_poll_at")},
+    }
+    return (503 if stalled else 200), body
+
+
+async def _serve_http(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, poll_interval: float) -> None:
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+        while (await asyncio.wait_for(reader.readline(), timeout=5)) not in (b"\r\n", b"\n", b""):
+            pass  # headers are not needed
+        parts = request_line.decode("latin-1").split()
+        path = parts[1].split("?")[0] if len(parts) > 1 else ""
+        if path == "/healthz":
+            status, body = health(poll_interval)
+            payload, ctype = json.dumps(body).encode(), "application/json"
+        elif path == "/metrics":
+            status, payload, ctype = 200, metrics.render().encode(), "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            status, payload, ctype = 404, b"not found\n", "text/plain"
+        reason = {200: "OK", 404: "Not Found", 503: "Service Unavailable"}[status]
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\nContent-Type: {ctype}\r\n"
+            f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode() + payload
+        )
+        await writer.drain()
+    except (asyncio.TimeoutError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+# ── Main ──────────────────────────────────────────────
+
+def _watch_task(task: asyncio.Task, stop: asyncio.Event, failed: list[str]) -> None:
+    """Done-callback: a task that dies outside shutdown is logged and stops the daemon."""
+    if task.cancelled() or task.exception() is None:
+        return
+    failed.append(task.get_name())
+    _log("task_died", logging.ERROR, task=task.get_name(), error=repr(task.exception()))
+    stop.set()
+
+
+async def run(config: dict) -> int:
+    """
+    Run every daemon task on this event loop until SIGTERM/SIGINT or a task
+    dies. Returns the exit code: 0 on a clean stop, 1 if a task died, 2 if the
+    monitoring config (watch rules, storm settings) or a scheduled report is invalid.
+    """
+    cfg = config["daemon"]
+    poll = config["monitoring"]["poll_interval_seconds"]
+    try:
+        validate_reports(cfg["reports"])
+    except ValueError as e:
+        _log("invalid_report_config", logging.ERROR, error=str(e))
+        return 2
+    # Rules are compiled before anything listens, so a bad config fails fast
+    # and early webhook deliveries are never dropped for want of rules.
+    try:
+        state = await asyncio.to_thread(monitoring.setup_polling, config)
+    except Exception as e:  # re.error from a title_regex, ValueError from storm.group_by, ...
+        _log("invalid_monitoring_config", logging.ERROR, error=str(e))
+        return 2
+
+    stop = asyncio.Event()
+    failed: list[str] = []
+    _health["started_at"] = time.time()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    monitoring.set_event_sink(lambda event, fields: _log(event, **fields))
+    metrics.configure(enabled=config["metrics"]["enabled"])
+    server = await asyncio.start_server(
+        lambda r, w: _serve_http(r, w, poll), cfg["health_host"], cfg["health_port"],
+    )
+    _log("health_listening", url=f"http://{cfg['health_host']}:{cfg['health_port']}/healthz")
+    await asyncio.to_thread(webhooks.start_receiver, config)
+
+    tasks = [
+        asyncio.create_task(_watch(config, state, stop), name="watch"),
+        asyncio.create_task(_flush_digests(stop), name="digests"),
+    ]
+    report_dir = Path(cfg["report_dir"])
+    for report in cfg["reports"]:
+        if is_mutating(report["tool"]):
+            _log("report_skipped", logging.WARNING, name=report["name"], reason="mutating tool")
+            continue
+        tasks.append(asyncio.create_task(_report(report, report_dir, stop), name=f"report:{report['name']}"))
+    if cfg["cache_refresh_seconds"]:
+        tasks.append(asyncio.create_task(_refresh(cfg["cache_refresh_seconds"], stop), name="cache-refresh"))
+    for t in tasks:
+        t.add_done_callback(lambda task: _watch_task(task, stop, failed))
+    _log("daemon_started", tasks=[t.get_name() for t in tasks])
+
+    await stop.wait()
+    _log("daemon_stopping")
+    try:
+        # Tasks finish their current step (a poll or report in a worker thread) and exit.
+        await asyncio.wait_for(
+            asyncio.gather(*tasks, return_exceptions=True), timeout=cfg["shutdown_timeout_seconds"],
+        )
+    except asyncio.TimeoutError:
+        for t in tasks:
+            t.cancel()
+        _log("daemon_shutdown_timeout", logging.WARNING)
+    webhooks.stop_receiver()
+    server.close()
+    await server.wait_closed()
+    monitoring.set_event_sink(None)
+    _log("daemon_stopped", failed_tasks=failed)
+    return 1 if failed else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Headless PagerDuty monitoring daemon")
+    parser.add_argument("--config", default="config.yml", help="Path to YAML config file (default: config.yml)")
+    args = parser.parse_args()
+
+    load_dotenv(".env")
+    config = load_config(args.config)
+    _setup_logging(config["daemon"]["log_level"])
+    if "PAGERDUTY_API_KEY" in missing_credentials():
+        _log("missing_credentials", logging.ERROR, keys=["PAGERDUTY_API_KEY"])
+        sys.exit(2)
+    sys.exit(asyncio.run(run(config)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Bounded, insertion-ordered dedup store for the monitor's seen incidents.
+
+A fixed-size ring buffer of (id, created_at) plus a hash index from id to
+slot: insert, lookup and eviction are O(1), memory is bounded by capacity,
+and eviction always removes the oldest insertion (never a random ID).
+Entries also expire by incident age from the head of the ring.
+"""
+
+
+class DedupStore:
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self._ids: list[str | None] = [None] * capacity
+        self._times: list[str] = [""] * capacity
+        self._index: dict[str, int] = {}
+        self._head = 0  # oldest entry
+        self._size = 0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _pop_head(self) -> None:
+        old = self._ids[self._head]
+        if old is not None:
+            del self._index[old]
+        self._ids[self._head] = None
+        self._head = (self._head + 1) % len(self._ids)
+        self._size -= 1
+
+    def add(self, key: str, created_at: str) -> bool:
+        """Record key; returns False if it was already present. Evicts the oldest entry when full."""
+        if key in self._index:
+            return False
+        if self._size == len(self._ids):
+            self._pop_head()
+        slot = (self._head + self._size) % len(self._ids)
+        self._ids[slot] = key
+        self._times[slot] = created_at
+        self._index[key] = slot
+        self._size += 1
+        return True
+
+    def expire(self, older_than: str) -> int:
+        """Drop entries from the oldest end while their created_at is before older_than (ISO strings)."""
+        dropped = 0
+        while self._size and self._times[self._head] < older_than:
+            self._pop_head()
+            dropped += 1
+        return dropped
+
+    def items(self) -> list[tuple[str, str]]:
+        """(id, created_at) pairs, oldest first — for persistence."""
+        n = len(self._ids)
+        out = []
+        for i in range(self._size):
+            slot = (self._head + i) % n
+            out.append((self._ids[slot], self._times[slot]))
+        return out
@@ -0,0 +1,208 @@
+"""Deterministic fast path for common read-only queries — no LLM calls.
+
+A query is answered here only when every word belongs to a template's
+vocabulary ("who is on call right now", "show triggered incidents",
+"list high urgency incidents last 24 hours"); anything else, such as a
+service name, an incident ID or a verb like "analyze", falls through to
+the LLM. Prefixing a query with "llm:" always skips the fast path.
+"""
+
+import re
+import time
+from datetime import timedelta
+
+from pagerduty_sre_bot.output import cprint, print_table
+from pagerduty_sre_bot.result_encoder import encode_result
+from pagerduty_sre_bot.time_utils import now_utc
+from pagerduty_sre_bot.tool_registry import execute_tool
+
+OPT_OUT_PREFIX = "llm:"
+
+_enabled = True
+_window_hours = 24.0
+# Open incidents can be old; look further back unless the query gives a window.
+_OPEN_WINDOW_HOURS = 30 * 24.0
+# Keep the history copy of a fast-path answer small.
+_HISTORY_CHARS = 4000
+
+_FILLER = {
+    "show", "list", "get", "give", "me", "all", "the", "current", "currently", "right", "now",
+    "please", "what", "which", "are", "is", "there", "any", "who", "who's", "whos", "s", "our", "my",
+}
+_WINDOW_WORDS = {"from", "in", "over", "for", "during", "last", "past"}
+_UNIT_HOURS = {"h": 1, "hour": 1, "hours": 1, "hr": 1, "hrs": 1, "d": 24, "day": 24, "days": 24,
+               "week": 168, "weeks": 168}
+_STATUS_WORDS = {
+    "triggered": ["triggered"],
+    "acknowledged": ["acknowledged"],
+    "acked": ["acknowledged"],
+    "open": ["triggered", "acknowledged"],
+    "unresolved": ["triggered", "acknowledged"],
+    "active": ["triggered", "acknowledged"],
+    "resolved": ["resolved"],
+}
+_URGENCY_WORDS = {"high", "low"}
+
+
+def configure(enabled: bool, window_hours: float) -> None:
+    global _enabled, _window_hours
+    _enabled = enabled
+    _window_hours = window_hours
+
+
+def _words(query: str) -> list[str]:
+    text = query.lower().replace("-", " ")
+    text = re.sub(r"\bon\s+call\b", "oncall", text)
+    return re.findall(r"[a-z0-9']+", text)
+
+
+def _fmt(ts: str | None) -> str:
+    return (ts or "").replace("T", " ").replace("Z", "")[:16]
+
+
+# ── Templates ─────────────────────────────────────────
+
+def _oncall_args(words: list[str]) -> dict | None:
+    return {"earliest": True} if {"oncall", "oncalls"} & set(words) else None
+
+
+def _oncall_render(result: dict) -> None:
+    rows = sorted(result["oncalls"], key=lambda o: (o.get("escalation_policy") or "", o.get("escalation_level") or 0))
+    print_table(
+        f"On call now ({len(rows)})",
+        ["Escalation policy", "Level", "User", "Schedule", "Until"],
+        [[o.get("escalation_policy"), o.get("escalation_level"), o.get("user"), o.get("schedule"), _fmt(o.get("end"))]
+         for o in rows],
+    )
+
+
+def _incidents_args(words: list[str]) -> dict | None:
+    if "incidents" not in words:
+        return None
+    statuses: list[str] = []
+    urgencies: list[str] = []
+    hours = None
+    for i, w in enumerate(words):
+        if w in _STATUS_WORDS:
+            statuses.extend(s for s in _STATUS_WORDS[w] if s not in statuses)
+        elif w in _URGENCY_WORDS:
+            urgencies.append(w)
+        elif w in _UNIT_HOURS:
+            n = int(words[i - 1]) if i and words[i - 1].isdigit() else 1
+            hours = n * _UNIT_HOURS[w]
+        elif w.isdigit() and not (i + 1 < len(words) and words[i + 1] in _UNIT_HOURS):
+            return None  # a bare number is probably an incident number
+    if hours is None:
+        is_open = statuses and "resolved" not in statuses
+        hours = _OPEN_WINDOW_HOURS if is_open else _window_hours
+    now = now_utc()
+    args: dict = {
+        "since": (now - timedelta(hours=hours)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "until": now.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+    if statuses:
+        args["statuses"] = statuses
+    if urgencies:
+        args["urgencies"] = urgencies
+    return args
+
+
+def _incidents_render(result: dict) -> None:
+    rows = result["incidents"]
+    print_table(
+        f"Incidents ({len(rows)})",
+        ["#", "ID", "Status", "Urgency", "Service", "Title", "Created", "Assigned"],
+        [[i.get("incident_number"), i["id"], i["status"], i.get("urgency"), i.get("service"),
+          (i.get("title") or "")[:60], _fmt(i.get("created_at")), ", ".join(filter(None, i.get("assigned_to") or []))]
+         for i in rows],
+    )
+
+
+def _directory(key: str):
+    def args(words: list[str]) -> dict | None:
+        return {} if key in words else None
+    return args
+
+
+def _services_render(result: dict) -> None:
+    print_table(
+        f"Services ({result['total']})",
+        ["Name", "ID", "Status", "Escalation policy", "Teams"],
+        [[s["name"], s["id"], s.get("status"), s.get("escalation_policy"), ", ".join(s.get("teams") or [])]
+         for s in result["services"]],
+    )
+
+
+def _teams_render(result: dict) -> None:
+    print_table(
+        f"Teams ({result['total']})",
+        ["Name", "ID", "Description"],
+        [[t["name"], t["id"], (t.get("description") or "")[:80]] for t in result["teams"]],
+    )
+
+
+def _schedules_render(result: dict) -> None:
+    print_table(
+        f"Schedules ({result['total']})",
+        ["Name", "ID", "Time zone", "Users", "Teams"],
+        [[s["name"], s["id"], s.get("time_zone"), len(s.get("users") or []), ", ".join(s.get("teams") or [])]
+         for s in result["schedules"]],
+    )
+
+
+# name → (tool, extra vocabulary, args builder, renderer)
+TEMPLATES: dict[str, tuple] = {
+    "oncall_now": ("list_oncalls", {"oncall", "oncalls"}, _oncall_args, _oncall_render),
+    "incidents": (
+        "list_incidents",
+        {"incidents", "urgency"} | set(_STATUS_WORDS) | _URGENCY_WORDS | _WINDOW_WORDS | set(_UNIT_HOURS),
+        _incidents_args, _incidents_render,
+    ),
+    "services": ("list_services", {"services"}, _directory("services"), _services_render),
+    "teams": ("list_teams", {"teams"}, _directory("teams"), _teams_render),
+    "schedules": ("list_schedules", {"schedules"}, _directory("schedules"), _schedules_render),
+}
+
+
+def match(query: str) -> tuple[str, str, dict] | None:
+    """Return (template, tool_name, args) when the whole query fits one template."""
+    words = _words(query)
+    if not words:
+        return None
+    for name, (tool, vocab, build, _) in TEMPLATES.items():
+        if all(w in vocab or w in _FILLER or w.isdigit() for w in words):
+            args = build(words)
+            if args is not None:
+                return name, tool, args
+    return None
+
+
+def try_fast_path(query: str) -> str | None:
+    """
+    Answer the query directly when it matches a template: run the tool,
+    render a table and return a compact answer for the history.
+    Returns None when the query should go to the LLM.
+    """
+    if not _enabled or query.lower().startswith(OPT_OUT_PREFIX):
+        return None
+    matched = match(query)
+    if matched is None:
+        return None
+    template, tool, args = matched
+
+    started = time.monotonic()
+    result = execute_tool(tool, args)
+    if "error" in result:
+        cprint(f"[bold red]❌ {tool} failed:[/bold red] {result['error']}")
+        return f"[fast path: {tool}] error: {result['error']}"
+
+    cprint("\n[bold blue]⚡ Fast path:[/bold blue]")
+    TEMPLATES[template][3](result)
+    if result.get("truncated"):
+        cprint("[yellow]Results truncated — refine the query for the complete list.[/yellow]")
+    cprint(
+        f"[dim]  {tool} in {time.monotonic() - started:.2f}s, no LLM calls. "
+        f"Prefix with '{OPT_OUT_PREFIX}' to ask the assistant instead.[/dim]"
+    )
+    text, _ = encode_result(result, max_chars=_HISTORY_CHARS)
+    return f"[fast path: {tool}]\n{text}"
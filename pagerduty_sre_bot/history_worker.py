@@ -0,0 +1,96 @@
+"""Background history housekeeping — compression and persistence off the input loop.
+
+The worker owns the live history. Each committed turn is appended under a
+lock and a job is queued; the job compresses a snapshot (a slow LLM call)
+without holding the lock, then merges the summary back only if the live
+history still starts with that snapshot, and saves the result. shutdown()
+drains the queue and always writes the final history.
+"""
+
+import queue
+import threading
+
+from pagerduty_sre_bot.compression import compress_history
+from pagerduty_sre_bot.history import save_history
+from pagerduty_sre_bot.output import cprint
+
+_lock = threading.Lock()
+_history: list[dict] = []
+_jobs: "queue.Queue[int | None]" = queue.Queue()
+_worker: threading.Thread | None = None
+_args = None
+_config: dict = {}
+_overhead_tokens = 0
+
+
+def start(history: list[dict], args, config: dict) -> None:
+    global _history, _args, _config, _worker
+    _history = list(history)
+    _args = args
+    _config = config
+    _worker = threading.Thread(target=_run, daemon=True, name="history-worker")
+    _worker.start()
+
+
+def current() -> list[dict]:
+    """A snapshot of the live history to start a turn from."""
+    with _lock:
+        return list(_history)
+
+
+def commit(base: list[dict], updated: list[dict], overhead_tokens: int = 0) -> None:
+    """
+    Append a finished turn and queue compression + save. `base` is the history
+    the turn started from; only the messages after it are taken from `updated`,
+    so a summary merged meanwhile is kept.
+    """
+    global _history, _overhead_tokens
+    with _lock:
+        _history = _history + updated[len(base):]
+        _overhead_tokens = overhead_tokens
+    _jobs.put(0)
+
+
+def reset(history: list[dict]) -> None:
+    """Replace the live history (e.g. on 'clear'); in-flight summaries of the old one are discarded."""
+    global _history
+    with _lock:
+        _history = list(history)
+    _jobs.put(0)
+
+
+def _run() -> None:
+    while True:
+        job = _jobs.get()
+        try:
+            if job is None:
+                return
+            _housekeep()
+        except Exception as e:
+            cprint(f"[yellow]⚠  History housekeeping failed: {e}[/yellow]")
+        finally:
+            _jobs.task_done()
+
+
+def _housekeep() -> None:
+    global _history
+    with _lock:
+        snapshot = list(_history)
+        overhead = _overhead_tokens
+    compressed = compress_history(snapshot, _config, overhead_tokens=overhead)
+    with _lock:
+        if compressed is not snapshot and _history[:len(snapshot)] == snapshot:
+            _history = compressed + _history[len(snapshot):]
+        to_save = list(_history)
+    save_history(to_save, _args, _config)
+
+
+def shutdown(timeout: float = 30.0) -> None:
+    """Drain queued housekeeping, stop the worker and save the final history."""
+    if _worker is not None and _worker.is_alive():
+        _jobs.put(None)
+        _worker.join(timeout)
+    with _lock:
+        final = list(_history)
+    if _args is not None:
+        save_history(final, _args, _config)
@@ -0,0 +1,144 @@
+"""Incident lifecycle replay — time-in-state metrics from log entries."""
+
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from pagerduty_sre_bot.time_utils import fmt_ts, now_utc
+
+TRIGGERED = "triggered"
+ACKNOWLEDGED = "acknowledged"
+REASSIGNED = "reassigned"
+RESOLVED = "resolved"
+
+# States in which the incident is waiting on whoever sits at the current escalation level.
+_UNACKED = (TRIGGERED, REASSIGNED)
+
+
+def _ts(iso_str: str | None) -> datetime | None:
+    dt = fmt_ts(iso_str or "")
+    if dt and dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def replay_incident(log_entries: list[dict], until: datetime | None = None) -> dict:
+    """
+    Replay an incident's log entries through the lifecycle state machine.
+
+    Returns the time spent in each state, the time spent un-acknowledged at each
+    escalation level, and counters for escalations, reassignments and re-triggers.
+    Open incidents are measured up to `until` (default: now).
+    """
+    entries = sorted(
+        ((_ts(e.get("created_at")), e.get("type", "")) for e in log_entries),
+        key=lambda x: x[0] or datetime.min.replace(tzinfo=timezone.utc),
+    )
+    entries = [(ts, lt) for ts, lt in entries if ts]
+
+    state_seconds: dict[str, float] = defaultdict(float)
+    level_seconds: dict[int, float] = defaultdict(float)
+    state = None
+    level = 0
+    since = None
+    first_trigger = first_ack = last_resolve = None
+    escalations = reassignments = retriggers = 0
+
+    def close(at: datetime) -> None:
+        if state is None or since is None or state == RESOLVED:
+            return
+        secs = max(0.0, (at - since).total_seconds())
+        state_seconds[state] += secs
+        if state in _UNACKED:
+            level_seconds[level] += secs
+
+    for ts, lt in entries:
+        if lt == "trigger_log_entry":
+            close(ts)
+            if first_trigger is None:
+                first_trigger = ts
+            else:
+                retriggers += 1
+            state, level = TRIGGERED, 1
+        elif lt == "acknowledge_log_entry":
+            close(ts)
+            first_ack = first_ack or ts
+            state = ACKNOWLEDGED
+        elif lt == "unacknowledge_log_entry":
+            # Ack timeout — the incident goes back to paging and counts as a re-trigger loop.
+            close(ts)
+            retriggers += 1
+            state = TRIGGERED
+        elif lt == "escalate_log_entry":
+            close(ts)
+            escalations += 1
+            level += 1
+            state = TRIGGERED
+        elif lt == "assign_log_entry":
+            close(ts)
+            reassignments += 1
+            state = REASSIGNED
+        elif lt == "resolve_log_entry":
+            close(ts)
+            last_resolve = ts
+            state = RESOLVED
+        else:
+            continue
+        since = ts
+
+    if state not in (None, RESOLVED):
+        close(until or now_utc())
+
+    return {
+        "state_seconds": dict(state_seconds),
+        "level_seconds": dict(level_seconds),
+        "escalations": escalations,
+        "reassignments": reassignments,
+        "retriggers": retriggers,
+        "final_state": state,
+        "first_trigger": first_trigger,
+        "first_ack": first_ack,
+        "last_resolve": last_resolve,
+    }
+
+
+def _percentile(sorted_vals: list[float], pct: float) -> float | None:
+    if not sorted_vals:
+        return None
+    idx = min(len(sorted_vals) - 1, int(round(pct / 100 * (len(sorted_vals) - 1))))
+    return sorted_vals[idx]
+
+
+def _stats_minutes(values: list[float]) -> dict:
+    values = sorted(values)
+    return {
+        "incidents": len(values),
+        "mean_minutes": round(sum(values) / len(values) / 60, 2) if values else None,
+        "p50_minutes": round(_percentile(values, 50) / 60, 2) if values else None,
+        "p90_minutes": round(_percentile(values, 90) / 60, 2) if values else None,
+        "total_minutes": round(sum(values) / 60, 2),
+    }
+
+
+def aggregate_lifecycles(replays: list[dict]) -> dict:
+    """Aggregate many replays in a single pass into per-state and per-level dwell statistics."""
+    by_state: dict[str, list[float]] = defaultdict(list)
+    by_level: dict[int, list[float]] = defaultdict(list)
+    retrigger_loops = reassigned = escalated = 0
+
+    for r in replays:
+        for state, secs in r["state_seconds"].items():
+            by_state[state].append(secs)
+        for level, secs in r["level_seconds"].items():
+            by_level[level].append(secs)
+        retrigger_loops += r["retriggers"] > 0
+        reassigned += r["reassignments"] > 0
+        escalated += r["escalations"] > 0
+
+    return {
+        "incidents_replayed": len(replays),
+        "time_in_state": {s: _stats_minutes(v) for s, v in sorted(by_state.items())},
+        "escalation_level_dwell": {f"level_{lvl}": _stats_minutes(v) for lvl, v in sorted(by_level.items())},
+        "incidents_with_retrigger_loops": retrigger_loops,
+        "incidents_reassigned": reassigned,
+        "incidents_escalated": escalated,
+    }
@@ -0,0 +1,181 @@
+"""Optional Prometheus-format metrics endpoint for the bot's internals.
+
+Counters, gauges and histograms are kept in-process (stdlib only) and
+served as Prometheus text exposition from a local HTTP thread:
+
+    curl http://127.0.0.1:9464/metrics
+
+Recording is a no-op unless metrics.enabled is set, so instrumented hot
+paths (tool dispatch, PagerDuty responses, LLM calls, monitor polls) pay
+nothing by default.
+"""
+
+import threading
+
+from pagerduty_sre_bot.output import cprint
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+LAG_BUCKETS = (1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+ROUND_BUCKETS = (1, 2, 3, 4, 5, 6, 8, 10)
+
+# name: (type, help, buckets)
+_METRICS = {
+    "pdbot_tool_calls_total": ("counter", "Tool calls by tool and outcome.", None),
+    "pdbot_tool_duration_seconds": ("histogram", "Tool call latency.", LATENCY_BUCKETS),
+    "pdbot_pagerduty_requests_total": ("counter", "PagerDuty HTTP responses by API and status code.", None),
+    "pdbot_pagerduty_rate_limited_total": ("counter", "PagerDuty 429 responses by API.", None),
+    "pdbot_cache_hits_total": ("counter", "Resource cache (cache.py) hits.", None),
+    "pdbot_cache_misses_total": ("counter", "Resource cache (cache.py) misses.", None),
+    "pdbot_cache_hit_ratio": ("gauge", "Resource cache hit ratio since start.", None),
+    "pdbot_cache_entries": ("gauge", "Resource cache entries.", None),
+    "pdbot_llm_calls_total": ("counter", "LLM API calls by model.", None),
+    "pdbot_llm_tokens_total": ("counter", "LLM tokens by model and kind.", None),
+    "pdbot_llm_rounds": ("histogram", "LLM rounds per conversation turn.", ROUND_BUCKETS),
+    "pdbot_monitor_poll_duration_seconds": ("histogram", "Monitor poll cycle duration.", LATENCY_BUCKETS),
+    "pdbot_monitor_alert_lag_seconds": ("histogram", "Delay from incident created_at to announcement.", LAG_BUCKETS),
+    "pdbot_monitor_watermark_lag_seconds": ("gauge", "Seconds between now and the monitor watermark.", None),
+}
+
+_enabled = False
+_lock = threading.Lock()
+# name -> {label tuple: value} (counters, gauges) or {label tuple: [bucket counts..., sum, count]}
+_values: dict[str, dict[tuple, float | list]] = {name: {} for name in _METRICS}
+_server = None  # http.server.ThreadingHTTPServer, imported only when the endpoint starts
+
+
+def configure(enabled: bool) -> None:
+    global _enabled
+    _enabled = enabled
+
+
+def _key(labels: dict) -> tuple:
+    return tuple(sorted(labels.items()))
+
+
+def inc(name: str, value: float = 1, **labels) -> None:
+    if not _enabled:
+        return
+    key = _key(labels)
+    with _lock:
+        series = _values[name]
+        series[key] = series.get(key, 0) + value
+
+
+def set_gauge(name: str, value: float, **labels) -> None:
+    if not _enabled:
+        return
+    with _lock:
+        _values[name][_key(labels)] = value
+
+
+def observe(name: str, value: float, **labels) -> None:
+    if not _enabled:
+        return
+    buckets = _METRICS[name][2]
+    key = _key(labels)
+    with _lock:
+        series = _values[name]
+        counts = series.get(key)
+        if counts is None:
+            counts = series[key] = [0] * len(buckets) + [0.0, 0]
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                counts[i] += 1
+        counts[-2] += value
+        counts[-1] += 1
+
+
+def record_pd_response(response, *args, **kwargs):
+    """requests response hook for the PagerDuty REST client (sees every attempt, retries included)."""
+    _record_http("rest", response.status_code)
+    return response
+
+
+def record_events_response(response) -> None:
+    """httpx response hook for the Events API client."""
+    _record_http("events", response.status_code)
+
+
+def _record_http(api: str, status: int) -> None:
+    inc("pdbot_pagerduty_requests_total", api=api, code=str(status))
+    if status == 429:
+        inc("pdbot_pagerduty_rate_limited_total", api=api)
+
+
+# ── Exposition ────────────────────────────────────────
+
+def _fmt_labels(key: tuple, extra: tuple = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped, strict=True)) + "}"
+
+
+def _collect_cache() -> None:
+    from pagerduty_sre_bot.cache import cache_size, cache_stats
+
+    stats = cache_stats()
+    lookups = stats["hits"] + stats["misses"]
+    with _lock:
+        _values["pdbot_cache_hits_total"][()] = stats["hits"]
+        _values["pdbot_cache_misses_total"][()] = stats["misses"]
+        _values["pdbot_cache_hit_ratio"][()] = stats["hits"] / lookups if lookups else 0.0
+        _values["pdbot_cache_entries"][()] = cache_size()
+
+
+def render() -> str:
+    """All metrics in Prometheus text exposition format (version 0.0.4)."""
+    _collect_cache()
+    lines = []
+    with _lock:
+        for name, (kind, help_text, buckets) in _METRICS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for key, value in sorted(_values[name].items()):
+                if kind != "histogram":
+                    lines.append(f"{name}{_fmt_labels(key)} {value}")
+                    continue
+                for bound, count in zip(buckets, value[:-2], strict=True):
+                    lines.append(f"{name}_bucket{_fmt_labels(key, (('le', str(bound)),))} {count}")
+                lines.append(f"{name}_bucket{_fmt_labels(key, (('le', '+Inf'),))} {value[-1]}")
+                lines.append(f"{name}_sum{_fmt_labels(key)} {value[-2]}")
+                lines.append(f"{name}_count{_fmt_labels(key)} {value[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+def start_server(config: dict) -> bool:
+    """Start the metrics endpoint thread if metrics are enabled."""
+    global _server
+    cfg = config["metrics"]
+    if not cfg["enabled"]:
+        return False
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 — http.server naming
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            pass  # keep the chat console quiet
+
+    _server = ThreadingHTTPServer((cfg["host"], cfg["port"]), Handler)
+    threading.Thread(target=_server.serve_forever, daemon=True, name="pd-metrics").start()
+    cprint(f"[dim]Metrics endpoint on http://{cfg['host']}:{cfg['port']}/metrics[/dim]")
+    return True
+
+
+def stop_server() -> None:
+    global _server
+    if _server is not None:
+        _server.shutdown()
+        _server = None
+
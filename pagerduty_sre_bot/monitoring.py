@@ -1,74 +1,414 @@
-"""Proactive monitoring daemon — polls PagerDuty for new high-urgency incidents."""
+"""Proactive monitoring daemon — polls PagerDuty for new high-urgency incidents.
 
+Polling is incremental: each cycle pages through the incidents created
+after a persisted created_at watermark (minus a small overlap for late
+arrivals), so cost tracks the number of new incidents and a restart
+neither re-alerts nor misses anything. A cycle reads at most
+monitoring.max_pages_per_poll pages; a larger backlog is worked off over
+the following cycles. Webhook deliveries feed the same notification path;
+while they keep arriving and the subscription covers every watch rule,
+polling pauses apart from a slow backstop poll. During an alert storm,
+announcements are coalesced into periodic digests (storm.py).
+
+Any number of declarative watch rules (monitoring.rules in config.yml)
+are evaluated against the one shared fetch per cycle. Rules are indexed
+by service and team, so each incident is only checked against the rules
+that could match it plus the unscoped ones.
+"""
+
+import json
+import re
 import threading
 import time
+from collections.abc import Callable
+from itertools import islice
+from datetime import timedelta, timezone
+from pathlib import Path
 
+from pagerduty_sre_bot import metrics
 from pagerduty_sre_bot.clients import pd_client
-from pagerduty_sre_bot.time_utils import iso_hours_ago, iso_now
+from pagerduty_sre_bot.dedup import DedupStore
+from pagerduty_sre_bot.storm import StormCoalescer
+from pagerduty_sre_bot.time_utils import fmt_ts, iso_hours_ago, iso_now
 from pagerduty_sre_bot.output import cprint
 
 _active = threading.Event()
 _active.set()
 
+# Incidents can become visible in the API a little after their created_at.
+OVERLAP_SECONDS = 120
+PAGE_SIZE = 100
+
+# Shared by the poller and webhook pushes.
+_seen_lock = threading.Lock()
+_seen = DedupStore(5000)
+_rules: dict = {}
+_storm = StormCoalescer(0, 60, 30)  # threshold 0: coalescing off until the daemon configures it
+_last_push = 0.0
+_sink: Callable[[str, dict], None] | None = None
+_push_stale_after = 0.0  # 0: webhooks off, always poll
+_push_covers_rules = False  # the webhook subscription sees every incident a rule can match
+_backstop_after = 0.0  # poll at least this often even while pushes arrive (0: never)
+_last_poll = 0.0
+
 
 def stop_monitoring() -> None:
     _active.clear()
 
 
+def _load_state(path: Path) -> dict:
+    """The saved poll state, or {} (start fresh) if it is missing or unreadable."""
+    try:
+        state = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def _save_state(path: Path, state: dict) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    try:
+        tmp.write_text(json.dumps(state))
+        tmp.replace(path)
+    except OSError as e:
+        cprint(f"[dim]Monitor state not saved: {e}[/dim]")
+
+
+def _shift(iso: str, seconds: float) -> str:
+    ts = fmt_ts(iso)
+    if ts is None:
+        return iso
+    return (ts + timedelta(seconds=seconds)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _age_seconds(iso: str) -> float | None:
+    ts = fmt_ts(iso)
+    if ts is None:
+        return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return time.time() - ts.timestamp()
+
+
+# ── Watch rules ───────────────────────────────────────
+
+def _lower_set(values) -> set[str]:
+    return {str(v).lower() for v in values or []}
+
+
+def compile_rules(rules: list[dict]) -> dict:
+    """
+    Compile watch rules into an index. Each rule may set services, teams
+    (IDs or names), urgencies, priorities (e.g. "P1") and title_regex; unset
+    fields match anything.
+    """
+    compiled = []
+    by_service: dict[str, list[int]] = {}
+    by_team: dict[str, list[int]] = {}
+    unscoped: list[int] = []
+    for i, rule in enumerate(rules):
+        services, teams = _lower_set(rule.get("services")), _lower_set(rule.get("teams"))
+        compiled.append({
+            "name": rule.get("name") or f"rule-{i + 1}",
+            "services": services,
+            "teams": teams,
+            "urgencies": _lower_set(rule.get("urgencies")),
+            "priorities": _lower_set(rule.get("priorities")),
+            "title": re.compile(rule["title_regex"], re.IGNORECASE) if rule.get("title_regex") else None,
+        })
+        # Index on the most selective scope only; the full predicate is checked on match.
+        if services:
+            for key in services:
+                by_service.setdefault(key, []).append(i)
+        elif teams:
+            for key in teams:
+                by_team.setdefault(key, []).append(i)
+        else:
+            unscoped.append(i)
+    urgencies: set[str] = set()
+    for r in compiled:
+        if not r["urgencies"]:
+            urgencies = set()  # some rule takes any urgency — fetch everything
+            break
+        urgencies |= r["urgencies"]
+    return {"rules": compiled, "by_service": by_service, "by_team": by_team, "unscoped": unscoped,
+            "fetch_urgencies": sorted(urgencies)}
+
+
+def _ref_keys(ref: dict | None) -> set[str]:
+    ref = ref or {}
+    return {str(v).lower() for v in (ref.get("id"), ref.get("summary")) if v}
+
+
+def match_rules(index: dict, inc: dict) -> list[str]:
+    """Names of the rules an incident matches, checking only index candidates."""
+    service_keys = _ref_keys(inc.get("service"))
+    team_keys: set[str] = set()
+    for team in inc.get("teams") or []:
+        team_keys |= _ref_keys(team)
+
+    candidates = set(index["unscoped"])
+    for key in service_keys:
+        candidates.update(index["by_service"].get(key, ()))
+    for key in team_keys:
+        candidates.update(index["by_team"].get(key, ()))
+
+    urgency = str(inc.get("urgency") or "").lower()
+    priority = _ref_keys(inc.get("priority"))
+    matched = []
+    for i in sorted(candidates):
+        rule = index["rules"][i]
+        if rule["services"] and not rule["services"] & service_keys:
+            continue
+        if rule["teams"] and not rule["teams"] & team_keys:
+            continue
+        if rule["urgencies"] and urgency not in rule["urgencies"]:
+            continue
+        if rule["priorities"] and not rule["priorities"] & priority:
+            continue
+        if rule["title"] and not rule["title"].search(inc.get("title") or ""):
+            continue
+        matched.append(rule["name"])
+    return matched
+
+
+def _rules_from_config(monitoring: dict) -> list[dict]:
+    """Configured rules, or the single legacy urgency_filter rule."""
+    return monitoring.get("rules") or [{"name": "default", "urgencies": [monitoring["urgency_filter"]]}]
+
+
+def _fetch_new(since: str, until: str, urgencies: list[str], max_items: int) -> list[dict]:
+    """Triggered incidents created in [since, until], oldest first, stopping after max_items."""
+    params = {
+        "since": since,
+        "until": until,
+        "statuses[]": ["triggered"],
+        "sort_by": "created_at:asc",
+        "limit": PAGE_SIZE,
+    }
+    if urgencies:
+        params["urgencies[]"] = urgencies
+    return list(islice(pd_client.iter_all("incidents", params=params), max_items))
+
+
+def _process(inc: dict) -> bool:
+    """Announce an incident once if it matches any rule. Returns True if announced."""
+    names = match_rules(_rules, inc)
+    if not names:
+        return False
+    with _seen_lock:
+        if not _seen.add(inc["id"], inc.get("created_at") or iso_now()):
+            return False
+    outcome = _storm.offer(inc, names)
+    if outcome == "announce":
+        _announce(inc, names)
+    elif outcome == "storm_started":
+        _emit(
+            "storm_started",
+            f"\n[bold red]🌩  ALERT STORM: more than {_storm.threshold} new incidents in {_storm.window:g}s "
+            f"— switching to digests every {_storm.interval:g}s[/bold red]",
+            threshold=_storm.threshold, window_seconds=_storm.window, interval_seconds=_storm.interval,
+        )
+    lag = _age_seconds(inc.get("created_at") or "")
+    if lag is not None:
+        metrics.observe("pdbot_monitor_alert_lag_seconds", lag)
+    return True
+
+
+def notify_incident(inc: dict) -> bool:
+    """Webhook entry point: announce a pushed triggered incident if it matches a rule."""
+    if not _rules or inc.get("status", "triggered") != "triggered":
+        return False
+    return _process(inc)
+
+
+def subscription_covers(index: dict, scope: dict) -> bool:
+    """
+    True if a webhook subscription scoped to scope["services"] / scope["teams"]
+    (IDs or names; both empty means account-wide) delivers every incident the
+    compiled rules can match. A rule is covered when all its services, or all
+    its teams, are in the scope; unscoped rules need an account-wide subscription.
+    """
+    services, teams = _lower_set(scope.get("services")), _lower_set(scope.get("teams"))
+    if not services and not teams:
+        return True
+    return all(
+        (rule["services"] and rule["services"] <= services) or (rule["teams"] and rule["teams"] <= teams)
+        for rule in index["rules"]
+    )
+
+
+def record_push() -> None:
+    """Note an incident webhook delivery; polling pauses while they keep arriving."""
+    global _last_push
+    _last_push = time.time()
+
+
+def push_healthy() -> bool:
+    """True while webhook deliveries are fresh and their subscription covers every watch rule."""
+    return _push_covers_rules and bool(_push_stale_after) and time.time() - _last_push < _push_stale_after
+
+
+def poll_due() -> bool:
+    """True unless pushes stand in for polling and the backstop poll isn't due yet."""
+    if not push_healthy():
+        return True
+    return bool(_backstop_after) and time.time() - _last_poll >= _backstop_after
+
+
+def set_event_sink(sink: Callable[[str, dict], None] | None) -> None:
+    """Route monitor events to sink(event, fields) instead of the console (headless daemon)."""
+    global _sink
+    _sink = sink
+
+
+def _emit(event: str, text: str, **fields) -> None:
+    if _sink is not None:
+        _sink(event, fields)
+    else:
+        cprint(text)
+
+
+def _announce(inc: dict, rule_names: list[str]) -> None:
+    urgency = str(inc.get("urgency") or "?")
+    svc = inc.get("service", {}).get("summary", "?")
+    ts = inc.get("created_at", "?")
+    url = inc.get("html_url", "")
+    _emit(
+        "incident",
+        f"\n[bold red]🚨 NEW INCIDENT [{urgency.upper()}] {inc['id']}[/bold red] "
+        f"│ [white]{inc['title']}[/white] "
+        f"│ service=[cyan]{svc}[/cyan] "
+        f"│ rules=[magenta]{','.join(rule_names)}[/magenta] "
+        f"│ [dim]{ts}[/dim] "
+        f"│ {url}",
+        id=inc["id"], title=inc.get("title"), urgency=urgency, service=svc, created_at=ts, url=url,
+        rules=rule_names,
+    )
+
+
+def flush_storm(force: bool = False) -> None:
+    """Emit a storm digest if one is due (force: flush whatever is buffered and end the storm)."""
+    digest = _storm.flush(force=force)
+    if digest is None:
+        return
+    if _sink is not None:
+        _sink("storm_digest", digest)
+        return
+    if digest["groups"]:
+        cprint(f"\n[bold red]🌩  STORM DIGEST: {digest['total']} new incidents[/bold red]")
+    for group in digest["groups"]:
+        examples = "; ".join(f"{ex['id']} {ex['example']} ×{ex['count']}" for ex in group["examples"])
+        cprint(
+            f"  [bold]{group['key']}[/bold] ×{group['count']} "
+            f"│ rules=[magenta]{','.join(group['rules'])}[/magenta] "
+            f"│ [dim]{examples}[/dim]"
+        )
+    if digest["ended"]:
+        cprint("[bold yellow]🌤  Alert storm over — announcing incidents individually again[/bold yellow]")
+
+
+def setup_polling(config: dict) -> dict:
+    """
+    Apply the monitoring config (rules, storm digests, push pause) and load the
+    persisted watermark and seen IDs. Returns the poll state for poll_once().
+    """
+    global _seen, _rules, _storm, _push_stale_after, _push_covers_rules, _backstop_after
+    monitoring = config["monitoring"]
+    _rules = compile_rules(_rules_from_config(monitoring))
+    storm = monitoring["storm"]
+    _storm = StormCoalescer(
+        threshold=storm["threshold"],
+        window_seconds=storm["window_seconds"],
+        interval_seconds=storm["digest_interval_seconds"],
+        group_by=storm["group_by"],
+        top_examples=storm["top_examples"],
+    )
+    webhooks = config.get("webhooks", {})
+    _push_stale_after = webhooks.get("stale_after_seconds", 0) if webhooks.get("enabled") else 0
+    _push_covers_rules = subscription_covers(_rules, webhooks.get("scope") or {})
+    _backstop_after = webhooks.get("backstop_poll_seconds", 0)
+
+    state_path = Path(monitoring["state_file"])
+    saved_state = _load_state(state_path)
+    # Incidents already announced near the watermark, oldest first
+    seen = DedupStore(monitoring["dedup_capacity"])
+    saved = saved_state.get("seen", [])
+    for iid, ts in saved.items() if isinstance(saved, dict) else saved:
+        seen.add(iid, ts)
+    with _seen_lock:
+        _seen = seen
+    return {
+        "watermark": saved_state.get("watermark") or iso_hours_ago(monitoring["poll_interval_seconds"] / 3600 * 2),
+        "state_path": state_path,
+        "urgencies": _rules["fetch_urgencies"],
+        "rules": len(_rules["rules"]),
+        "max_items": monitoring["max_pages_per_poll"] * PAGE_SIZE,
+        "catching_up": False,
+    }
+
+
+def poll_once(state: dict) -> int:
+    """One poll cycle: fetch, evaluate rules, advance and persist the watermark. Returns incidents fetched."""
+    global _last_poll
+    _last_poll = time.time()
+    started = time.perf_counter()
+    until = iso_now()
+    watermark = state["watermark"]
+    # One shared fetch per cycle; every rule is evaluated against it. While working
+    # through a backlog the overlap is skipped, so a full page cap always advances.
+    since = watermark if state["catching_up"] else _shift(watermark, -OVERLAP_SECONDS)
+    incidents = _fetch_new(since, until, state["urgencies"], state["max_items"])
+    for inc in incidents:
+        _process(inc)
+
+    # Advance to the newest incident, or to now minus the overlap when it's quiet,
+    # and keep only the IDs the next overlap window can return again. A capped
+    # fetch stops at the newest incident seen; the next cycle picks up from there.
+    newest = max((inc.get("created_at", "") for inc in incidents), default="")
+    state["catching_up"] = len(incidents) >= state["max_items"]
+    if state["catching_up"]:
+        watermark = state["watermark"] = max(watermark, newest)
+    else:
+        watermark = state["watermark"] = max(watermark, newest, _shift(until, -OVERLAP_SECONDS))
+    with _seen_lock:
+        _seen.expire(_shift(watermark, -2 * OVERLAP_SECONDS))
+        items = _seen.items()
+    _save_state(state["state_path"], {"watermark": watermark, "seen": items})
+    metrics.observe("pdbot_monitor_poll_duration_seconds", time.perf_counter() - started)
+    lag = _age_seconds(watermark)
+    if lag is not None:
+        metrics.set_gauge("pdbot_monitor_watermark_lag_seconds", lag)
+    return len(incidents)
+
+
 def _daemon(config: dict) -> None:
     poll = config["monitoring"]["poll_interval_seconds"]
-    urgency = config["monitoring"]["urgency_filter"]
-    seen: set[str] = set()
+    state = setup_polling(config)
 
     cprint(
         f"\n[bold yellow]🔔 Monitoring daemon started "
-        f"(polling every {poll}s for {urgency}-urgency triggered incidents)[/bold yellow]"
+        f"(polling every {poll}s, {state['rules']} watch rule(s), "
+        f"{'/'.join(state['urgencies']) or 'any'}-urgency triggered incidents since {state['watermark']})[/bold yellow]"
     )
 
     while _active.is_set():
         try:
-            window_start = iso_hours_ago(poll / 3600 * 2)
-            window_end = iso_now()
-            params = {
-                "since": window_start,
-                "until": window_end,
-                "statuses[]": ["triggered"],
-                "urgencies[]": [urgency],
-                "sort_by": "created_at:desc",
-            }
-            raw: list = []
-            try:
-                for item in pd_client.iter_all("incidents", params=params):
-                    raw.append(item)
-                    if len(raw) >= 20:
-                        break
-            except Exception:
-                pass
-
-            for inc in raw:
-                if inc["id"] not in seen:
-                    seen.add(inc["id"])
-                    svc = inc.get("service", {}).get("summary", "?")
-                    ts = inc.get("created_at", "?")
-                    url = inc.get("html_url", "")
-                    cprint(
-                        f"\n[bold red]🚨 NEW INCIDENT [{urgency.upper()}] {inc['id']}[/bold red] "
-                        f"│ [white]{inc['title']}[/white] "
-                        f"│ service=[cyan]{svc}[/cyan] "
-                        f"│ [dim]{ts}[/dim] "
-                        f"│ {url}"
-                    )
-
-            if len(seen) > 500:
-                seen = set(list(seen)[-200:])
+            if not poll_due():
+                flush_storm()
+                time.sleep(1)
+                continue
+            poll_once(state)
         except Exception as e:
             cprint(f"[dim]Monitor error: {e}[/dim]")
 
         for _ in range(int(poll)):
             if not _active.is_set():
                 break
+            flush_storm()
             time.sleep(1)
 
+    flush_storm(force=True)
     cprint("[dim]Monitoring daemon stopped.[/dim]")
 
 
@@ -76,4 +416,4 @@ def start_monitoring(config: dict) -> threading.Thread:
     _active.set()
     t = threading.Thread(target=_daemon, args=(config,), daemon=True, name="pd-monitor")
     t.start()
-    return t
\ No newline at end of file
+    return t
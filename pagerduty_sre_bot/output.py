@@ -4,8 +4,10 @@ import re
 
 try:
     from rich.console import Console
+    from rich.live import Live
     from rich.markdown import Markdown
     from rich.rule import Rule
+    from rich.table import Table
 
     RICH_AVAILABLE = True
     console = Console()
@@ -36,4 +38,67 @@ def render_markdown(text: str) -> None:
     if RICH_AVAILABLE:
         console.print(Markdown(text))
     else:
-        print(text)
\ No newline at end of file
+        print(text)
+
+
+def print_table(title: str, columns: list[str], rows: list[list]) -> None:
+    """Render rows as a table — a Rich Table, or tab-separated text without Rich."""
+    cells = [["" if v is None else str(v) for v in row] for row in rows]
+    if RICH_AVAILABLE:
+        table = Table(title=title, title_justify="left", header_style="bold cyan")
+        for col in columns:
+            table.add_column(col, overflow="fold")
+        for row in cells:
+            table.add_row(*row)
+        console.print(table)
+    else:
+        print(title)
+        print("\t".join(columns))
+        for row in cells:
+            print("\t".join(row))
+
+
+class StreamRenderer:
+    """
+    Render streamed Markdown text as it arrives — live-updating with Rich,
+    raw incremental text otherwise. The header is printed on the first chunk.
+    """
+
+    def __init__(self, header: str = ""):
+        self._header = header
+        self._header_shown = False
+        self._buf = ""
+        self._live = None
+
+    @property
+    def started(self) -> bool:
+        return self._header_shown
+
+    def feed(self, text: str) -> None:
+        if not text:
+            return
+        if not self._header_shown:
+            if self._header:
+                cprint(self._header)
+            self._header_shown = True
+        self._buf += text
+        if not RICH_AVAILABLE:
+            print(text, end="", flush=True)
+        elif self._live is None:
+            self._live = Live(
+                Markdown(self._buf), console=console,
+                refresh_per_second=12, vertical_overflow="visible",
+            )
+            self._live.start()
+        else:
+            self._live.update(Markdown(self._buf))
+
+    def end_block(self) -> None:
+        """Finish the current text block; the next feed() starts a new one."""
+        if self._live is not None:
+            self._live.update(Markdown(self._buf))
+            self._live.stop()
+            self._live = None
+        elif self._buf and not RICH_AVAILABLE:
+            print()
+        self._buf = ""
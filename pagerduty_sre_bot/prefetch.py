@@ -0,0 +1,176 @@
+"""Speculative prefetch of likely tool data while the first LLM round runs.
+
+The router's tool selection plus cheap cues in the query ("on call",
+"incidents", a known service name) decide what to fetch in the background.
+When the model then asks for that data the tool call is answered from the
+prefetched result instead of a fresh PagerDuty round trip. Prefetched data
+lives for one turn only.
+"""
+
+import json
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from pagerduty_sre_bot.cache import cache_get
+from pagerduty_sre_bot.time_utils import fmt_ts, now_utc
+from pagerduty_sre_bot.tool_registry import execute_tool
+
+_enabled = True
+_max_workers = 4
+_executor: ThreadPoolExecutor | None = None
+_pending: dict[str, Future] = {}
+_lock = threading.Lock()
+_stats = {"issued": 0, "served": 0}
+
+OPEN_STATUSES = {"triggered", "acknowledged"}
+_SNAPSHOT_KEY = "open_incidents"
+_SNAPSHOT_DAYS = 30
+_SNAPSHOT_LIMIT = 200
+_WAIT_SECONDS = 20.0
+_snapshot_since: datetime | None = None
+_snapshot_until: datetime | None = None
+
+_ONCALL_CUE = re.compile(r"\bon[\s-]?call\b|\bpaged?\b")
+_INCIDENT_CUE = re.compile(r"\b(incidents?|outages?|open|triggered|acknowledged|firing|high[\s-]urgency)\b")
+_SERVICE_CUE = re.compile(r"\bservices?\b")
+
+
+def configure(enabled: bool, max_workers: int) -> None:
+    global _enabled, _max_workers, _executor
+    _enabled = enabled
+    _max_workers = max_workers
+    _executor = None
+
+
+def _key(name: str, args: dict) -> str:
+    return name + json.dumps(args, sort_keys=True, default=str)
+
+
+def _utc(iso: str | None) -> datetime | None:
+    ts = fmt_ts(iso) if iso else None
+    if ts is not None and ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts
+
+
+def _submit(key: str, name: str, args: dict) -> None:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=_max_workers, thread_name_prefix="prefetch")
+    with _lock:
+        if key in _pending:
+            return
+        _pending[key] = _executor.submit(execute_tool, name, args)
+        _stats["issued"] += 1
+
+
+def _mentioned_service_ids(query: str) -> list[str]:
+    """IDs of services in the cached service directory whose name appears in the query."""
+    directory = cache_get("services::") or {}
+    return [
+        s["id"] for s in directory.get("services", [])
+        if len(s.get("name") or "") >= 4 and s["name"].lower() in query
+    ]
+
+
+def start(query: str, tool_names: list[str]) -> None:
+    """Kick off background fetches for the data this query most likely needs."""
+    global _snapshot_since, _snapshot_until
+    if not _enabled:
+        return
+    q = query.lower()
+    names = set(tool_names)
+
+    if "list_oncalls" in names and _ONCALL_CUE.search(q):
+        _submit(_key("list_oncalls", {}), "list_oncalls", {})
+    if "list_incidents" in names and _INCIDENT_CUE.search(q):
+        _snapshot_until = now_utc().replace(microsecond=0)
+        _snapshot_since = _snapshot_until - timedelta(days=_SNAPSHOT_DAYS)
+        _submit(_SNAPSHOT_KEY, "list_incidents", {
+            "since": _snapshot_since.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "until": _snapshot_until.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "statuses": sorted(OPEN_STATUSES),
+            "limit": _SNAPSHOT_LIMIT,
+        })
+    if "list_services" in names and _SERVICE_CUE.search(q):
+        _submit(_key("list_services", {}), "list_services", {})
+    if "get_service" in names:
+        for sid in _mentioned_service_ids(q):
+            _submit(_key("get_service", {"service_id": sid}), "get_service", {"service_id": sid})
+
+
+def _wait(fut: Future) -> dict | None:
+    try:
+        result = fut.result(timeout=_WAIT_SECONDS)
+    except Exception:
+        return None
+    if not isinstance(result, dict) or "error" in result:
+        return None
+    return result
+
+
+def _from_snapshot(snapshot: dict | None, args: dict) -> dict | None:
+    """Answer a list_incidents call from the open-incident snapshot, or None if it can't be answered exactly."""
+    if snapshot is None or snapshot.get("truncated") or args.get("team_ids"):
+        return None
+    if args.get("sort_by", "created_at") != "created_at":
+        return None
+    statuses = set(args.get("statuses") or ["triggered", "acknowledged", "resolved"])
+    since, until = _utc(args.get("since")), _utc(args.get("until"))
+    if not statuses <= OPEN_STATUSES or since is None or until is None or _snapshot_since is None:
+        return None
+    # The snapshot only covers [_snapshot_since, _snapshot_until); incidents created
+    # after it was taken are unknown, so a later `until` needs a live fetch.
+    if since < _snapshot_since or _snapshot_until is None or until > _snapshot_until:
+        return None
+
+    urgencies = set(args.get("urgencies") or [])
+    service_ids = set(args.get("service_ids") or [])
+    rows = []
+    for inc in snapshot["incidents"]:
+        created = _utc(inc.get("created_at"))
+        if created is None or not since <= created < until or inc["status"] not in statuses:
+            continue
+        if urgencies and inc.get("urgency") not in urgencies:
+            continue
+        if service_ids and inc.get("service_id") not in service_ids:
+            continue
+        rows.append(inc)
+
+    limit = args.get("limit", 25)
+    out: dict = {"total": min(len(rows), limit), "incidents": rows[:limit]}
+    if len(rows) > limit:
+        out["truncated"] = True
+    return out
+
+
+def take(name: str, args: dict) -> dict | None:
+    """Return the prefetched result for this tool call, or None to execute it normally."""
+    with _lock:
+        fut = _pending.get(_key(name, args))
+        snapshot = _pending.get(_SNAPSHOT_KEY) if name == "list_incidents" else None
+    if fut is not None:
+        result = _wait(fut)
+    elif snapshot is not None:
+        result = _from_snapshot(_wait(snapshot), args)
+    else:
+        return None
+    if result is not None:
+        with _lock:
+            _stats["served"] += 1
+    return result
+
+
+def reset() -> None:
+    """Drop this turn's speculative results so later turns always see fresh data."""
+    with _lock:
+        for fut in _pending.values():
+            fut.cancel()
+        _pending.clear()
+
+
+def get_prefetch_stats() -> dict:
+    with _lock:
+        return dict(_stats)
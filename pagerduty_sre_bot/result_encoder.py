@@ -0,0 +1,153 @@
+"""Compact encoding of tool results for the LLM.
+
+Homogeneous record lists (incidents, alerts, users, oncalls…) become a
+header-plus-rows table: {"columns": [...], "rows": [[...], ...]}.
+Null and empty fields are dropped and everything is emitted as compact
+JSON, so the result stays valid JSON with far fewer repeated keys.
+
+Results still over the size limit are reduced structurally rather than cut
+mid-string: the biggest record lists keep their most relevant rows (highest
+urgency, newest) and the dropped remainder is summarised by service, status
+and urgency.
+"""
+
+import json
+from collections import Counter
+from typing import Any
+
+from pagerduty_sre_bot.tokens import estimate_tokens
+
+
+def _is_empty(v: Any) -> bool:
+    return v is None or (isinstance(v, (str, list, dict)) and not v)
+
+
+def _is_record_list(items: Any) -> bool:
+    """True for 2+ dicts sharing most of their keys."""
+    if not isinstance(items, list) or len(items) < 2 or not all(isinstance(i, dict) for i in items):
+        return False
+    union: set = set()
+    total = 0
+    for i in items:
+        union.update(i)
+        total += len(i)
+    return bool(union) and total / (len(items) * len(union)) >= 0.5
+
+
+def _table(records: list[dict]) -> dict:
+    rows_in = [{k: compact(v) for k, v in r.items()} for r in records]
+    columns: list = []
+    for r in rows_in:
+        for k, v in r.items():
+            if k not in columns and not _is_empty(v):
+                columns.append(k)
+    return {"columns": columns, "rows": [[r.get(c) for c in columns] for r in rows_in]}
+
+
+def compact(value: Any) -> Any:
+    """Recursively drop empty fields and tabulate homogeneous record lists."""
+    if isinstance(value, dict):
+        return {k: compact(v) for k, v in value.items() if not _is_empty(v)}
+    if _is_record_list(value):
+        return _table(value)
+    if isinstance(value, list):
+        return [compact(v) for v in value]
+    return value
+
+
+MAX_RESULT_CHARS = 28000
+
+_URGENCY_RANK = {"high": 0, "low": 1}
+_TIME_KEYS = ("created_at", "timestamp", "started_at", "start", "last_status_change_at")
+_GROUP_KEYS = ("service", "status", "urgency")
+
+
+def _dump(value: Any) -> str:
+    return json.dumps(compact(value), separators=(",", ":"), default=str)
+
+
+def field_label(value: Any) -> str:
+    """Display label for a field value; PD references collapse to their summary."""
+    if isinstance(value, dict):
+        value = value.get("summary") or value.get("name") or value.get("id")
+    return "none" if value is None else str(value)
+
+
+def _by_relevance(rows: list[dict]) -> list[int]:
+    """Row indices ordered most relevant first: highest urgency, then newest."""
+    def newest(i: int) -> str:
+        row = rows[i]
+        return next((str(row[k]) for k in _TIME_KEYS if row.get(k)), "")
+
+    order = sorted(range(len(rows)), key=newest, reverse=True)
+    return sorted(order, key=lambda i: _URGENCY_RANK.get(str(rows[i].get("urgency")), 2))
+
+
+def summarise_rows(rows: list[dict]) -> dict:
+    """Counts of rows by service, status and urgency (where the rows have them)."""
+    out: dict = {}
+    for key in _GROUP_KEYS:
+        if any(key in r for r in rows):
+            out[f"by_{key}"] = dict(Counter(field_label(r.get(key)) for r in rows).most_common())
+    return out
+
+
+def record_lists(container: dict) -> list[tuple[dict, str]]:
+    """(parent, key) of every list of dicts up to two levels deep, largest first."""
+    found = []
+    for key, value in container.items():
+        if isinstance(value, list) and value and all(isinstance(v, dict) for v in value):
+            found.append((container, key))
+        elif isinstance(value, dict):
+            found.extend(record_lists(value))
+    return sorted(found, key=lambda pk: len(_dump(pk[0][pk[1]])), reverse=True)
+
+
+def _keep_top(parent: dict, key: str, rows: list[dict], ranked: list[int], n: int) -> None:
+    parent[key] = [rows[i] for i in sorted(ranked[:n])]
+    dropped = [rows[i] for i in ranked[n:]]
+    parent[f"{key}_omitted"] = {"omitted": len(dropped), **summarise_rows(dropped)}
+
+
+def reduce_result(result: Any, max_chars: int = MAX_RESULT_CHARS) -> Any:
+    """
+    Shrink a result until its compact encoding fits max_chars, keeping it valid JSON.
+
+    Each oversized record list keeps its top rows by relevance, in their
+    original order, and gains an "<key>_omitted" summary of what was dropped.
+    """
+    if len(_dump(result)) <= max_chars:
+        return result
+    # Work on a JSON round-tripped copy; leave room for the note added below.
+    reduced = json.loads(json.dumps(result if isinstance(result, dict) else {"items": result}, default=str))
+    budget = max_chars - 200
+    for parent, key in record_lists(reduced):
+        rows = parent[key]
+        ranked = _by_relevance(rows)
+        lo, hi = 0, len(rows) - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            _keep_top(parent, key, rows, ranked, mid)
+            if len(_dump(reduced)) <= budget:
+                lo = mid
+            else:
+                hi = mid - 1
+        _keep_top(parent, key, rows, ranked, lo)
+        if len(_dump(reduced)) <= budget:
+            break
+    reduced["truncated"] = True
+    reduced["note"] = "Result reduced to fit context; *_omitted fields summarise the dropped rows."
+    if len(_dump(reduced)) > max_chars:
+        return {
+            "truncated": True,
+            "note": "Result too large to reduce structurally; showing a text preview only.",
+            "preview": _dump(result)[: max_chars // 2],
+        }
+    return reduced
+
+
+def encode_result(result: Any, max_chars: int | None = MAX_RESULT_CHARS) -> tuple[str, int]:
+    """Encode a tool result for the LLM. Returns (text, tokens saved vs indented JSON)."""
+    baseline = json.dumps(result, indent=2, default=str)
+    text = _dump(reduce_result(result, max_chars) if max_chars else result)
+    return text, max(0, estimate_tokens(baseline) - estimate_tokens(text))
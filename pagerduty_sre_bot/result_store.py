@@ -0,0 +1,143 @@
+"""Out-of-band store for large tool results.
+
+Big results (timelines, audit records, alert lists) are kept here in full
+and the LLM gets a short preview plus a handle; the read_result tool pages,
+filters and projects the stored data on demand, so per-round token volume
+stays small however large the underlying data is.
+"""
+
+import json
+from collections import OrderedDict
+from typing import Any
+
+from pagerduty_sre_bot.result_encoder import compact, field_label, record_lists, summarise_rows
+
+_store: "OrderedDict[str, dict]" = OrderedDict()
+_counter = 0
+_offload_chars = 8000
+_max_entries = 50
+PREVIEW_ROWS = 5
+
+
+def configure(offload_chars: int, max_entries: int) -> None:
+    global _offload_chars, _max_entries
+    _offload_chars = offload_chars
+    _max_entries = max_entries
+
+
+def put(tool_name: str, result: Any) -> str:
+    """Store a result and return its handle; the oldest entries are evicted past max_entries."""
+    global _counter
+    _counter += 1
+    handle = f"r{_counter}"
+    _store[handle] = {"tool": tool_name, "result": result}
+    while len(_store) > _max_entries:
+        _store.popitem(last=False)
+    return handle
+
+
+def get(handle: str) -> dict | None:
+    return _store.get(handle)
+
+
+def store_clear() -> None:
+    _store.clear()
+
+
+def store_size() -> int:
+    return len(_store)
+
+
+def _is_records(value: Any) -> bool:
+    return isinstance(value, list) and bool(value) and all(isinstance(v, dict) for v in value)
+
+
+def _lists(result: Any) -> dict[str, list]:
+    """Dotted path → record list, for every list of dicts in the result."""
+    if _is_records(result):
+        return {"items": result}
+    if not isinstance(result, dict):
+        return {}
+    paths: dict[str, list] = {}
+
+    def walk(node: dict, prefix: str) -> None:
+        for key, value in node.items():
+            if _is_records(value):
+                paths[prefix + key] = value
+            elif isinstance(value, dict):
+                walk(value, f"{prefix}{key}.")
+
+    walk(result, "")
+    return paths
+
+
+def _preview(handle: str, tool_name: str, result: Any) -> dict:
+    lists = _lists(result)
+    preview: dict = {}
+    if isinstance(result, dict):
+        preview = json.loads(json.dumps(result, default=str))
+        for parent, key in record_lists(preview):
+            rows = parent[key]
+            parent[key] = rows[:PREVIEW_ROWS]
+            parent[f"{key}_counts"] = {"total": len(rows), **summarise_rows(rows)}
+    elif lists:
+        rows = lists["items"]
+        preview = {"items": rows[:PREVIEW_ROWS], "items_counts": {"total": len(rows), **summarise_rows(rows)}}
+    return {
+        **preview,
+        "result_handle": handle,
+        "stored_lists": {path: len(rows) for path, rows in lists.items()},
+        "note": (
+            f"Full {tool_name} result stored out of band; only the first {PREVIEW_ROWS} rows of each list are shown. "
+            "Call read_result with result_handle to page, filter or project the rest."
+        ),
+    }
+
+
+def offload(tool_name: str, result: Any) -> Any:
+    """Return the result itself if it is small, otherwise store it and return a preview with a handle."""
+    if tool_name == "read_result" or (isinstance(result, dict) and "error" in result):
+        return result
+    if len(json.dumps(compact(result), separators=(",", ":"), default=str)) <= _offload_chars:
+        return result
+    if not _lists(result):
+        return result  # nothing pageable; let structural reduction handle it
+    return _preview(put(tool_name, result), tool_name, result)
+
+
+def _matches(row: dict, filters: dict) -> bool:
+    return all(str(wanted).lower() in field_label(row.get(field)).lower() for field, wanted in filters.items())
+
+
+def read(handle: str, path: str | None = None, offset: int = 0, limit: int = 20,
+         filters: dict | None = None, fields: list[str] | None = None) -> dict:
+    """Page through a stored record list, optionally filtering rows and projecting fields."""
+    entry = get(handle)
+    if entry is None:
+        return {"error": f"Unknown or expired result handle: {handle}. Re-run the original tool."}
+    lists = _lists(entry["result"])
+    if not lists:
+        return {"error": f"Result {handle} has no record lists to page through."}
+    if path is None:
+        path = max(lists, key=lambda p: len(lists[p]))
+    if path not in lists:
+        return {"error": f"No list at path '{path}'.", "available_paths": sorted(lists)}
+
+    rows = lists[path]
+    if filters:
+        rows = [r for r in rows if _matches(r, filters)]
+    page = rows[offset: offset + limit]
+    if fields:
+        page = [{f: r.get(f) for f in fields} for r in page]
+    out = {
+        "result_handle": handle,
+        "tool": entry["tool"],
+        "path": path,
+        "total": len(lists[path]),
+        "matched": len(rows),
+        "offset": offset,
+        "rows": page,
+    }
+    if offset + limit < len(rows):
+        out["next_offset"] = offset + limit
+    return out
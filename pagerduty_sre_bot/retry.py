@@ -3,11 +3,14 @@
 import time
 from functools import wraps
 
-from anthropic import APIConnectionError, APIStatusError, RateLimitError
-
 from pagerduty_sre_bot.output import cprint
 
-RETRYABLE_EXCEPTIONS = (APIConnectionError, RateLimitError)
+
+def _api_errors() -> tuple[tuple, type]:
+    """(retryable, status) exception types — anthropic is imported on the first wrapped call, not at import."""
+    from anthropic import APIConnectionError, APIStatusError, RateLimitError
+
+    return (APIConnectionError, RateLimitError), APIStatusError
 
 
 def with_retry(max_retries: int = 3, base_delay: float = 1.0):
@@ -16,11 +19,12 @@ def with_retry(max_retries: int = 3, base_delay: float = 1.0):
     def decorator(fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
+            retryable, status_error = _api_errors()
             last_exc = None
             for attempt in range(max_retries):
                 try:
                     return fn(*args, **kwargs)
-                except RETRYABLE_EXCEPTIONS as e:
+                except retryable as e:
                     last_exc = e
                     delay = base_delay * (2 ** attempt)
                     cprint(
@@ -28,7 +32,7 @@ def with_retry(max_retries: int = 3, base_delay: float = 1.0):
                         f"retrying in {delay:.1f}s… (attempt {attempt + 1}/{max_retries})[/yellow]"
                     )
                     time.sleep(delay)
-                except APIStatusError as e:
+                except status_error as e:
                     if e.status_code == 429:
                         last_exc = e
                         delay = base_delay * (2 ** attempt)
@@ -0,0 +1,115 @@
+"""Offline evaluation of tool routing: recall and tokens sent per query.
+
+    python -m pagerduty_sre_bot.router_eval [--corpus queries.jsonl] [--verbose]
+
+A corpus line is {"query": "...", "expected": ["tool_name", ...]}; without
+--corpus the built-in set of representative queries is used.
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from pagerduty_sre_bot import tool_router
+from pagerduty_sre_bot.tokens import estimate_tokens
+
+CORPUS: list[dict] = [
+    {"query": "who is on call right now?", "expected": ["list_oncalls"]},
+    {"query": "show incidents from last 24 hours", "expected": ["list_incidents"]},
+    {"query": "high-urgency triggered incidents since yesterday", "expected": ["list_incidents"]},
+    {"query": "details of incident P1ABC23", "expected": ["get_incident"]},
+    {"query": "acknowledge incident P1ABC23", "expected": ["manage_incident"]},
+    {"query": "resolve incident P1ABC23", "expected": ["manage_incident"]},
+    {"query": "reassign P1ABC23 to user PXYZ", "expected": ["manage_incident"]},
+    {"query": "snooze P1ABC23 for 2 hours", "expected": ["manage_incident"]},
+    {"query": "add note to P1ABC23: investigating DB pool", "expected": ["manage_incident"]},
+    {"query": "create incident on service PABC: database offline", "expected": ["create_incident"]},
+    {"query": "timeline of incident P1ABC23", "expected": ["get_incident_timeline"]},
+    {"query": "send a critical trigger event to routing key abc123", "expected": ["send_event"]},
+    {"query": "send a change event: deployed v2.5.0 to production", "expected": ["send_change_event"]},
+    {"query": "show all triggered alerts", "expected": ["list_alerts"]},
+    {"query": "resolve all alerts on incident P123", "expected": ["manage_incident_alerts", "get_incident_alerts"]},
+    {"query": "send status update on P123: we identified the root cause",
+     "expected": ["create_incident_status_update"]},
+    {"query": "page user PXYZ onto incident P123", "expected": ["create_responder_request"]},
+    {"query": "who was requested on incident P123?", "expected": ["list_responder_requests"]},
+    {"query": "list all services", "expected": ["list_services"]},
+    {"query": "show service PABC with integrations", "expected": ["get_service", "list_service_integrations"]},
+    {"query": "put service PABC in maintenance for 2 hours", "expected": ["create_maintenance_window"]},
+    {"query": "show all schedules", "expected": ["list_schedules"]},
+    {"query": "create a weekly rotation schedule with users P1, P2, P3", "expected": ["create_schedule"]},
+    {"query": "create override: user PXYZ on schedule PABC tomorrow", "expected": ["create_schedule_override"]},
+    {"query": "find user john@example.com", "expected": ["list_users"]},
+    {"query": "add user PXYZ to team PABC as responder", "expected": ["manage_team_membership"]},
+    {"query": "show team members of team PABC", "expected": ["list_team_members"]},
+    {"query": "list escalation policies", "expected": ["list_escalation_policies"]},
+    {"query": "list all custom fields", "expected": ["list_custom_fields"]},
+    {"query": "set Environment to 'production' on incident P123", "expected": ["set_incident_custom_field_values"]},
+    {"query": "run automation action PABC on incident P123", "expected": ["invoke_automation_action"]},
+    {"query": "list automation runners", "expected": ["list_automation_runners"]},
+    {"query": "show routing rules for orchestration PABC", "expected": ["get_orchestration_router"]},
+    {"query": "operational summary for last 24 hours", "expected": ["full_incident_analysis"]},
+    {"query": "analyze incident patterns for last 7 days", "expected": ["analyze_patterns"]},
+    {"query": "check SLA breaches this week", "expected": ["check_sla_breaches"]},
+    {"query": "on-call burnout report for last month", "expected": ["oncall_load_report"]},
+    {"query": "generate postmortem for incident P1ABC23", "expected": ["generate_postmortem"]},
+    {"query": "MTTA/MTTR report for this week", "expected": ["get_analytics_incidents"]},
+    {"query": "who was paged in the last 6 hours?", "expected": ["list_notifications"]},
+    {"query": "audit log for today", "expected": ["list_audit_records"]},
+    {"query": "list priority levels", "expected": ["list_priorities"]},
+    {"query": "service dependencies for PABC", "expected": ["get_service_dependencies"]},
+    {"query": "list webhook subscriptions", "expected": ["list_webhook_subscriptions"]},
+    {"query": "what features are enabled on this account?", "expected": ["list_abilities"]},
+]
+
+
+def _load_corpus(path: str | None) -> list[dict]:
+    if not path:
+        return CORPUS
+    return [json.loads(line) for line in Path(path).read_text().splitlines() if line.strip()]
+
+
+def evaluate(corpus: list[dict], verbose: bool = False) -> dict:
+    """Score the BM25 and keyword routers on the corpus."""
+    catalog = {t["name"]: t for b in tool_router.tool_bundles().values() for t in b["tools"]}
+    full_tokens = estimate_tokens(list(catalog.values()))
+    report: dict = {"queries": len(corpus), "full_catalog_tokens": full_tokens}
+
+    routers = {
+        "bm25": lambda q: (tool_router.route_by_rank(q) or tool_router.route_by_keywords(q))[0],
+        "keywords": lambda q: tool_router.route_by_keywords(q)[0],
+    }
+    for label, route in routers.items():
+        hits = expected_total = tokens = tools = 0
+        misses = []
+        for case in corpus:
+            routed = route(case["query"])
+            selected = {t["name"] for t in routed}
+            found = [n for n in case["expected"] if n in selected]
+            hits += len(found)
+            expected_total += len(case["expected"])
+            tools += len(routed)
+            tokens += estimate_tokens(routed)
+            if len(found) < len(case["expected"]):
+                misses.append({"query": case["query"], "missing": sorted(set(case["expected"]) - selected)})
+        n = len(corpus) or 1
+        report[label] = {
+            "recall": round(hits / expected_total, 3) if expected_total else None,
+            "avg_tools": round(tools / n, 1),
+            "avg_tokens": round(tokens / n),
+            "tokens_saved_pct": round((1 - tokens / n / full_tokens) * 100, 1) if full_tokens else 0.0,
+            "misses": misses if verbose else len(misses),
+        }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Evaluate tool routing recall and token cost")
+    parser.add_argument("--corpus", default=None, help="JSONL file of {query, expected} cases")
+    parser.add_argument("--verbose", action="store_true", help="List the queries each router missed")
+    args = parser.parse_args()
+    print(json.dumps(evaluate(_load_corpus(args.corpus), args.verbose), indent=2))
+
+
+if __name__ == "__main__":
+    main()
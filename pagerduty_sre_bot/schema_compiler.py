@@ -0,0 +1,65 @@
+"""Compile tool schemas into per-group Anthropic bundles with measured token costs.
+
+The router compiles each group once, on first use, so the conversation loop
+does no per-turn schema conversion; it just concatenates compiled bundles.
+"""
+
+from pagerduty_sre_bot.tokens import estimate_tokens
+
+
+def to_anthropic(tool: dict) -> dict:
+    """
+    Convert an OpenAI-style tool schema to Anthropic format.
+
+    OpenAI:  {"type":"function","function":{"name":"x","description":"y","parameters":{...}}}
+    Anthropic: {"name":"x","description":"y","input_schema":{...}}
+    """
+    fn = tool.get("function", {})
+    return {
+        "name": fn["name"],
+        "description": fn.get("description", ""),
+        "input_schema": fn.get("parameters", {"type": "object", "properties": {}}),
+    }
+
+
+def _strip_descriptions(schema):
+    if isinstance(schema, list):
+        return [_strip_descriptions(v) for v in schema]
+    if not isinstance(schema, dict):
+        return schema
+    out = {}
+    for k, v in schema.items():
+        if k == "description":
+            continue
+        if k == "properties" and isinstance(v, dict):
+            # Keys here are parameter names (one may well be "description").
+            out[k] = {name: _strip_descriptions(prop) for name, prop in v.items()}
+        else:
+            out[k] = _strip_descriptions(v)
+    return out
+
+
+def _first_sentence(text: str) -> str:
+    head, sep, _ = text.partition(". ")
+    return head + "." if sep else text
+
+
+def minify(tool: dict) -> dict:
+    """Anthropic tool with a one-sentence description and no per-parameter descriptions."""
+    return {
+        "name": tool["name"],
+        "description": _first_sentence(tool["description"]),
+        "input_schema": _strip_descriptions(tool["input_schema"]),
+    }
+
+
+def compile_bundle(tools: list[dict]) -> dict:
+    """One group's bundle from its OpenAI-format schemas."""
+    full = [to_anthropic(t) for t in tools]
+    mini = [minify(t) for t in full]
+    return {
+        "tools": full,
+        "minified": mini,
+        "tokens": estimate_tokens(full),
+        "minified_tokens": estimate_tokens(mini),
+    }
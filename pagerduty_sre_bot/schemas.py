@@ -961,7 +961,7 @@ TOOLS: list[dict] = [
         "type": "function",
         "function": {
             "name": "full_incident_analysis",
-            "description": "Run a full analysis: MTTA, MTTR, escalation counts, service distribution.",
+            "description": "Run a full analysis: MTTA, MTTR, escalation counts, service distribution, time-in-state and escalation-level dwell times, re-trigger loops.",
             "parameters": {
                 "type": "object",
                 "properties": {
@@ -989,6 +989,30 @@ TOOLS: list[dict] = [
             },
         },
     },
+    # ── Utility: read_result ──────────────────────────
+    {
+        "type": "function",
+        "function": {
+            "name": "read_result",
+            "description": "Page through a large tool result stored out of band (given by its result_handle). "
+                           "Supports filtering rows by field values and projecting selected fields.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "result_handle": {"type": "string", "description": "Handle from a stored result preview, e.g. 'r3'."},
+                    "path": {"type": "string", "description": "List to read, from stored_lists (default: the largest)."},
+                    "offset": {"type": "integer", "description": "Row offset (default 0)."},
+                    "limit": {"type": "integer", "description": "Rows to return, max 100 (default 20)."},
+                    "filter": {
+                        "type": "object",
+                        "description": "Field → value; keeps rows whose field contains the value (case-insensitive).",
+                    },
+                    "fields": {"type": "array", "items": {"type": "string"}, "description": "Fields to return."},
+                },
+                "required": ["result_handle"],
+            },
+        },
+    },
     # ── Postmortem generator ──────────────────────────
     {
         "type": "function",
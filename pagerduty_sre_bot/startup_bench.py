@@ -0,0 +1,126 @@
+"""Cold-start benchmark: time-to-prompt and import time per module.
+
+    python -m pagerduty_sre_bot.startup_bench [--runs 5] [--top 25] [--module pagerduty_sre_bot.__main__]
+
+Each run is a fresh interpreter. Time-to-prompt launches the interactive
+CLI (with --no-persist and a throwaway config) and measures until the
+"You:" prompt is printed. Import times come from `python -X importtime`;
+self and cumulative times are medians over the runs. A warm-up run that
+compiles bytecode is not counted. Placeholder API keys are used when none
+are set, since no API call is made before the prompt.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+PROMPT = b"You:"
+
+
+def _env() -> dict:
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    # Runs happen in a scratch directory; keep this checkout importable from there.
+    root = str(Path(__file__).resolve().parents[1])
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (root, env.get("PYTHONPATH")) if p)
+    env.setdefault("ANTHROPIC_API_KEY", "startup-bench")
+    env.setdefault("PAGERDUTY_API_KEY", "startup-bench")
+    return env
+
+
+def time_to_prompt(workdir: Path, timeout: float = 60.0) -> float:
+    """Seconds from launching the CLI until its first prompt appears."""
+    cmd = [sys.executable, "-m", "pagerduty_sre_bot", "--no-persist", "--config", str(workdir / "config.yml")]
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        cmd, cwd=workdir, env=_env(), stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    seen = threading.Event()
+    elapsed: list[float] = []
+
+    def watch() -> None:
+        buf = b""
+        while chunk := proc.stdout.read1(4096):
+            buf = buf[-len(PROMPT):] + chunk
+            if PROMPT in buf:
+                elapsed.append(time.perf_counter() - started)
+                seen.set()
+                return
+
+    threading.Thread(target=watch, daemon=True).start()
+    try:
+        if not seen.wait(timeout):
+            raise RuntimeError(f"no prompt within {timeout:.0f}s")
+        proc.communicate(b"exit\n", timeout=timeout)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+    return elapsed[0]
+
+
+def import_times(module: str, workdir: Path) -> dict[str, tuple[int, int]]:
+    """{module: (self_us, cumulative_us)} for one fresh `import module`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=workdir, env=_env(), capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def benchmark(runs: int, top: int, module: str) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        time_to_prompt(workdir)  # warm-up: bytecode compilation, default config written
+        prompts = [time_to_prompt(workdir) for _ in range(runs)]
+        samples = [import_times(module, workdir) for _ in range(runs)]
+
+    names = set().union(*samples)
+    rows = []
+    for name in names:
+        selfs = [s[name][0] for s in samples if name in s]
+        cumulative = [s[name][1] for s in samples if name in s]
+        rows.append({
+            "module": name,
+            "self_ms": round(statistics.median(selfs) / 1000, 2),
+            "cumulative_ms": round(statistics.median(cumulative) / 1000, 2),
+        })
+    rows.sort(key=lambda r: -r["cumulative_ms"])
+    return {
+        "runs": runs,
+        "time_to_prompt_ms": {
+            "median": round(statistics.median(prompts) * 1000, 1),
+            "min": round(min(prompts) * 1000, 1),
+            "max": round(max(prompts) * 1000, 1),
+        },
+        "import": {
+            "module": module,
+            "total_ms": next((r["cumulative_ms"] for r in rows if r["module"] == module), None),
+            "modules_imported": len(names),
+            "slowest": rows[:top],
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure CLI time-to-prompt and per-module import time")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh-interpreter runs per measurement")
+    parser.add_argument("--top", type=int, default=25, help="Slowest modules (by cumulative time) to list")
+    parser.add_argument("--module", default="pagerduty_sre_bot.__main__", help="Module whose import is profiled")
+    args = parser.parse_args()
+    print(json.dumps(benchmark(args.runs, args.top, args.module), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Alert-storm coalescing for the monitor.
+
+Below the threshold every new incident is announced immediately. Once more
+than `threshold` arrive within `window_seconds`, further incidents are
+buffered and emitted every `interval_seconds` as digest groups (by service
+or by title template) with counts and the most common examples. The storm
+ends at the first flush after the arrival rate drops back to the threshold.
+"""
+
+import re
+import threading
+import time
+from collections import Counter, deque
+
+# Numbers, hex IDs and UUIDs vary between otherwise identical alert titles.
+_VARIABLE = re.compile(r"\b(?=[0-9a-f-]*\d)[0-9a-f-]{8,}\b|\d+(?:\.\d+)*", re.IGNORECASE)
+
+
+def title_template(title: str) -> str:
+    return _VARIABLE.sub("#", title or "").strip()
+
+
+def _service(inc: dict) -> str:
+    return (inc.get("service") or {}).get("summary") or "unknown service"
+
+
+class StormCoalescer:
+    def __init__(
+            self,
+            threshold: int,
+            window_seconds: float,
+            interval_seconds: float,
+            group_by: str = "service",
+            top_examples: int = 3,
+    ):
+        if group_by not in ("service", "title"):
+            raise ValueError("group_by must be 'service' or 'title'")
+        self.threshold = threshold
+        self.window = window_seconds
+        self.interval = interval_seconds
+        self.group_by = group_by
+        self.top_examples = top_examples
+        self.storming = False
+        self._arrivals: deque[float] = deque()
+        self._pending: dict[str, dict] = {}
+        self._last_flush = 0.0
+        self._lock = threading.Lock()
+
+    def _key_and_example(self, inc: dict) -> tuple[str, str]:
+        if self.group_by == "service":
+            return _service(inc), title_template(inc.get("title", ""))
+        return title_template(inc.get("title", "")), _service(inc)
+
+    def offer(self, inc: dict, rule_names: list[str], now: float | None = None) -> str:
+        """
+        Record an arrival: "announce" to show it now, "storm_started" when it
+        tipped the monitor into storm mode, or "buffered" for the next digest.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            self._arrivals.append(now)
+            while self._arrivals and self._arrivals[0] < now - self.window:
+                self._arrivals.popleft()
+            if not self.threshold or (not self.storming and len(self._arrivals) <= self.threshold):
+                return "announce"
+            outcome = "buffered"
+            if not self.storming:
+                self.storming = True
+                self._last_flush = now
+                outcome = "storm_started"
+            key, example = self._key_and_example(inc)
+            group = self._pending.setdefault(
+                key, {"key": key, "count": 0, "rules": set(), "examples": Counter(), "sample_ids": {}},
+            )
+            group["count"] += 1
+            group["rules"].update(rule_names)
+            group["examples"][example] += 1
+            group["sample_ids"].setdefault(example, inc.get("id", "?"))
+            return outcome
+
+    def _groups(self) -> list[dict]:
+        groups = sorted(self._pending.values(), key=lambda g: -g["count"])
+        self._pending = {}
+        return [
+            {
+                "key": g["key"],
+                "count": g["count"],
+                "rules": sorted(g["rules"]),
+                "examples": [
+                    {"example": ex, "count": n, "id": g["sample_ids"][ex]}
+                    for ex, n in g["examples"].most_common(self.top_examples)
+                ],
+            }
+            for g in groups
+        ]
+
+    def flush(self, now: float | None = None, force: bool = False) -> dict | None:
+        """
+        A digest {"groups", "total", "ended"} when the interval has elapsed
+        (or force is set) and something is buffered or the storm just ended;
+        otherwise None.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            if not self.storming or (not force and now - self._last_flush < self.interval):
+                return None
+            self._last_flush = now
+            while self._arrivals and self._arrivals[0] < now - self.window:
+                self._arrivals.popleft()
+            groups = self._groups()
+            ended = force or len(self._arrivals) <= self.threshold
+            if ended:
+                self.storming = False
+            if not groups and not ended:
+                return None
+            return {"groups": groups, "total": sum(g["count"] for g in groups), "ended": ended}
@@ -30,6 +30,7 @@ ANALYSIS: full_incident_analysis, analyze_patterns, check_sla_breaches, oncall_l
 
 UTILITY: resolve_time — converts natural language like "yesterday", "last Monday 9am"
          into ISO-8601 UTC. Always use this when the user gives a relative time.
+         read_result — pages, filters and projects a large result stored behind a result_handle.
 
 ═══ RULES ═══
 1. Always use tool/function calls to get real data. Never fabricate PagerDuty data.
@@ -39,8 +40,15 @@ UTILITY: resolve_time — converts natural language like "yesterday", "last Mond
 5. If multiple tool calls are needed, make all of them.
 6. If a result contains "truncated: true", note this to the user.
 7. DRY_RUN={dry_run_status}. If true, destructive operations are simulated.
-8. Current UTC time: {current_time}
+8. The current UTC time is given at the end of this prompt.
 9. For Events API calls, you need a routing_key (integration key from a service).
    Use list_service_integrations to find it if the user doesn't provide one.
 10. For responder requests, you need the requester's user ID. Use list_users to find it.
-"""
\ No newline at end of file
+11. Tool results are compact JSON. Lists of records may be tables: {{"columns": [...], "rows": [[...], ...]}},
+    where each row's values line up with the columns. Empty or null fields are omitted.
+12. A result with "result_handle" is a preview of a larger stored result (counts cover all rows).
+    Use read_result with that handle (filter/fields/offset) instead of re-running the original tool.
+"""
+
+# Appended after the cached prefix so the prompt cache survives across turns.
+CURRENT_TIME_TEMPLATE = "Current UTC time: {current_time}"
@@ -3,8 +3,6 @@
 from datetime import datetime, timezone, timedelta
 from typing import Optional
 
-import dateparser
-
 
 def parse_nl_time(text: str, default_tz: str = "UTC") -> Optional[str]:
     """
@@ -13,6 +11,8 @@ def parse_nl_time(text: str, default_tz: str = "UTC") -> Optional[str]:
     """
     if not text:
         return None
+    import dateparser  # slow to import; only needed once a time expression is parsed
+
     dt = dateparser.parse(
         text,
         settings={
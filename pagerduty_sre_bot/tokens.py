@@ -0,0 +1,34 @@
+"""Cheap token estimation for sizing LLM context."""
+
+import json
+from typing import Any
+
+# Claude averages roughly four characters of English/JSON per token.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(value: Any) -> int:
+    """Estimate the token count of a string, or of any value serialised as compact JSON."""
+    if value is None:
+        return 0
+    text = value if isinstance(value, str) else json.dumps(value, separators=(",", ":"), default=str)
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+# Role markers and block framing the API adds around each message.
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_message_tokens(message: dict) -> int:
+    """Estimate one chat message (string or content-block list) including framing overhead."""
+    return estimate_tokens(message.get("content")) + MESSAGE_OVERHEAD_TOKENS
+
+
+def estimate_history_tokens(history: list[dict]) -> int:
+    return sum(estimate_message_tokens(m) for m in history)
+
+
+def model_token_budget(config: dict, model: str) -> int:
+    """History token budget for a model: a per-model override, else the default budget."""
+    hist = config["history"]
+    return int(hist.get("model_token_budgets", {}).get(model, hist["token_budget"]))
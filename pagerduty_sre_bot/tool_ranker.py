@@ -0,0 +1,129 @@
+"""BM25 lexical ranking of tools against a user query.
+
+Each tool is indexed as a document built from its name (weighted), its
+description and its parameter names. Query terms are expanded through a
+small SRE synonym table before scoring.
+"""
+
+import math
+import re
+from collections import Counter
+
+_K1 = 1.5
+_B = 0.75
+_NAME_WEIGHT = 3
+
+_STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "for", "to", "in", "on", "at", "by", "with", "from",
+    "is", "are", "was", "were", "be", "it", "its", "this", "that", "me", "my", "i", "we", "our",
+    "you", "your", "what", "which", "who", "whom", "how", "do", "does", "did", "can", "please",
+    "show", "give", "tell", "all", "any", "some", "there", "right", "now", "just", "about",
+    "last", "past", "since", "until", "ago", "today", "yesterday", "day", "hour", "week", "month",
+    "s",
+}
+
+# Query-side expansions: colloquial SRE vocabulary → words used in tool docs.
+SYNONYMS: dict[str, str] = {
+    "oncall": "call schedule",
+    "call": "oncall",
+    "rotation": "schedule layers",
+    "shift": "schedule override",
+    "swap": "override",
+    "cover": "override",
+    "ack": "acknowledge",
+    "page": "notifications responders",
+    "paged": "notifications",
+    "outage": "incident",
+    "open": "incidents triggered",
+    "rca": "postmortem",
+    "retro": "postmortem",
+    "mtta": "analytics",
+    "mttr": "analytics",
+    "sla": "breached mtta mttr",
+    "noisy": "patterns recurring",
+    "burnout": "load paging",
+    "runbook": "automation action",
+    "remediation": "automation action",
+    "diagnostics": "automation action",
+    "deploy": "change event",
+    "deployment": "change event",
+    "release": "change event",
+    "dedup": "event routing key",
+    "stakeholders": "status update subscribers",
+    "email": "contact user",
+    "phone": "contact user",
+    "feature": "abilities",
+    "label": "tags",
+    "silence": "maintenance window",
+    "mute": "maintenance window",
+    "owner": "team",
+}
+
+
+def _stem(word: str) -> str:
+    """Crude suffix stripper — enough to fold plurals and verb forms together."""
+    for suffix in ("ations", "ation", "ments", "ment", "ies", "ing", "ed", "es", "s", "e", "y"):
+        if len(word) > len(suffix) + 2 and word.endswith(suffix):
+            return word[: -len(suffix)] + ("i" if suffix in ("ies", "y") else "")
+    return word
+
+
+_STOPWORDS_STEMMED = _STOPWORDS | {_stem(w) for w in _STOPWORDS}
+
+
+def tokenize(text: str) -> list[str]:
+    words = re.findall(r"[a-z0-9]+", text.lower().replace("_", " ").replace("-", ""))
+    stems = (_stem(w) for w in words if w not in _STOPWORDS and not w.isdigit())
+    return [w for w in stems if w not in _STOPWORDS_STEMMED]
+
+
+_SYNONYMS_STEMMED: dict[str, list[str]] = {_stem(k): tokenize(v) for k, v in SYNONYMS.items()}
+
+
+def _expand(terms: list[str]) -> list[str]:
+    out = list(terms)
+    for t in terms:
+        out.extend(_SYNONYMS_STEMMED.get(t, []))
+    return out
+
+
+def _document(tool: dict) -> list[str]:
+    params = " ".join((tool.get("input_schema") or {}).get("properties", {}).keys())
+    return tokenize(tool["name"]) * _NAME_WEIGHT + tokenize(tool.get("description", "")) + tokenize(params)
+
+
+def build_index(tools: list[dict]) -> dict:
+    """Build a BM25 index over Anthropic-format tool schemas."""
+    docs = [Counter(_document(t)) for t in tools]
+    lengths = [sum(d.values()) for d in docs]
+    df: Counter = Counter()
+    for d in docs:
+        df.update(d.keys())
+    n = len(docs)
+    return {
+        "names": [t["name"] for t in tools],
+        "docs": docs,
+        "lengths": lengths,
+        "avgdl": sum(lengths) / n if n else 0.0,
+        "idf": {term: math.log(1 + (n - f + 0.5) / (f + 0.5)) for term, f in df.items()},
+    }
+
+
+def rank_tools(index: dict, query: str) -> list[tuple[str, float]]:
+    """Return (tool_name, score) pairs with a positive score, best first."""
+    terms = Counter(_expand(tokenize(query)))
+    if not terms:
+        return []
+    scores = []
+    for name, doc, dl in zip(index["names"], index["docs"], index["lengths"], strict=True):
+        score = 0.0
+        for term, qf in terms.items():
+            tf = doc.get(term)
+            if not tf:
+                continue
+            norm = tf * (_K1 + 1) / (tf + _K1 * (1 - _B + _B * dl / index["avgdl"]))
+            score += index["idf"][term] * norm * qf
+        if score > 0:
+            scores.append((name, score))
+    scores.sort(key=lambda x: x[1], reverse=True)
+    return scores
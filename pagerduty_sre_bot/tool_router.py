@@ -1,8 +1,35 @@
 """Dynamic tool selection — routes queries to relevant tool subsets."""
 
-from pagerduty_sre_bot.schemas import TOOLS
+from pagerduty_sre_bot.schema_compiler import compile_bundle
+from pagerduty_sre_bot.tool_ranker import build_index, rank_tools
+from pagerduty_sre_bot.tokens import estimate_tokens
 from pagerduty_sre_bot.output import cprint
 
+# Max estimated tokens of tool schemas sent per request.
+_token_budget: int = 5000
+# "bm25" ranks individual tools and falls back to keyword groups when unsure;
+# "keywords" always uses the keyword groups.
+_mode: str = "bm25"
+_top_k: int = 12
+_min_confidence: float = 4.0
+
+
+def configure(
+        token_budget: int | None = None,
+        mode: str | None = None,
+        top_k: int | None = None,
+        min_confidence: float | None = None,
+) -> None:
+    global _token_budget, _mode, _top_k, _min_confidence
+    if token_budget:
+        _token_budget = int(token_budget)
+    if mode:
+        _mode = mode
+    if top_k:
+        _top_k = int(top_k)
+    if min_confidence is not None:
+        _min_confidence = float(min_confidence)
+
 TOOL_GROUPS: dict[str, list[str]] = {
     "incident": [
         "list_incidents", "get_incident", "get_incident_timeline",
@@ -53,7 +80,7 @@ TOOL_GROUPS: dict[str, list[str]] = {
         "create_webhook_subscription", "list_abilities",
         "list_extensions", "list_incident_workflows", "list_priorities",
     ],
-    "utility": ["resolve_time"],
+    "utility": ["resolve_time", "read_result"],
     # ═══ NEW GROUPS ══════════════════════════════════
     "events_api": [
         "send_event", "send_change_event",
@@ -121,8 +148,7 @@ _KEYWORD_RULES: list[tuple[set[str], list[str]]] = [
     ({"team", "teams", "member", "members", "membership"}, ["team", "utility"]),
     ({"escalation", "policy", "policies"}, ["escalation", "utility"]),
     ({"analytics", "mtta", "mttr", "report", "summary", "sla", "breach",
-      "pattern", "patterns", "burnout", "load report", "analysis", "last", "days",
-      "hours", "week", "month"},
+      "pattern", "patterns", "burnout", "load report", "analysis"},
      ["analytics", "incident", "utility"]),
     ({"notification", "paged", "log entry", "log entries"}, ["notification", "utility"]),
     ({"audit", "audit log", "config change"}, ["audit", "utility"]),
@@ -131,25 +157,125 @@ _KEYWORD_RULES: list[tuple[set[str], list[str]]] = [
      ["config", "utility"]),
 ]
 
-_TOOL_BY_NAME: dict[str, dict] = {t["function"]["name"]: t for t in TOOLS}
+# Loaded on the first routed query, not at startup: the schema catalogue, then
+# each group's Anthropic-format bundle + token cost as it is first selected.
+_schemas: dict[str, dict] | None = None
+_bundles: dict[str, dict] = {}
 
 
-def select_tools_for_query(query: str) -> list[dict]:
-    """Return minimal subset of TOOLS relevant to this query."""
+def _schema(name: str) -> dict | None:
+    global _schemas
+    if _schemas is None:
+        from pagerduty_sre_bot.schemas import TOOLS
+
+        _schemas = {t["function"]["name"]: t for t in TOOLS}
+    return _schemas.get(name)
+
+
+def tool_bundles(groups: list[str] | None = None) -> dict[str, dict]:
+    """Compiled bundles for the given groups (default: all), compiling each on first use."""
+    out = {}
+    for group in TOOL_GROUPS if groups is None else groups:
+        bundle = _bundles.get(group)
+        if bundle is None:
+            schemas = [_schema(n) for n in TOOL_GROUPS[group]]
+            bundle = _bundles[group] = compile_bundle([t for t in schemas if t is not None])
+        out[group] = bundle
+    return out
+
+
+def _select_groups(query: str) -> list[str]:
+    """Groups matched by the query, in rule order (utility first)."""
     q = query.lower()
-    selected_groups: set[str] = {"utility"}
+    selected: list[str] = ["utility"]
 
     for keywords, groups in _KEYWORD_RULES:
         if any(kw in q for kw in keywords):
-            selected_groups.update(groups)
+            selected.extend(g for g in groups if g not in selected)
+
+    if selected == ["utility"]:
+        selected.extend(["incident", "analytics"])
+    return selected
+
+
+def _fit_bundles(groups: list[str], budget: int) -> tuple[list[str], bool]:
+    """
+    Fit the selected groups under the token budget: use full schemas if they fit,
+    otherwise minified ones, dropping the latest-matched groups until it fits.
+    Returns (groups_kept, minified).
+    """
+    bundles = tool_bundles(groups)
+    if sum(bundles[g]["tokens"] for g in groups) <= budget:
+        return groups, False
+    kept = list(groups)
+    while len(kept) > 1 and sum(bundles[g]["minified_tokens"] for g in kept) > budget:
+        kept.pop()
+    return kept, True
+
 
-    if selected_groups == {"utility"}:
-        selected_groups.update(["incident", "analytics", "utility"])
+def route_by_keywords(query: str) -> tuple[list[dict], str]:
+    """Keyword-group routing. Returns (tools, routing description)."""
+    groups = [g for g in _select_groups(query) if g in TOOL_GROUPS]
+    kept, minified = _fit_bundles(groups, _token_budget)
+    bundles = tool_bundles(kept)
 
-    tool_names: set[str] = set()
-    for group in selected_groups:
-        tool_names.update(TOOL_GROUPS.get(group, []))
+    selected: list[dict] = []
+    seen: set[str] = set()
+    tokens = 0
+    for g in kept:
+        bundle = bundles[g]
+        tokens += bundle["minified_tokens"] if minified else bundle["tokens"]
+        for t in bundle["minified"] if minified else bundle["tools"]:
+            if t["name"] not in seen:
+                seen.add(t["name"])
+                selected.append(t)
 
-    selected = [_TOOL_BY_NAME[n] for n in tool_names if n in _TOOL_BY_NAME]
-    cprint(f"  [dim]Tool routing: {', '.join(sorted(selected_groups))} → {len(selected)} tools[/dim]")
-    return selected
\ No newline at end of file
+    note = " (minified)" if minified else ""
+    dropped = [g for g in groups if g not in kept]
+    if dropped:
+        note += f", dropped {', '.join(dropped)} over budget"
+    return selected, f"{', '.join(sorted(kept))} → {len(selected)} tools, ~{tokens} tokens{note}"
+
+
+# Every tool exactly once, and the BM25 index over them — built on the first ranked query.
+_all_tools: dict[str, dict] = {}
+_rank_index: dict | None = None
+
+
+def _ranking() -> tuple[dict[str, dict], dict]:
+    global _rank_index
+    if _rank_index is None:
+        _all_tools.update({t["name"]: t for b in tool_bundles().values() for t in b["tools"]})
+        _rank_index = build_index(list(_all_tools.values()))
+    return _all_tools, _rank_index
+
+
+# Sent with every ranked selection: time resolution and paging of stored results.
+_ALWAYS_TOOLS: list[str] = TOOL_GROUPS["utility"]
+
+
+def route_by_rank(query: str) -> tuple[list[dict], str] | None:
+    """
+    BM25 routing: the top-k tools scoring at least a fifth of the best score.
+    Returns None when the best score is under the confidence threshold.
+    """
+    all_tools, index = _ranking()
+    ranked = rank_tools(index, query)
+    if not ranked or ranked[0][1] < _min_confidence:
+        return None
+    floor = ranked[0][1] * 0.2
+    names = [n for n, score in ranked[:_top_k] if score >= floor]
+    names = [n for n in names if n not in _ALWAYS_TOOLS] + _ALWAYS_TOOLS
+
+    selected = [all_tools[n] for n in names]
+    while len(selected) > len(_ALWAYS_TOOLS) + 1 and estimate_tokens(selected) > _token_budget:
+        selected.pop(-len(_ALWAYS_TOOLS) - 1)  # keep the utility tools last
+    return selected, f"bm25 top-{len(selected)} (best={ranked[0][1]:.1f}), ~{estimate_tokens(selected)} tokens"
+
+
+def select_tools_for_query(query: str) -> list[dict]:
+    """Return the Anthropic-format tool subset relevant to this query, within the token budget."""
+    routed = route_by_rank(query) if _mode == "bm25" else None
+    selected, note = routed or route_by_keywords(query)
+    cprint(f"  [dim]Tool routing: {note}[/dim]")
+    return selected
@@ -1,23 +1,15 @@
-"""Tool implementations — re-exports all tool functions."""
+"""Tool implementations — one module per domain, imported lazily.
 
-from pagerduty_sre_bot.tools.incidents import *        # noqa: F401,F403
-from pagerduty_sre_bot.tools.services import *         # noqa: F401,F403
-from pagerduty_sre_bot.tools.users import *            # noqa: F401,F403
-from pagerduty_sre_bot.tools.teams import *            # noqa: F401,F403
-from pagerduty_sre_bot.tools.escalation import *       # noqa: F401,F403
-from pagerduty_sre_bot.tools.schedules import *        # noqa: F401,F403
-from pagerduty_sre_bot.tools.oncalls import *          # noqa: F401,F403
-from pagerduty_sre_bot.tools.analytics import *        # noqa: F401,F403
-from pagerduty_sre_bot.tools.maintenance import *      # noqa: F401,F403
-from pagerduty_sre_bot.tools.notifications import *    # noqa: F401,F403
-from pagerduty_sre_bot.tools.audit import *            # noqa: F401,F403
-from pagerduty_sre_bot.tools.config_resources import * # noqa: F401,F403
-from pagerduty_sre_bot.tools.analysis import *         # noqa: F401,F403
-from pagerduty_sre_bot.tools.utility import *          # noqa: F401,F403
-# ── New feature modules ──
-from pagerduty_sre_bot.tools.events import *           # noqa: F401,F403
-from pagerduty_sre_bot.tools.alerts import *           # noqa: F401,F403
-from pagerduty_sre_bot.tools.status_updates import *   # noqa: F401,F403
-from pagerduty_sre_bot.tools.custom_fields import *    # noqa: F401,F403
-from pagerduty_sre_bot.tools.automation import *       # noqa: F401,F403
-from pagerduty_sre_bot.tools.orchestration import *    # noqa: F401,F403
\ No newline at end of file
+`from pagerduty_sre_bot.tools import tool_list_incidents` still works, but
+only loads the module that defines it (see tool_registry.TOOL_MODULES).
+"""
+
+
+def __getattr__(name: str):
+    if name.startswith("tool_"):
+        from pagerduty_sre_bot.tool_registry import resolve_tool
+
+        fn = resolve_tool(name[len("tool_"):])
+        if fn is not None:
+            return fn
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,12 +3,14 @@
 import json
 import difflib
 from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import timezone
 
 from pagerduty_sre_bot.clients import pd_client, anthropic_client
 from pagerduty_sre_bot.helpers import safe_list, unwrap, MAX_RESULTS
 from pagerduty_sre_bot.time_utils import fmt_ts
+from pagerduty_sre_bot.tokens import estimate_tokens
 from pagerduty_sre_bot.output import cprint
 from pagerduty_sre_bot.tools.incidents import (
     tool_get_incident, tool_get_incident_timeline,
@@ -18,25 +20,130 @@ from pagerduty_sre_bot.tools.notifications import tool_list_notifications
 from pagerduty_sre_bot.tools.analytics import tool_get_analytics_incidents
 
 
+# Token budget for the incident data handed to the postmortem LLM call.
+POSTMORTEM_CONTEXT_TOKENS = 6000
+# Incident fields kept when everything else has to go.
+_CORE_FIELDS = ("id", "incident_number", "title", "status", "urgency", "service", "created_at", "resolved_at")
+
+
+def _dedupe_timeline(entries: list) -> list:
+    """Sort log entries oldest-first and fold consecutive repeats into one entry with a count."""
+    out: list = []
+    for e in sorted(entries, key=lambda x: x.get("created_at") or ""):
+        prev = out[-1] if out else None
+        if prev and prev.get("type") == e.get("type") and prev.get("summary") == e.get("summary"):
+            prev["repeated"] = prev.get("repeated", 1) + 1
+            prev["last_at"] = e.get("created_at")
+            continue
+        out.append({k: v for k, v in e.items() if v not in (None, "", [])})
+    return out
+
+
+def _collapse_alerts(alerts: list) -> list:
+    """Group alerts by summary, keeping counts and a short excerpt of the first body."""
+    groups: dict = {}
+    for a in sorted(alerts, key=lambda x: x.get("created_at") or ""):
+        key = a.get("summary") or a.get("id")
+        g = groups.get(key)
+        if g is None:
+            body = json.dumps(a["body"], default=str) if a.get("body") else ""
+            groups[key] = {
+                "summary": a.get("summary"), "severity": a.get("severity"), "status": a.get("status"),
+                "count": 1, "first_at": a.get("created_at"),
+                "body_excerpt": body[:300] + ("…" if len(body) > 300 else "") if body else None,
+            }
+        else:
+            g["count"] += 1
+            g["last_at"] = a.get("created_at")
+            g["status"] = a.get("status")
+    return list(groups.values())
+
+
+def _pack_postmortem_context(inc: dict, timeline: list, notes: list, alerts: list,
+                             budget: int = POSTMORTEM_CONTEXT_TOKENS) -> str:
+    """
+    Build the postmortem context within a token budget. Repeated log entries are
+    folded and alerts collapsed; if that is not enough, the middle of the timeline
+    is dropped so both the trigger and the resolution survive. Oversized alerts,
+    notes or incident fields are shed last, so the result always fits the budget.
+    """
+    inc = dict(inc)
+    if isinstance(inc.get("body"), dict):
+        details = json.dumps(inc["body"], default=str)
+        inc["body"] = details[:2000] + ("…" if len(details) > 2000 else "")
+    timeline = _dedupe_timeline(timeline)
+    alerts = _collapse_alerts(alerts)
+    ctx = {"incident": inc, "timeline": timeline, "notes": notes, "alerts": alerts}
+
+    def render() -> str:
+        return json.dumps(ctx, separators=(",", ":"), default=str)
+
+    if estimate_tokens(render()) <= budget:
+        return render()
+
+    for a in alerts:
+        a.pop("body_excerpt", None)
+
+    keep = len(timeline)
+    while estimate_tokens(render()) > budget and keep > 2:
+        keep = max(2, keep * 3 // 4)
+        head = max(1, keep // 3)
+        tail = keep - head
+        dropped = timeline[head:len(timeline) - tail]
+        ctx["timeline"] = timeline[:head] + [{
+            "omitted_entries": len(dropped),
+            "from": dropped[0].get("created_at") if dropped else None,
+            "to": dropped[-1].get("created_at") if dropped else None,
+        }] + timeline[len(timeline) - tail:]
+
+    if estimate_tokens(render()) > budget:
+        ctx["notes"] = [{**n, "content": (n.get("content") or "")[:500]} for n in notes]
+        ctx["alerts"] = alerts[:10]
+
+    # Still over: shed alerts, then the oldest notes, then the rest of the timeline.
+    while estimate_tokens(render()) > budget and ctx["alerts"]:
+        ctx["alerts"] = ctx["alerts"][:len(ctx["alerts"]) // 2]
+    while estimate_tokens(render()) > budget and ctx["notes"]:
+        ctx["notes"] = ctx["notes"][len(ctx["notes"]) // 2 + 1:]
+    if estimate_tokens(render()) > budget:
+        ctx["timeline"] = [{"omitted_entries": len(timeline)}]
+    if estimate_tokens(render()) > budget:
+        ctx["incident"] = {k: (str(v)[:200] if v is not None else None) for k, v in inc.items() if k in _CORE_FIELDS}
+    if estimate_tokens(render()) > budget:
+        ctx = {"incident": {"id": inc.get("id"), "title": str(inc.get("title") or "")[:200]},
+               "note": "Incident data omitted to fit the context budget."}
+    return render()
+
+
+def _fetch_source(fn, iid: str) -> dict:
+    """One postmortem source; a failure becomes an error result so the other sources still arrive."""
+    try:
+        return fn({"incident_id": iid})
+    except Exception as e:
+        return {"error": str(e)}
+
+
 def tool_generate_postmortem(args: dict, model_primary: str = "claude-sonnet-4-20250514") -> dict:
     """Auto-generate a structured postmortem for a resolved incident."""
     iid = args["incident_id"]
 
     cprint(f"[dim]  📋 Gathering incident data for {iid}…[/dim]")
-    inc = tool_get_incident({"incident_id": iid})
-    timeline = tool_get_incident_timeline({"incident_id": iid})
-    notes = tool_get_incident_notes({"incident_id": iid})
-    alerts = tool_get_incident_alerts({"incident_id": iid})
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [
+            pool.submit(_fetch_source, fn, iid)
+            for fn in (tool_get_incident, tool_get_incident_timeline, tool_get_incident_notes, tool_get_incident_alerts)
+        ]
+        inc, timeline, notes, alerts = (f.result() for f in futures)
 
     if "error" in inc:
         return {"error": f"Could not fetch incident: {inc['error']}"}
 
-    context = json.dumps({
-        "incident": inc,
-        "timeline": timeline.get("timeline_entries", [])[:50],
-        "notes": notes.get("notes", []),
-        "alerts": alerts.get("alerts", [])[:20],
-    }, indent=2, default=str)
+    context = _pack_postmortem_context(
+        inc,
+        timeline.get("timeline_entries", []),
+        notes.get("notes", []),
+        alerts.get("alerts", []),
+    )
 
     prompt = (
         "You are an expert SRE writing a postmortem. Given the incident data, "
@@ -49,7 +156,7 @@ def tool_generate_postmortem(args: dict, model_primary: str = "claude-sonnet-4-2
         resp = anthropic_client.messages.create(
             model=model_primary,
             system=prompt,
-            messages=[{"role": "user", "content": f"Incident data:\n\n{context[:12000]}"}],
+            messages=[{"role": "user", "content": f"Incident data:\n\n{context}"}],
             max_tokens=2000,
         )
         text = resp.content[0].text if resp.content else ""
@@ -152,12 +259,13 @@ def tool_check_sla_breaches(args: dict, config: dict | None = None) -> dict:
     mtta_threshold = args.get("mtta_threshold_seconds", sla_mtta)
     mttr_threshold = args.get("mttr_threshold_seconds", sla_mttr)
 
+    # Read the whole window (sliced and fetched in parallel) so the rates cover every incident.
     analytics = tool_get_analytics_incidents({
         "since": args["since"],
         "until": args["until"],
         "service_ids": args.get("service_ids"),
         "team_ids": args.get("team_ids"),
-    })
+    }, limit=None)
     if "error" in analytics:
         return analytics
 
@@ -186,7 +294,8 @@ def tool_check_sla_breaches(args: dict, config: dict | None = None) -> dict:
             })
 
     total = len(analytics.get("analytics_incidents", []))
-    return {
+    worst = sorted(breaches, key=lambda x: (x.get("mtta_overage_sec") or 0) + (x.get("mttr_overage_sec") or 0), reverse=True)
+    out = {
         "window": {"since": args["since"], "until": args["until"]},
         "sla_thresholds": {"mtta_seconds": mtta_threshold, "mttr_seconds": mttr_threshold},
         "total_analysed": total,
@@ -194,8 +303,12 @@ def tool_check_sla_breaches(args: dict, config: dict | None = None) -> dict:
         "mtta_breach_count": mtta_bc,
         "mttr_breach_count": mttr_bc,
         "breach_rate_pct": round(len(breaches) / total * 100, 1) if total else 0,
-        "breaches": sorted(breaches, key=lambda x: (x.get("mtta_overage_sec") or 0) + (x.get("mttr_overage_sec") or 0), reverse=True),
+        "breaches": worst[:MAX_RESULTS],
     }
+    if len(worst) > MAX_RESULTS:
+        out["truncated"] = True
+        out["note"] = f"Showing the {MAX_RESULTS} worst of {len(worst)} breaches."
+    return out
 
 
 def tool_oncall_load_report(args: dict) -> dict:
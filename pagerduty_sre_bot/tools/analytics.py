@@ -1,46 +1,132 @@
 """Analytics and full incident analysis tools."""
 
 from collections import Counter
+from contextlib import suppress
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta, timezone
 
 from pagerduty_sre_bot.clients import pd_client
 from pagerduty_sre_bot.helpers import safe_list, unwrap, MAX_RESULTS
+from pagerduty_sre_bot.lifecycle import replay_incident, aggregate_lifecycles
 from pagerduty_sre_bot.retry import with_retry
-from pagerduty_sre_bot.time_utils import diff_minutes
+from pagerduty_sre_bot.time_utils import fmt_ts
+
+# Long analytics windows are split into independent slices fetched in parallel.
+_slice_hours: float = 24.0
+_max_workers: int = 8
+
+
+def configure(slice_hours: float | None = None, max_workers: int | None = None) -> None:
+    global _slice_hours, _max_workers
+    if slice_hours is not None:
+        if float(slice_hours) <= 0:
+            raise ValueError(f"analytics.slice_hours must be > 0, got {slice_hours}")
+        _slice_hours = float(slice_hours)
+    if max_workers is not None:
+        if int(max_workers) < 1:
+            raise ValueError(f"analytics.max_parallel_slices must be >= 1, got {max_workers}")
+        _max_workers = int(max_workers)
+
+
+def _analytics_filters(args: dict) -> dict:
+    filters: dict = {}
+    if args.get("since"):       filters["created_at_start"] = args["since"]
+    if args.get("until"):       filters["created_at_end"] = args["until"]
+    if args.get("service_ids"): filters["service_ids"] = args["service_ids"]
+    if args.get("team_ids"):    filters["team_ids"] = args["team_ids"]
+    if args.get("urgencies") and len(args["urgencies"]) == 1:
+        filters["urgency"] = args["urgencies"][0]
+    return filters
+
+
+def _time_slices(since: str, until: str) -> list[tuple[str, str]]:
+    """Split [since, until) into consecutive slices of _slice_hours, newest first."""
+    s, e = fmt_ts(since), fmt_ts(until)
+    if not s or not e:
+        return [(since, until)]
+    # Naive inputs are UTC; aware ones are converted so the "Z" suffix below is accurate.
+    s = s.replace(tzinfo=timezone.utc) if s.tzinfo is None else s.astimezone(timezone.utc)
+    e = e.replace(tzinfo=timezone.utc) if e.tzinfo is None else e.astimezone(timezone.utc)
+    step = timedelta(hours=_slice_hours)
+    if e - s <= step:
+        return [(since, until)]
+
+    slices = []
+    start = s
+    while start < e:
+        end = min(start + step, e)
+        slices.append((start.strftime("%Y-%m-%dT%H:%M:%SZ"), end.strftime("%Y-%m-%dT%H:%M:%SZ")))
+        start = end
+    # Analytics cursors return newest first, so the merged stream must too.
+    slices.reverse()
+    return slices
+
+
+def _fetch_slice(filters: dict, limit: int | None) -> list:
+    items = []
+    for item in pd_client.iter_analytics_raw_incidents(filters=filters):
+        items.append(item)
+        if limit is not None and len(items) >= limit:
+            break
+    return items
+
+
+def fetch_analytics_raw_incidents(filters: dict, limit: int | None = MAX_RESULTS) -> tuple[list, bool]:
+    """
+    Read raw analytics incidents for a window, fanning out one cursor per time slice.
+    Slices are fetched newest-first in waves of _max_workers and merged in order,
+    stopping early once limit is reached. Returns (items, truncated).
+    """
+    since, until = filters.get("created_at_start"), filters.get("created_at_end")
+    if not since or not until:
+        items = _fetch_slice(filters, limit + 1 if limit is not None else None)
+        truncated = limit is not None and len(items) > limit
+        return items[:limit] if truncated else items, truncated
+
+    slices = _time_slices(since, until)
+    per_slice_limit = limit + 1 if limit is not None else None
+    results: list = []
+    with ThreadPoolExecutor(max_workers=min(_max_workers, len(slices))) as pool:
+        for i in range(0, len(slices), _max_workers):
+            wave = [
+                {**filters, "created_at_start": start, "created_at_end": end}
+                for start, end in slices[i:i + _max_workers]
+            ]
+            for items in pool.map(lambda f: _fetch_slice(f, per_slice_limit), wave):
+                results.extend(items)
+            if limit is not None and len(results) > limit:
+                return results[:limit], True
+    return results, False
+
+
+def _analytics_row(item: dict) -> dict:
+    return {
+        "incident_id": item.get("id"),
+        "incident_number": item.get("incident_number"),
+        "title": item.get("title", item.get("description", "")),
+        "urgency": item.get("urgency"),
+        "status": item.get("status"),
+        "service_name": item.get("service_name"),
+        "created_at": item.get("created_at"),
+        "resolved_at": item.get("resolved_at"),
+        "seconds_to_first_ack": item.get("seconds_to_first_ack"),
+        "seconds_to_resolve": item.get("seconds_to_resolve"),
+        "seconds_to_engage": item.get("seconds_to_engage"),
+        "engaged_seconds": item.get("engaged_seconds"),
+        "escalation_count": item.get("escalation_count"),
+        "assignment_count": item.get("assignment_count"),
+        "engaged_user_count": item.get("engaged_user_count"),
+    }
 
 
 @with_retry()
-def tool_get_analytics_incidents(args: dict) -> dict:
+def tool_get_analytics_incidents(args: dict, limit: int | None = MAX_RESULTS) -> dict:
     try:
-        filters: dict = {}
-        if args.get("since"):       filters["created_at_start"] = args["since"]
-        if args.get("until"):       filters["created_at_end"] = args["until"]
-        if args.get("service_ids"): filters["service_ids"] = args["service_ids"]
-        if args.get("team_ids"):    filters["team_ids"] = args["team_ids"]
-        if args.get("urgencies") and len(args["urgencies"]) == 1:
-            filters["urgency"] = args["urgencies"][0]
-
-        results = []
-        for item in pd_client.iter_analytics_raw_incidents(filters=filters):
-            results.append({
-                "incident_id": item.get("id"),
-                "incident_number": item.get("incident_number"),
-                "title": item.get("title", item.get("description", "")),
-                "urgency": item.get("urgency"),
-                "status": item.get("status"),
-                "service_name": item.get("service_name"),
-                "created_at": item.get("created_at"),
-                "resolved_at": item.get("resolved_at"),
-                "seconds_to_first_ack": item.get("seconds_to_first_ack"),
-                "seconds_to_resolve": item.get("seconds_to_resolve"),
-                "seconds_to_engage": item.get("seconds_to_engage"),
-                "engaged_seconds": item.get("engaged_seconds"),
-                "escalation_count": item.get("escalation_count"),
-                "assignment_count": item.get("assignment_count"),
-                "engaged_user_count": item.get("engaged_user_count"),
-            })
-            if len(results) >= MAX_RESULTS:
-                break
-        return {"total": len(results), "analytics_incidents": results}
+        items, truncated = fetch_analytics_raw_incidents(_analytics_filters(args), limit)
+        out = {"total": len(items), "analytics_incidents": [_analytics_row(i) for i in items]}
+        if truncated:
+            out["truncated"] = True
+        return out
     except Exception as e:
         return {"error": str(e)}
 
@@ -99,27 +185,21 @@ def tool_full_incident_analysis(args: dict) -> dict:
     total_esc = 0
     results = []
 
+    replays = []
     for inc in incidents:
-        trigger = ack = resolve = None
-        esc = 0
-        try:
-            for log in pd_client.iter_all(
-                    f"incidents/{inc['id']}/log_entries", params={"is_overview": True}
-            ):
-                lt = log["type"]
-                if lt == "trigger_log_entry":
-                    trigger = log["created_at"]
-                elif lt == "acknowledge_log_entry" and not ack:
-                    ack = log["created_at"]
-                elif lt == "resolve_log_entry":
-                    resolve = log["created_at"]
-                elif lt == "escalate_log_entry":
-                    esc += 1
-        except Exception:
-            pass
-
-        mtta = diff_minutes(trigger, ack) if trigger and ack else None
-        mttr = diff_minutes(trigger, resolve) if trigger and resolve else None
+        logs: list = []
+        with suppress(Exception):
+            logs = list(pd_client.iter_all(
+                f"incidents/{inc['id']}/log_entries", params={"is_overview": True}
+            ))
+
+        replay = replay_incident(logs)
+        replays.append(replay)
+        trigger, ack, resolve = replay["first_trigger"], replay["first_ack"], replay["last_resolve"]
+        esc = replay["escalations"]
+
+        mtta = round((ack - trigger).total_seconds() / 60, 2) if trigger and ack else None
+        mttr = round((resolve - trigger).total_seconds() / 60, 2) if trigger and resolve else None
         if mtta is not None:
             all_mtta.append(mtta)
         if mttr is not None:
@@ -142,6 +222,10 @@ def tool_full_incident_analysis(args: dict) -> dict:
             "mtta_minutes": mtta,
             "mttr_minutes": mttr,
             "escalations": esc,
+            "reassignments": replay["reassignments"],
+            "retriggers": replay["retriggers"],
+            "time_in_state_minutes": {k: round(v / 60, 2) for k, v in replay["state_seconds"].items()},
+            "escalation_level_minutes": {f"level_{k}": round(v / 60, 2) for k, v in replay["level_seconds"].items()},
         })
 
     avg_mtta = round(sum(all_mtta) / len(all_mtta), 2) if all_mtta else None
@@ -157,6 +241,7 @@ def tool_full_incident_analysis(args: dict) -> dict:
             "average_mtta_minutes": avg_mtta,
             "average_mttr_minutes": avg_mttr,
             "total_escalations": total_esc,
+            "lifecycle": aggregate_lifecycles(replays),
         },
         "incidents": results,
     }
\ No newline at end of file
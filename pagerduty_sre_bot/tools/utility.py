@@ -1,5 +1,6 @@
-"""Utility tools: time resolution."""
+"""Utility tools: time resolution, stored-result paging."""
 
+from pagerduty_sre_bot import result_store
 from pagerduty_sre_bot.time_utils import parse_nl_time
 
 
@@ -12,4 +13,16 @@ def tool_resolve_time(args: dict) -> dict:
     return {
         "error": f"Could not parse time expression: '{expr}'",
         "hint": "Try 'yesterday', 'last Monday 9am', '3 hours ago', '2025-01-15'",
-    }
\ No newline at end of file
+    }
+
+
+def tool_read_result(args: dict) -> dict:
+    """Page, filter or project a large result stored out of band."""
+    return result_store.read(
+        args["result_handle"],
+        path=args.get("path"),
+        offset=max(0, int(args.get("offset", 0))),
+        limit=min(max(1, int(args.get("limit", 20))), 100),
+        filters=args.get("filter"),
+        fields=args.get("fields"),
+    )
@@ -0,0 +1,198 @@
+"""Local receiver for PagerDuty V3 webhooks — push-based alternative to polling.
+
+Deliveries are verified against the subscription secret
+(X-PagerDuty-Signature: v1=<hex HMAC-SHA256 of the raw body>), then fed to
+the monitor's notification path and to cache invalidation. While incident
+deliveries keep arriving, and the subscription scope (webhooks.scope) covers
+every watch rule, the monitor polls only as a slow backstop; if they stop,
+polling resumes from its watermark.
+
+Local testing without PagerDuty:
+
+    python -m pagerduty_sre_bot.webhooks send --type incident.triggered --count 3
+
+sends signed sample events to the receiver (see --help).
+"""
+
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from dotenv import load_dotenv
+
+from pagerduty_sre_bot.output import cprint
+
+SIGNATURE_HEADER = "X-PagerDuty-Signature"
+MAX_BODY_BYTES = 1_000_000
+
+_server: ThreadingHTTPServer | None = None
+_secret = ""
+_path = "/pagerduty"
+_stats = {"received": 0, "rejected": 0, "incidents": 0}
+
+
+def sign(body: bytes, secret: str) -> str:
+    return "v1=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(body: bytes, header: str | None, secret: str) -> bool:
+    """True if any v1 signature in the (comma-separated) header matches the body."""
+    if not header or not secret:
+        return False
+    expected = sign(body, secret)
+    return any(hmac.compare_digest(sig.strip(), expected) for sig in header.split(","))
+
+
+def handle_event(event: dict) -> None:
+    """Route one verified V3 event to the monitor and cache invalidation."""
+    from pagerduty_sre_bot import answer_cache, monitoring
+    from pagerduty_sre_bot.cache import cache_clear
+
+    event_type = event.get("event_type", "")
+    data = event.get("data") or {}
+    if event.get("resource_type") == "incident" or event_type.startswith("incident."):
+        # Only incident deliveries prove the push path can stand in for polling.
+        monitoring.record_push()
+        _stats["incidents"] += 1
+        answer_cache.answer_cache_clear()
+        if event_type == "incident.triggered" and data.get("id"):
+            monitoring.notify_incident(data)
+    elif event_type.startswith("service."):
+        cache_clear("services")
+        answer_cache.answer_cache_clear()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self) -> None:  # noqa: N802 — http.server naming
+        if self.path.split("?")[0] != _path:
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0 or length > MAX_BODY_BYTES:
+            self.send_error(413 if length else 400)
+            return
+        body = self.rfile.read(length)
+        if not verify_signature(body, self.headers.get(SIGNATURE_HEADER), _secret):
+            _stats["rejected"] += 1
+            self.send_error(401, "Invalid signature")
+            return
+        try:
+            event = json.loads(body).get("event") or {}
+        except ValueError:
+            self.send_error(400, "Invalid JSON")
+            return
+        _stats["received"] += 1
+        self.send_response(202)
+        self.end_headers()
+        try:
+            handle_event(event)
+        except Exception as e:
+            cprint(f"[dim]Webhook handling error: {e}[/dim]")
+
+    def log_message(self, format: str, *args) -> None:
+        pass  # keep the chat console quiet
+
+
+def start_receiver(config: dict) -> bool:
+    """Start the receiver thread if webhooks are enabled and a secret is set."""
+    global _server, _secret, _path
+    wh = config["webhooks"]
+    if not wh["enabled"]:
+        return False
+    _secret = os.getenv(wh["secret_env"], "")
+    if not _secret:
+        cprint(f"[yellow]⚠  Webhooks enabled but ${wh['secret_env']} is not set; staying on polling.[/yellow]")
+        return False
+    _path = wh["path"]
+    _server = ThreadingHTTPServer((wh["host"], wh["port"]), _Handler)
+    threading.Thread(target=_server.serve_forever, daemon=True, name="pd-webhooks").start()
+    cprint(f"[dim]Webhook receiver listening on http://{wh['host']}:{wh['port']}{_path}[/dim]")
+    return True
+
+
+def stop_receiver() -> None:
+    global _server
+    if _server is not None:
+        _server.shutdown()
+        _server = None
+
+
+def get_webhook_stats() -> dict:
+    return dict(_stats)
+
+
+# ── Local event generator ─────────────────────────────
+
+def build_event(
+        event_type: str = "incident.triggered",
+        urgency: str = "high",
+        service: str = "Local Test Service",
+) -> dict:
+    """A V3 webhook payload shaped like PagerDuty's, for local testing."""
+    now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    iid = "Q" + uuid.uuid4().hex[:13].upper()
+    return {
+        "event": {
+            "id": uuid.uuid4().hex,
+            "event_type": event_type,
+            "resource_type": "incident",
+            "occurred_at": now,
+            "data": {
+                "id": iid,
+                "type": "incident",
+                "title": f"Synthetic {event_type} event",
+                "html_url": f"https://example.pagerduty.com/incidents/{iid}",
+                "status": event_type.split(".", 1)[1] if event_type.startswith("incident.") else "triggered",
+                "urgency": urgency,
+                "created_at": now,
+                "service": {"id": "PLOCAL1", "type": "service_reference", "summary": service},
+            },
+        }
+    }
+
+
+def send_event(url: str, secret: str, payload: dict) -> int:
+    """POST a signed payload to a receiver; returns the HTTP status."""
+    body = json.dumps(payload).encode()
+    req = urllib.request.Request(
+        url, data=body, method="POST",
+        headers={"Content-Type": "application/json", SIGNATURE_HEADER: sign(body, secret)},
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            return resp.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Send signed sample PagerDuty V3 webhook events")
+    sub = parser.add_subparsers(dest="command", required=True)
+    send = sub.add_parser("send", help="Send sample events to a running receiver")
+    send.add_argument("--url", default="http://127.0.0.1:8787/pagerduty")
+    send.add_argument("--secret-env", default="PAGERDUTY_WEBHOOK_SECRET")
+    send.add_argument("--type", default="incident.triggered")
+    send.add_argument("--urgency", default="high")
+    send.add_argument("--count", type=int, default=1)
+    args = parser.parse_args()
+
+    load_dotenv(".env")
+    secret = os.getenv(args.secret_env, "")
+    if not secret:
+        parser.error(f"${args.secret_env} is not set")
+    for _ in range(args.count):
+        payload = build_event(args.type, args.urgency)
+        status = send_event(args.url, secret, payload)
+        print(f"{payload['event']['event_type']} {payload['event']['data']['id']} → HTTP {status}")
+
+
+if __name__ == "__main__":
+    main()
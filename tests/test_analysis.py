@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from pagerduty_sre_bot.tokens import estimate_tokens
+from pagerduty_sre_bot.tools import analysis
+
+
+def log(minute: int, log_type: str = "notify_log_entry", summary: str = "Notified") -> dict:
+    return {"type": log_type, "summary": summary, "created_at": f"2025-01-15T10:{minute:02d}:00Z", "agent": None}
+
+
+def test_dedupe_timeline_sorts_and_folds_consecutive_repeats():
+    entries = [log(3), log(1, "trigger_log_entry", "Triggered"), log(2), log(4, "resolve_log_entry", "Resolved")]
+    out = analysis._dedupe_timeline(entries)
+    assert [e["type"] for e in out] == ["trigger_log_entry", "notify_log_entry", "resolve_log_entry"]
+    assert out[1]["repeated"] == 2 and out[1]["last_at"] == "2025-01-15T10:03:00Z"
+    assert "agent" not in out[0]
+
+
+def test_collapse_alerts_groups_by_summary():
+    alerts = [
+        {"id": "A2", "summary": "CPU high", "status": "resolved", "created_at": "2025-01-15T10:05:00Z"},
+        {"id": "A1", "summary": "CPU high", "status": "triggered", "created_at": "2025-01-15T10:00:00Z",
+         "body": {"details": "x" * 1000}},
+        {"id": "A3", "summary": "Disk full", "status": "triggered", "created_at": "2025-01-15T10:01:00Z"},
+    ]
+    groups = analysis._collapse_alerts(alerts)
+    cpu = next(g for g in groups if g["summary"] == "CPU high")
+    assert cpu["count"] == 2 and cpu["status"] == "resolved" and cpu["last_at"] == "2025-01-15T10:05:00Z"
+    assert len(cpu["body_excerpt"]) == 301
+    assert len(groups) == 2
+
+
+def test_small_context_is_packed_whole():
+    inc = {"id": "P1", "title": "Outage"}
+    packed = json.loads(analysis._pack_postmortem_context(inc, [log(1)], [], [], budget=1000))
+    assert packed["incident"] == inc and len(packed["timeline"]) == 1
+
+
+def test_long_timeline_keeps_trigger_and_resolution():
+    timeline = [log(0, "trigger_log_entry", "Triggered")]
+    timeline += [log(i % 60, summary=f"Notified user {i}") for i in range(1, 400)]
+    timeline.append({"type": "resolve_log_entry", "summary": "Resolved", "created_at": "2025-01-15T11:30:00Z"})
+    text = analysis._pack_postmortem_context({"id": "P1"}, timeline, [], [], budget=800)
+    packed = json.loads(text)
+    assert estimate_tokens(text) <= 800
+    assert packed["timeline"][0]["type"] == "trigger_log_entry"
+    assert packed["timeline"][-1]["type"] == "resolve_log_entry"
+    assert any("omitted_entries" in e for e in packed["timeline"])
+
+
+@pytest.mark.parametrize("budget", [300, 1000, 3000])
+def test_oversized_payloads_never_exceed_the_budget(budget):
+    inc = {"id": "P1", "title": "Outage", "description": "d" * 20_000, "body": {"details": "b" * 20_000}}
+    notes = [{"content": "n" * 5000, "created_at": f"2025-01-15T10:{i:02d}:00Z"} for i in range(20)]
+    alerts = [{"id": f"A{i}", "summary": f"alert {i} " + "s" * 2000, "created_at": "2025-01-15T10:00:00Z"}
+              for i in range(50)]
+    text = analysis._pack_postmortem_context(inc, [log(i) for i in range(30)], notes, alerts, budget=budget)
+    assert estimate_tokens(text) <= budget
+    assert json.loads(text)["incident"]["id"] == "P1"
+
+
+def test_one_failing_source_does_not_sink_the_fetch(monkeypatch, tmp_path):
+    def boom(args):
+        raise RuntimeError("notes unavailable")
+
+    captured = {}
+
+    class Messages:
+        def create(self, **kwargs):
+            captured["content"] = kwargs["messages"][0]["content"]
+            return type("Resp", (), {"content": [type("Block", (), {"text": "# Postmortem"})()]})()
+
+    monkeypatch.setattr(analysis, "tool_get_incident", lambda a: {"id": a["incident_id"], "title": "Outage"})
+    monkeypatch.setattr(analysis, "tool_get_incident_timeline", lambda a: {"timeline_entries": [log(1)]})
+    monkeypatch.setattr(analysis, "tool_get_incident_notes", boom)
+    monkeypatch.setattr(analysis, "tool_get_incident_alerts", lambda a: {"alerts": []})
+    monkeypatch.setattr(analysis, "anthropic_client", type("Client", (), {"messages": Messages()})())
+
+    result = analysis.tool_generate_postmortem({"incident_id": "P1", "output_file": str(tmp_path / "pm.md")})
+    assert result["success"] is True
+    assert "notify_log_entry" in captured["content"]
+    assert (tmp_path / "pm.md").read_text() == "# Postmortem"
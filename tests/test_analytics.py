@@ -0,0 +1,30 @@
+import pytest
+
+from pagerduty_sre_bot.tools import analytics
+
+
+def test_short_window_is_a_single_slice():
+    assert analytics._time_slices("2025-01-15T00:00:00Z", "2025-01-15T12:00:00Z") == [
+        ("2025-01-15T00:00:00Z", "2025-01-15T12:00:00Z"),
+    ]
+
+
+def test_long_window_is_sliced_newest_first():
+    assert analytics._time_slices("2025-01-14T00:00:00Z", "2025-01-15T12:00:00Z") == [
+        ("2025-01-15T00:00:00Z", "2025-01-15T12:00:00Z"),
+        ("2025-01-14T00:00:00Z", "2025-01-15T00:00:00Z"),
+    ]
+
+
+def test_offset_bounds_are_converted_to_utc():
+    assert analytics._time_slices("2025-01-15T00:00:00+02:00", "2025-01-17T00:00:00+02:00") == [
+        ("2025-01-15T22:00:00Z", "2025-01-16T22:00:00Z"),
+        ("2025-01-14T22:00:00Z", "2025-01-15T22:00:00Z"),
+    ]
+
+
+@pytest.mark.parametrize("settings", [{"slice_hours": 0}, {"slice_hours": -6}, {"max_workers": 0}])
+def test_configure_rejects_non_positive_settings(settings):
+    with pytest.raises(ValueError):
+        analytics.configure(**settings)
+    assert analytics._slice_hours > 0 and analytics._max_workers >= 1
@@ -0,0 +1,86 @@
+import time
+
+import pytest
+
+from pagerduty_sre_bot import answer_cache
+from pagerduty_sre_bot.cache import cache_clear, cache_get, cache_set
+
+SERVICES = {"services": [{"id": "S1", "name": "payments"}]}
+WINDOW = {"since": "2026-01-01T00:00:00Z", "until": "2026-01-02T00:00:00Z"}
+INCIDENTS = {"incidents": [{"id": "P1", "status": "resolved"}]}
+
+
+@pytest.fixture
+def live(monkeypatch):
+    """Fake PagerDuty reads served from a mutable dict; records each revalidation call."""
+    data = {"list_services": SERVICES, "list_incidents": INCIDENTS}
+    calls = []
+
+    def fake_execute(name, args):
+        calls.append(name)
+        return data[name]
+
+    monkeypatch.setattr(answer_cache, "execute_tool", fake_execute)
+    answer_cache.configure(enabled=True, max_age_seconds=600, max_entries=10)
+    answer_cache.answer_cache_clear()
+    yield data, calls
+    answer_cache.answer_cache_clear()
+    cache_clear()
+
+
+def test_unchanged_data_is_served_after_revalidation(live):
+    data, calls = live
+    assert answer_cache.store("Show me the services", "payments", [("list_services", {}, SERVICES)])
+    hit = answer_cache.lookup("services please")
+    assert hit["answer"] == "payments" and hit["revalidated"] == 1
+    assert calls == ["list_services"]
+
+
+def test_fingerprint_mismatch_is_a_miss_and_evicts(live):
+    data, _ = live
+    answer_cache.store("incidents on 1 january", "one", [("list_incidents", WINDOW, INCIDENTS)])
+    data["list_incidents"] = {"incidents": [{"id": "P1", "status": "resolved"}, {"id": "P2", "status": "resolved"}]}
+    assert answer_cache.lookup("incidents on 1 january") is None
+    assert answer_cache.get_answer_cache_stats()["entries"] == 0
+
+
+def test_entries_expire_after_max_age(live, monkeypatch):
+    answer_cache.store("services", "payments", [("list_services", {}, SERVICES)])
+    later = time.time() + 601
+    monkeypatch.setattr(answer_cache.time, "time", lambda: later)
+    assert answer_cache.lookup("services") is None
+    assert answer_cache.get_answer_cache_stats()["entries"] == 0
+
+
+@pytest.mark.parametrize("calls", [
+    [("create_incident_note", {"incident_id": "P1"}, {"ok": True})],
+    [("acknowledge_incident", {"incident_id": "P1"}, {"ok": True})],
+    [("generate_postmortem", {"incident_id": "P1"}, {"success": True})],
+    [("list_incidents", WINDOW, {"error": "rate limited"})],
+    [("resolve_time", {"expression": "yesterday"}, {"iso8601_utc": "2026-01-01T00:00:00Z"})],
+])
+def test_mutating_error_and_clock_calls_are_not_cached(live, calls):
+    assert not answer_cache.store("incidents on 1 january", "answer", calls)
+
+
+def test_windows_reaching_now_are_not_cached(live):
+    now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    args = {"since": "2026-01-01T00:00:00Z", "until": now}
+    assert not answer_cache.store("incidents this week", "answer", [("list_incidents", args, INCIDENTS)])
+
+
+def test_context_dependent_questions_are_not_cached(live):
+    assert not answer_cache.store("show that incident again", "answer", [("list_services", {}, SERVICES)])
+
+
+def test_revalidation_bypasses_the_resource_cache(live, monkeypatch):
+    fresh = {"services": [{"id": "S1", "name": "payments"}, {"id": "S2", "name": "search"}]}
+
+    def cached_list_services(name, args):
+        return cache_get("services::") or fresh
+
+    monkeypatch.setattr(answer_cache, "execute_tool", cached_list_services)
+    cache_set("services::", SERVICES)
+    answer_cache.store("services", "payments", [("list_services", {}, SERVICES)])
+    assert answer_cache.lookup("services") is None
+    assert cache_get("services::") == SERVICES  # the bypass is scoped to revalidation
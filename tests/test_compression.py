@@ -0,0 +1,81 @@
+import copy
+
+import pytest
+
+from pagerduty_sre_bot import compression
+from pagerduty_sre_bot.config import DEFAULT_CONFIG
+
+
+class Messages:
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        return type("Resp", (), {"content": [type("Block", (), {"text": "- earlier work"})()]})()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    messages = Messages()
+    monkeypatch.setattr(compression, "anthropic_client", type("Client", (), {"messages": messages})())
+    monkeypatch.setattr(compression, "cprint", lambda *a, **k: None)
+    return messages
+
+
+def config(budget, **history):
+    cfg = copy.deepcopy(DEFAULT_CONFIG)
+    cfg["history"].update(token_budget=budget, **history)
+    return cfg
+
+
+def tool_exchange(n):
+    """A prompt answered through one tool round trip."""
+    return [
+        {"role": "user", "content": f"question {n} " + "x" * 200},
+        {"role": "assistant", "content": [{"type": "tool_use", "id": f"t{n}", "name": "list_incidents", "input": {}}]},
+        {"role": "user", "content": [{"type": "tool_result", "tool_use_id": f"t{n}", "content": "y" * 400}]},
+        {"role": "assistant", "content": f"answer {n} " + "z" * 200},
+    ]
+
+
+def orphans(history):
+    """tool_result ids whose tool_use is not in the history, and tool_use ids left without a result."""
+    uses = {b["id"] for m in history if isinstance(m["content"], list) for b in m["content"] if b["type"] == "tool_use"}
+    results = {b["tool_use_id"] for m in history if isinstance(m["content"], list)
+               for b in m["content"] if b["type"] == "tool_result"}
+    return uses ^ results
+
+
+def summary(history):
+    return history[0]["content"].startswith("[CONVERSATION SUMMARY")
+
+
+def test_under_budget_history_is_untouched(client):
+    history = tool_exchange(1)
+    assert compression.compress_history(history, config(100_000)) is history
+    assert client.calls == 0
+
+
+@pytest.mark.parametrize("budget", [50, 200, 300, 500, 800, 1200])
+def test_split_never_orphans_a_tool_pair(client, budget):
+    history = [m for n in range(6) for m in tool_exchange(n)]
+    compressed = compression.compress_history(history, config(budget))
+    assert summary(compressed)
+    assert not orphans(compressed[1:])
+    assert compressed[1]["role"] == "user" and isinstance(compressed[1]["content"], str)
+
+
+@pytest.mark.parametrize("overhead", [0, 5_000, 100_000])
+def test_latest_exchange_is_always_kept(client, overhead):
+    history = [m for n in range(4) for m in tool_exchange(n)]
+    compressed = compression.compress_history(history, config(100), overhead_tokens=overhead)
+    assert compressed[-4:] == tool_exchange(3)
+
+
+def test_deprecated_compress_at_still_triggers_by_count(client):
+    history = [m for n in range(3) for m in tool_exchange(n)]
+    assert compression.compress_history(history, config(100_000)) is history
+    compressed = compression.compress_history(history, config(100_000, compress_at=10))
+    assert summary(compressed)
+    assert compressed[-4:] == tool_exchange(2)
@@ -0,0 +1,106 @@
+import asyncio
+import copy
+import json
+import time
+
+import pytest
+
+from pagerduty_sre_bot import daemon, metrics, monitoring
+from pagerduty_sre_bot.config import DEFAULT_CONFIG
+
+REPORT = {"name": "daily-sla", "tool": "check_sla_breaches", "window_hours": 24, "interval_seconds": 86400}
+
+
+def test_valid_reports_pass():
+    daemon.validate_reports([REPORT, {**REPORT, "name": "noisy", "tool": "analyze_patterns", "args": {"limit": 5}}])
+    daemon.validate_reports([])
+
+
+@pytest.mark.parametrize("reports, error", [
+    ([{**REPORT, "name": ""}], "name is required"),
+    ([{k: v for k, v in REPORT.items() if k != "name"}], "name is required"),
+    ([REPORT, REPORT], "duplicate report name"),
+    ([{**REPORT, "tool": "no_such_tool"}], "unknown tool"),
+    ([{k: v for k, v in REPORT.items() if k != "interval_seconds"}], "interval_seconds"),
+    ([{**REPORT, "interval_seconds": 0}], "interval_seconds"),
+    ([{**REPORT, "interval_seconds": "daily"}], "interval_seconds"),
+    ([{**REPORT, "window_hours": -1}], "window_hours"),
+    ([{**REPORT, "args": ["since"]}], "args must be a mapping"),
+    (["daily-sla"], "must be a mapping"),
+    ({"daily-sla": REPORT}, "must be a list"),
+])
+def test_malformed_reports_are_rejected(reports, error):
+    with pytest.raises(ValueError, match=error):
+        daemon.validate_reports(reports)
+
+
+def test_run_exits_2_on_a_bad_report_before_listening(monkeypatch):
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    config["daemon"]["reports"] = [{**REPORT, "interval_seconds": None}]
+    setups = []
+    monkeypatch.setattr(monitoring, "setup_polling", setups.append)
+    assert asyncio.run(daemon.run(config)) == 2
+    assert setups == []
+
+
+# ── HTTP endpoint ─────────────────────────────────────
+
+def get(path: str, poll_interval: float = 60) -> tuple[int, dict, bytes]:
+    """Serve one request through the daemon's handler and return (status, headers, body)."""
+    async def roundtrip():
+        server = await asyncio.start_server(lambda r, w: daemon._serve_http(r, w, poll_interval), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        await writer.drain()
+        raw = await reader.read()
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return raw
+
+    head, _, body = asyncio.run(roundtrip()).partition(b"\r\n\r\n")
+    status_line, *header_lines = head.decode().split("\r\n")
+    headers = dict(line.split(": ", 1) for line in header_lines)
+    assert int(headers["Content-Length"]) == len(body)
+    return int(status_line.split()[1]), headers, body
+
+
+@pytest.fixture
+def health(monkeypatch):
+    state = {**daemon._health, "started_at": time.time(), "last_poll_at": time.time(), "reports": {}}
+    monkeypatch.setattr(daemon, "_health", state)
+    monkeypatch.setattr(monitoring, "push_healthy", lambda: False)
+    return state
+
+
+def test_healthz_reports_ok_while_polling(health):
+    status, headers, body = get("/healthz?verbose=1")
+    assert status == 200
+    assert headers["Content-Type"] == "application/json"
+    payload = json.loads(body)
+    assert payload["status"] == "ok" and payload["push_active"] is False
+    assert "started_at" not in payload and payload["seconds_since_poll"] == 0
+
+
+def test_healthz_degrades_once_polling_stalls(health, monkeypatch):
+    health["last_poll_at"] = time.time() - 181
+    status, _, body = get("/healthz")
+    assert status == 503 and json.loads(body)["status"] == "degraded"
+    # Live webhook deliveries stand in for polling.
+    monkeypatch.setattr(monitoring, "push_healthy", lambda: True)
+    assert get("/healthz")[0] == 200
+
+
+def test_metrics_endpoint_serves_the_exposition(monkeypatch):
+    monkeypatch.setattr(metrics, "_values", {name: {} for name in metrics._METRICS})
+    monkeypatch.setattr(metrics, "_enabled", True)
+    metrics.inc("pdbot_llm_calls_total", model="m")
+    status, headers, body = get("/metrics")
+    assert status == 200
+    assert headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    assert 'pdbot_llm_calls_total{model="m"} 1' in body.decode().splitlines()
+
+
+def test_unknown_path_is_404():
+    assert get("/status")[0] == 404
@@ -0,0 +1,45 @@
+import pytest
+
+from pagerduty_sre_bot.dedup import DedupStore
+
+
+def test_add_reports_duplicates():
+    store = DedupStore(3)
+    assert store.add("P1", "2025-01-15T10:00:00Z") is True
+    assert store.add("P1", "2025-01-15T10:05:00Z") is False
+    assert "P1" in store and len(store) == 1
+
+
+def test_full_store_evicts_the_oldest_insertion():
+    store = DedupStore(3)
+    for i in range(5):
+        store.add(f"P{i}", f"2025-01-15T10:0{i}:00Z")
+    assert len(store) == 3
+    assert "P0" not in store and "P1" not in store
+    assert [iid for iid, _ in store.items()] == ["P2", "P3", "P4"]
+    assert store.add("P0", "2025-01-15T10:09:00Z") is True  # evicted IDs can be seen again
+
+
+def test_expire_drops_from_the_oldest_end():
+    store = DedupStore(5)
+    for i in range(4):
+        store.add(f"P{i}", f"2025-01-15T10:0{i}:00Z")
+    assert store.expire("2025-01-15T10:02:00Z") == 2
+    assert store.items() == [("P2", "2025-01-15T10:02:00Z"), ("P3", "2025-01-15T10:03:00Z")]
+    assert "P0" not in store
+
+
+def test_ring_wraps_around_after_expiry():
+    store = DedupStore(2)
+    store.add("P1", "2025-01-15T10:01:00Z")
+    store.add("P2", "2025-01-15T10:02:00Z")
+    store.expire("2025-01-15T10:02:00Z")
+    store.add("P3", "2025-01-15T10:03:00Z")
+    store.add("P4", "2025-01-15T10:04:00Z")
+    assert [iid for iid, _ in store.items()] == ["P3", "P4"]
+    assert "P2" not in store
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        DedupStore(0)
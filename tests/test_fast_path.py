@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+import pytest
+
+from pagerduty_sre_bot.fast_path import match
+from pagerduty_sre_bot.time_utils import fmt_ts
+
+
+def window_hours(args: dict) -> float:
+    return (fmt_ts(args["until"]) - fmt_ts(args["since"])) / timedelta(hours=1)
+
+
+@pytest.mark.parametrize("query", ["who is on call right now", "Who's on-call?", "show oncalls"])
+def test_oncall_queries(query):
+    assert match(query) == ("oncall_now", "list_oncalls", {"earliest": True})
+
+
+@pytest.mark.parametrize("query, template, tool", [
+    ("list services", "services", "list_services"),
+    ("show all teams", "teams", "list_teams"),
+    ("what schedules are there", "schedules", "list_schedules"),
+])
+def test_directory_queries(query, template, tool):
+    assert match(query) == (template, tool, {})
+
+
+def test_incidents_with_status_urgency_and_window():
+    template, tool, args = match("list high urgency triggered incidents last 6 hours")
+    assert (template, tool) == ("incidents", "list_incidents")
+    assert args["statuses"] == ["triggered"]
+    assert args["urgencies"] == ["high"]
+    assert window_hours(args) == 6
+
+
+def test_open_incidents_default_to_a_long_window():
+    _, _, args = match("show open incidents")
+    assert args["statuses"] == ["triggered", "acknowledged"]
+    assert window_hours(args) == 30 * 24
+
+
+def test_unit_without_number_means_one():
+    _, _, args = match("incidents in the last day")
+    assert window_hours(args) == 24
+
+
+@pytest.mark.parametrize("query", [
+    "",
+    "analyze incidents last week",             # verb outside the vocabulary
+    "show incidents for payment api",          # service name
+    "show incident 1234",                      # incident number, not a window
+    "incidents 1234",
+    "who is on call for the database team",
+])
+def test_anything_else_falls_through(query):
+    assert match(query) is None
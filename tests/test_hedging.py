@@ -0,0 +1,129 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from pagerduty_sre_bot import conversation
+
+PRIMARY, FALLBACK = "primary-model", "fallback-model"
+SLOW = 5.0
+
+
+class FakeAPIError(Exception):
+    pass
+
+
+def message(model):
+    usage = SimpleNamespace(input_tokens=10, output_tokens=2, cache_read_input_tokens=0, cache_creation_input_tokens=0)
+    return SimpleNamespace(model=model, content=[SimpleNamespace(type="text", text=f"from {model}")], usage=usage)
+
+
+class FakeStream:
+    def __init__(self, client, model):
+        self.client, self.model = client, model
+        self.delay, self.fails = client.behaviour[model]
+        self._closed = threading.Event()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __iter__(self):
+        if self._closed.wait(self.delay):
+            raise FakeAPIError(f"{self.model} stream closed")
+        if self.fails:
+            raise FakeAPIError(f"{self.model} failed")
+        yield SimpleNamespace(type="content_block_start", content_block=SimpleNamespace(type="text"))
+        yield SimpleNamespace(type="text", text=f"from {self.model}")
+
+    def get_final_message(self):
+        return message(self.model)
+
+    @property
+    def current_message_snapshot(self):
+        return message(self.model)
+
+    def close(self):
+        self.client.closed.append(self.model)
+        self._closed.set()
+
+
+class FakeClient:
+    """Streams per model with a (delay, fails) behaviour; records every request and close."""
+
+    def __init__(self, behaviour):
+        self.behaviour = behaviour
+        self.requests: list[str] = []
+        self.closed: list[str] = []
+        self.messages = self
+
+    def stream(self, **kwargs):
+        self.requests.append(kwargs["model"])
+        return FakeStream(self, kwargs["model"])
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs["model"])
+        delay, fails = self.behaviour[kwargs["model"]]
+        if fails:
+            raise FakeAPIError(f"{kwargs['model']} failed")
+        return message(kwargs["model"])
+
+
+@pytest.fixture
+def hedge(monkeypatch):
+    def install(behaviour):
+        client = FakeClient(behaviour)
+        monkeypatch.setattr(conversation, "anthropic_client", client)
+        return client
+
+    monkeypatch.setattr(conversation, "_api_errors", lambda: (FakeAPIError,))
+    monkeypatch.setattr(conversation, "cprint", lambda *a, **k: None)
+    conversation.configure(hedge_after_seconds=0.05)
+    yield install
+    conversation.configure(hedge_after_seconds=0.0)
+
+
+def call():
+    return conversation._call_claude("system", [{"role": "user", "content": "hi"}], PRIMARY, FALLBACK)
+
+
+def test_primary_wins_the_race_and_the_hedge_is_closed(hedge):
+    client = hedge({PRIMARY: (0.2, False), FALLBACK: (SLOW, False)})
+    before = conversation.get_hedge_stats()
+    assert call().model == PRIMARY
+    assert client.requests == [PRIMARY, FALLBACK]
+    assert set(client.closed) == {FALLBACK}
+    stats = conversation.get_hedge_stats()
+    assert stats["hedged"] == before["hedged"] + 1
+    assert stats["primary_wins"] == before["primary_wins"] + 1
+
+
+def test_hedge_wins_and_the_slow_primary_is_closed_and_billed(hedge):
+    client = hedge({PRIMARY: (SLOW, False), FALLBACK: (0, False)})
+    before = conversation.get_usage_stats()
+    assert call().model == FALLBACK
+    assert set(client.closed) == {PRIMARY}
+    # The loser records its billed tokens from its own thread once its stream closes.
+    deadline = time.monotonic() + 2
+    while conversation.get_usage_stats()["input_tokens"] == before["input_tokens"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    usage = conversation.get_usage_stats()
+    assert usage["calls"] == before["calls"]  # only answered calls are counted here
+    assert usage["input_tokens"] == before["input_tokens"] + 10  # the abandoned primary
+    assert conversation.get_hedge_stats()["fallback_wins"] >= 1
+
+
+def test_both_failing_raises_without_a_third_request(hedge):
+    client = hedge({PRIMARY: (0.2, True), FALLBACK: (0, True)})
+    with pytest.raises(FakeAPIError, match=f"{PRIMARY} failed"):
+        call()
+    assert sorted(client.requests) == [FALLBACK, PRIMARY]
+
+
+def test_primary_failing_before_the_hedge_falls_back_once(hedge):
+    client = hedge({PRIMARY: (0, True), FALLBACK: (0, False)})
+    assert call().model == FALLBACK
+    assert client.requests == [PRIMARY, FALLBACK]
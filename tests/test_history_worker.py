@@ -0,0 +1,81 @@
+import threading
+
+import pytest
+
+from pagerduty_sre_bot import history_worker
+
+SUMMARY = {"role": "assistant", "content": "[CONVERSATION SUMMARY — earlier context]\n- old"}
+
+
+def turn(n):
+    return [{"role": "user", "content": f"q{n}"}, {"role": "assistant", "content": f"a{n}"}]
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    """Start the worker with a compressor that summarises everything once gated, and record saves."""
+    state = {"saves": [], "gate": threading.Event(), "compressing": threading.Event(), "compress": False}
+
+    def fake_compress(history, config, overhead_tokens=0):
+        if not state["compress"]:
+            return history
+        state["compressing"].set()
+        state["gate"].wait(5)
+        return [SUMMARY]
+
+    monkeypatch.setattr(history_worker, "compress_history", fake_compress)
+    monkeypatch.setattr(history_worker, "save_history", lambda h, args, cfg: state["saves"].append(list(h)))
+    history_worker.start([], args=object(), config={})
+    yield state
+    state["gate"].set()
+    history_worker.shutdown(timeout=5)
+
+
+def test_commit_appends_only_the_new_turn(worker):
+    base = history_worker.current()
+    history_worker.commit(base, base + turn(1))
+    history_worker._jobs.join()
+    assert history_worker.current() == turn(1)
+    assert worker["saves"][-1] == turn(1)
+
+
+def test_commit_from_a_stale_base_keeps_the_merged_summary(worker):
+    history_worker.commit([], turn(1))
+    history_worker._jobs.join()
+    stale = history_worker.current()
+
+    worker["compress"] = True
+    history_worker.commit(stale, stale + turn(2))
+    assert worker["compressing"].wait(5)
+    # A turn that started before the summary lands commits against the old base.
+    history_worker.commit(stale, stale + turn(3))
+    worker["compress"] = False
+    worker["gate"].set()
+    history_worker._jobs.join()
+
+    assert history_worker.current() == [SUMMARY] + turn(3)
+    assert worker["saves"][-1] == [SUMMARY] + turn(3)
+
+    # Even after the summary is merged, only the messages past the stale base are taken.
+    history_worker.commit(stale, stale + turn(4))
+    history_worker._jobs.join()
+    assert history_worker.current() == [SUMMARY] + turn(3) + turn(4)
+
+
+def test_reset_during_compression_discards_the_summary(worker):
+    history_worker.commit([], turn(1))
+    worker["compress"] = True
+    history_worker.commit(turn(1), turn(1) + turn(2))
+    assert worker["compressing"].wait(5)
+    history_worker.reset([])
+    worker["compress"] = False
+    worker["gate"].set()
+    history_worker._jobs.join()
+    assert history_worker.current() == []
+
+
+def test_shutdown_flushes_the_final_history(worker):
+    history_worker.commit([], turn(1))
+    history_worker.commit(turn(1), turn(1) + turn(2))
+    history_worker.shutdown(timeout=5)
+    assert worker["saves"][-1] == turn(1) + turn(2)
@@ -0,0 +1,66 @@
+from datetime import datetime, timezone
+
+from pagerduty_sre_bot.lifecycle import ACKNOWLEDGED, RESOLVED, TRIGGERED, replay_incident
+
+
+def entry(log_type: str, minute: int) -> dict:
+    return {"type": log_type, "created_at": f"2025-01-15T10:{minute:02d}:00Z"}
+
+
+def test_replay_measures_time_in_state_and_per_level():
+    entries = [
+        entry("trigger_log_entry", 0),
+        entry("escalate_log_entry", 5),
+        entry("acknowledge_log_entry", 10),
+        entry("resolve_log_entry", 30),
+    ]
+    r = replay_incident(entries)
+    assert r["state_seconds"] == {TRIGGERED: 600.0, ACKNOWLEDGED: 1200.0}
+    assert r["level_seconds"] == {1: 300.0, 2: 300.0}
+    assert r["escalations"] == 1
+    assert r["final_state"] == RESOLVED
+    assert r["first_ack"] == datetime(2025, 1, 15, 10, 10, tzinfo=timezone.utc)
+
+
+def test_replay_sorts_entries_and_ignores_unknown_types():
+    entries = [
+        entry("resolve_log_entry", 20),
+        entry("notify_log_entry", 1),
+        entry("trigger_log_entry", 0),
+    ]
+    r = replay_incident(entries)
+    assert r["state_seconds"] == {TRIGGERED: 1200.0}
+    assert r["final_state"] == RESOLVED
+
+
+def test_unacknowledge_and_second_trigger_count_as_retriggers():
+    entries = [
+        entry("trigger_log_entry", 0),
+        entry("acknowledge_log_entry", 2),
+        entry("unacknowledge_log_entry", 12),
+        entry("trigger_log_entry", 15),
+        entry("resolve_log_entry", 20),
+    ]
+    r = replay_incident(entries)
+    assert r["retriggers"] == 2
+    assert r["state_seconds"][ACKNOWLEDGED] == 600.0
+
+
+def test_reassignment_waits_count_toward_the_current_level():
+    entries = [
+        entry("trigger_log_entry", 0),
+        entry("assign_log_entry", 4),
+        entry("acknowledge_log_entry", 10),
+        entry("resolve_log_entry", 11),
+    ]
+    r = replay_incident(entries)
+    assert r["reassignments"] == 1
+    assert r["level_seconds"] == {1: 600.0}
+
+
+def test_open_incident_is_measured_up_to_until():
+    until = datetime(2025, 1, 15, 11, 0, tzinfo=timezone.utc)
+    r = replay_incident([entry("trigger_log_entry", 0), entry("acknowledge_log_entry", 30)], until=until)
+    assert r["final_state"] == ACKNOWLEDGED
+    assert r["state_seconds"] == {TRIGGERED: 1800.0, ACKNOWLEDGED: 1800.0}
+    assert r["last_resolve"] is None
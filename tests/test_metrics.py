@@ -0,0 +1,61 @@
+import pytest
+
+from pagerduty_sre_bot import metrics
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics(monkeypatch):
+    monkeypatch.setattr(metrics, "_values", {name: {} for name in metrics._METRICS})
+    monkeypatch.setattr(metrics, "_enabled", True)
+
+
+def series(text: str, name: str) -> list[str]:
+    return [line for line in text.splitlines() if line.startswith(name)]
+
+
+def test_every_metric_has_help_and_type_lines():
+    lines = metrics.render().splitlines()
+    for name, (kind, help_text, _) in metrics._METRICS.items():
+        i = lines.index(f"# HELP {name} {help_text}")
+        assert lines[i + 1] == f"# TYPE {name} {kind}"
+
+
+def test_counter_and_gauge_series_carry_sorted_labels():
+    metrics.inc("pdbot_tool_calls_total", tool="list_incidents", outcome="ok")
+    metrics.inc("pdbot_tool_calls_total", 2, tool="list_incidents", outcome="ok")
+    metrics.set_gauge("pdbot_monitor_watermark_lag_seconds", 42.5)
+    text = metrics.render()
+    assert series(text, "pdbot_tool_calls_total") == ['pdbot_tool_calls_total{outcome="ok",tool="list_incidents"} 3']
+    assert series(text, "pdbot_monitor_watermark_lag_seconds") == ["pdbot_monitor_watermark_lag_seconds 42.5"]
+
+
+def test_histogram_renders_cumulative_buckets_sum_and_count():
+    for rounds in (1, 3, 3, 12):
+        metrics.observe("pdbot_llm_rounds", rounds)
+    lines = series(metrics.render(), "pdbot_llm_rounds")
+    buckets = [line for line in lines if line.startswith("pdbot_llm_rounds_bucket")]
+    assert len(buckets) == len(metrics.ROUND_BUCKETS) + 1
+    assert buckets[0] == 'pdbot_llm_rounds_bucket{le="1"} 1'
+    assert 'pdbot_llm_rounds_bucket{le="3"} 3' in buckets
+    assert buckets[-2] == 'pdbot_llm_rounds_bucket{le="10"} 3'
+    assert buckets[-1] == 'pdbot_llm_rounds_bucket{le="+Inf"} 4'
+    assert lines[-2:] == ["pdbot_llm_rounds_sum 19.0", "pdbot_llm_rounds_count 4"]
+
+
+def test_histogram_labels_precede_le():
+    metrics.observe("pdbot_tool_duration_seconds", 0.01, tool="get_incident")
+    text = metrics.render()
+    assert 'pdbot_tool_duration_seconds_bucket{tool="get_incident",le="+Inf"} 1' in text
+    assert 'pdbot_tool_duration_seconds_count{tool="get_incident"} 1' in text
+
+
+def test_label_values_are_escaped():
+    metrics.inc("pdbot_llm_calls_total", model='a"b\\c\nd')
+    assert series(metrics.render(), "pdbot_llm_calls_total") == ['pdbot_llm_calls_total{model="a\\"b\\\\c\\nd"} 1']
+
+
+def test_nothing_is_recorded_while_disabled(monkeypatch):
+    monkeypatch.setattr(metrics, "_enabled", False)
+    metrics.inc("pdbot_llm_calls_total", model="m")
+    metrics.observe("pdbot_llm_rounds", 2)
+    assert series(metrics.render(), "pdbot_llm_") == []
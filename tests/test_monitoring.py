@@ -0,0 +1,166 @@
+import copy
+import json
+import re
+import time
+from pathlib import Path
+
+import pytest
+
+from pagerduty_sre_bot import monitoring
+from pagerduty_sre_bot.config import DEFAULT_CONFIG
+from pagerduty_sre_bot.monitoring import _rules_from_config, compile_rules, match_rules
+
+
+def incident(**overrides) -> dict:
+    inc = {
+        "id": "P1",
+        "title": "Payment API 5xx rate above 5%",
+        "urgency": "high",
+        "service": {"id": "PSVC1", "summary": "Payment API"},
+        "teams": [{"id": "PTEAM1", "summary": "Payments"}],
+        "priority": {"id": "PPRI1", "summary": "P1"},
+    }
+    inc.update(overrides)
+    return inc
+
+
+RULES = [
+    {"name": "payments-p1", "services": ["payment api"], "priorities": ["P1"]},
+    {"name": "payments-team", "teams": ["PTEAM1"], "urgencies": ["high"]},
+    {"name": "db-titles", "title_regex": r"database|replica lag"},
+    {"services": ["PSVC9"]},
+]
+
+
+def test_rules_are_indexed_by_their_most_selective_scope():
+    index = compile_rules(RULES)
+    assert index["by_service"] == {"payment api": [0], "psvc9": [3]}
+    assert index["by_team"] == {"pteam1": [1]}
+    assert index["unscoped"] == [2]
+    assert index["rules"][3]["name"] == "rule-4"
+
+
+def test_fetch_urgencies_widen_to_any_when_a_rule_takes_any():
+    assert compile_rules([{"urgencies": ["high"]}, {"urgencies": ["low"]}])["fetch_urgencies"] == ["high", "low"]
+    assert compile_rules(RULES)["fetch_urgencies"] == []
+
+
+def test_match_by_service_name_or_id_team_and_priority():
+    index = compile_rules(RULES)
+    assert match_rules(index, incident()) == ["payments-p1", "payments-team"]
+    assert match_rules(index, incident(service={"id": "PSVC9", "summary": "Other"}, teams=[])) == ["rule-4"]
+
+
+def test_every_rule_field_must_match():
+    index = compile_rules(RULES)
+    low = incident(urgency="low", priority={"summary": "P3"})
+    assert match_rules(index, low) == []
+
+
+def test_title_regex_is_case_insensitive():
+    index = compile_rules(RULES)
+    inc = incident(title="DATABASE connections exhausted", service={"id": "PX"}, teams=[])
+    assert match_rules(index, inc) == ["db-titles"]
+
+
+def test_legacy_urgency_filter_becomes_a_default_rule():
+    index = compile_rules(_rules_from_config({"rules": [], "urgency_filter": "high"}))
+    assert match_rules(index, incident()) == ["default"]
+    assert match_rules(index, incident(urgency="low")) == []
+
+
+def test_invalid_title_regex_fails_at_compile_time():
+    with pytest.raises(re.error):
+        compile_rules([{"title_regex": "("}])
+
+
+# ── Polling ───────────────────────────────────────────
+
+def ago(seconds: float) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() - seconds))
+
+
+class FakePagerDuty:
+    """Serves triggered incidents by created_at window, oldest first, like iter_all."""
+
+    def __init__(self):
+        self.incidents: list[dict] = []
+        self.fetches: list[dict] = []
+
+    def add(self, iid: str, created_at: str) -> None:
+        self.incidents.append(incident(id=iid, created_at=created_at))
+
+    def iter_all(self, path, params):
+        self.fetches.append(params)
+        for inc in sorted(self.incidents, key=lambda i: i["created_at"]):
+            if params["since"] <= inc["created_at"] <= params["until"]:
+                yield inc
+
+
+@pytest.fixture
+def poller(monkeypatch, tmp_path):
+    pd = FakePagerDuty()
+    announced: list[str] = []
+    monkeypatch.setattr(monitoring, "pd_client", pd)
+
+    def sink(event, fields):
+        if event == "incident":
+            announced.append(fields["id"])
+
+    monitoring.set_event_sink(sink)
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    config["monitoring"].update(state_file=str(tmp_path / "state.json"), poll_interval_seconds=3600)
+    config["monitoring"]["storm"]["threshold"] = 0
+    yield config, pd, announced
+    monitoring.set_event_sink(None)
+
+
+def test_watermark_survives_a_restart_without_re_alerting(poller):
+    config, pd, announced = poller
+    pd.add("PA", ago(30))
+    state = monitoring.setup_polling(config)
+    assert monitoring.poll_once(state) == 1
+    saved = json.loads(Path(config["monitoring"]["state_file"]).read_text())
+
+    restarted = monitoring.setup_polling(config)
+    assert restarted["watermark"] == saved["watermark"] == state["watermark"]
+    pd.add("PB", ago(5))
+    monitoring.poll_once(restarted)
+    assert announced == ["PA", "PB"]
+
+
+def test_overlap_catches_late_arrivals_without_re_alerting(poller):
+    config, pd, announced = poller
+    pd.add("PA", ago(10))
+    state = monitoring.setup_polling(config)
+    monitoring.poll_once(state)
+    # Created before the watermark but only visible in the API now.
+    pd.add("PLATE", ago(70))
+    monitoring.poll_once(state)
+    assert announced == ["PA", "PLATE"]
+    assert pd.fetches[-1]["since"] <= ago(10 + monitoring.OVERLAP_SECONDS - 5)
+
+
+@pytest.mark.parametrize("content", ["{not json", "[1, 2, 3]", ""])
+def test_corrupt_state_file_starts_fresh(poller, content):
+    config, pd, announced = poller
+    path = Path(config["monitoring"]["state_file"])
+    path.write_text(content)
+    pd.add("PA", ago(60))
+    state = monitoring.setup_polling(config)
+    assert state["watermark"] <= ago(2 * 3600 - 5)
+    monitoring.poll_once(state)
+    assert announced == ["PA"]
+    assert json.loads(path.read_text())["watermark"] == state["watermark"]
+
+
+def test_page_cap_works_through_a_backlog_over_several_cycles(poller):
+    config, pd, announced = poller
+    config["monitoring"]["max_pages_per_poll"] = 1
+    for i in range(250):
+        pd.add(f"P{i:03d}", ago(600 - i))
+    state = monitoring.setup_polling(config)
+    fetched = [monitoring.poll_once(state) for _ in range(4)]
+    assert fetched[0] == fetched[1] == monitoring.PAGE_SIZE
+    assert announced == [f"P{i:03d}" for i in range(250)]
+    assert not state["catching_up"]
@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+import pytest
+
+from pagerduty_sre_bot import prefetch
+from pagerduty_sre_bot.time_utils import now_utc
+
+NOW = now_utc().replace(microsecond=0)
+
+
+def iso(ts):
+    return ts.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+SNAPSHOT = {
+    "total": 3,
+    "incidents": [
+        {"id": "P1", "status": "triggered", "urgency": "high", "service_id": "S1",
+         "created_at": iso(NOW - timedelta(hours=1))},
+        {"id": "P2", "status": "acknowledged", "urgency": "low", "service_id": "S2",
+         "created_at": iso(NOW - timedelta(hours=5))},
+        {"id": "P3", "status": "triggered", "urgency": "high", "service_id": "S2",
+         "created_at": iso(NOW - timedelta(days=3))},
+    ],
+}
+
+
+@pytest.fixture
+def fetched(monkeypatch):
+    """Prefetch with a fake tool executor; returns the calls it made."""
+    calls = []
+
+    def fake_execute(name, args):
+        calls.append((name, args))
+        return SNAPSHOT if name == "list_incidents" else {"oncalls": [{"user": "ana"}]}
+
+    monkeypatch.setattr(prefetch, "execute_tool", fake_execute)
+    monkeypatch.setattr(prefetch, "now_utc", lambda: NOW)
+    prefetch.configure(enabled=True, max_workers=2)
+    yield calls
+    prefetch.reset()
+
+
+def open_incidents(since, until, **extra):
+    return {"since": iso(since), "until": iso(until), "statuses": ["triggered", "acknowledged"], **extra}
+
+
+def test_take_without_a_prefetch_returns_none(fetched):
+    prefetch.start("who is on call", ["list_oncalls", "list_incidents"])
+    assert prefetch.take("list_services", {}) is None
+    assert prefetch.take("list_oncalls", {"schedule_ids": ["S1"]}) is None
+    assert prefetch.take("list_incidents", open_incidents(NOW - timedelta(days=1), NOW)) is None
+
+
+def test_exact_call_is_served_once_fetched(fetched):
+    prefetch.start("who is on call right now", ["list_oncalls"])
+    before = prefetch.get_prefetch_stats()["served"]
+    assert prefetch.take("list_oncalls", {}) == {"oncalls": [{"user": "ana"}]}
+    assert prefetch.get_prefetch_stats()["served"] == before + 1
+    assert fetched == [("list_oncalls", {})]
+
+
+def test_list_incidents_inside_the_snapshot_window_is_served(fetched):
+    prefetch.start("any open incidents?", ["list_incidents"])
+    out = prefetch.take("list_incidents", open_incidents(NOW - timedelta(days=1), NOW))
+    assert [i["id"] for i in out["incidents"]] == ["P1", "P2"]
+    out = prefetch.take("list_incidents", open_incidents(NOW - timedelta(days=7), NOW, urgencies=["high"]))
+    assert [i["id"] for i in out["incidents"]] == ["P1", "P3"]
+    out = prefetch.take("list_incidents", open_incidents(NOW - timedelta(days=7), NOW, service_ids=["S2"], limit=1))
+    assert out["incidents"] == [SNAPSHOT["incidents"][1]] and out["truncated"] is True
+    assert len(fetched) == 1
+
+
+@pytest.mark.parametrize("args", [
+    open_incidents(NOW - timedelta(days=1), NOW + timedelta(minutes=5)),  # ends after the snapshot was taken
+    open_incidents(NOW - timedelta(days=60), NOW),  # starts before the snapshot window
+    {"since": iso(NOW - timedelta(days=1)), "until": iso(NOW)},  # includes resolved incidents
+    open_incidents(NOW - timedelta(days=1), NOW, team_ids=["T1"]),
+    open_incidents(NOW - timedelta(days=1), NOW, sort_by="urgency"),
+    {"statuses": ["triggered"]},  # no window at all
+])
+def test_list_incidents_outside_the_snapshot_is_refused(fetched, args):
+    prefetch.start("any open incidents?", ["list_incidents"])
+    assert prefetch.take("list_incidents", args) is None
+
+
+def test_reset_drops_prefetched_results(fetched):
+    prefetch.start("who is on call", ["list_oncalls"])
+    prefetch.reset()
+    assert prefetch.take("list_oncalls", {}) is None
@@ -0,0 +1,86 @@
+import json
+
+from pagerduty_sre_bot.result_encoder import compact, reduce_result
+
+
+def test_compact_drops_empty_fields():
+    assert compact({"a": 1, "b": None, "c": "", "d": [], "e": {}, "f": {"g": None, "h": 0}}) == {"a": 1, "f": {"h": 0}}
+
+
+def test_homogeneous_records_become_a_table():
+    rows = [
+        {"id": "P1", "status": "triggered", "note": None},
+        {"id": "P2", "status": "resolved", "note": "done"},
+    ]
+    assert compact({"incidents": rows}) == {
+        "incidents": {
+            "columns": ["id", "status", "note"],
+            "rows": [["P1", "triggered", None], ["P2", "resolved", "done"]],
+        },
+    }
+
+
+def test_columns_empty_in_every_row_are_dropped():
+    rows = [{"id": "P1", "note": ""}, {"id": "P2", "note": None}]
+    assert compact(rows) == {"columns": ["id"], "rows": [["P1"], ["P2"]]}
+
+
+def test_heterogeneous_lists_are_not_tabulated():
+    items = [{"a": 1}, {"b": 2}, {"c": 3}]
+    assert compact(items) == items
+    assert compact([{"id": "P1"}]) == [{"id": "P1"}]
+
+
+def test_compact_output_is_json_serialisable():
+    value = {"incidents": [{"id": f"P{i}", "service": {"summary": "api"}} for i in range(3)]}
+    assert json.loads(json.dumps(compact(value))) == compact(value)
+
+
+def incidents(n: int) -> list[dict]:
+    return [
+        {
+            "id": f"P{i:04d}",
+            "title": f"Disk usage high on host-{i}",
+            "urgency": "high" if i % 10 == 0 else "low",
+            "status": "triggered",
+            "service": {"summary": "storage" if i % 2 else "api"},
+            "created_at": f"2025-01-{1 + i % 28:02d}T00:00:00Z",
+        }
+        for i in range(n)
+    ]
+
+
+def test_small_results_are_returned_unchanged():
+    result = {"incidents": incidents(3)}
+    assert reduce_result(result, max_chars=10_000) is result
+
+
+def test_oversized_list_is_reduced_to_fit_and_stays_valid_json():
+    result = {"total": 500, "incidents": incidents(500)}
+    reduced = reduce_result(result, max_chars=4000)
+    assert len(json.dumps(compact(reduced), separators=(",", ":"))) <= 4000
+    assert reduced["truncated"] is True
+    kept = reduced["incidents"]
+    omitted = reduced["incidents_omitted"]
+    assert 0 < len(kept) < 500
+    assert omitted["omitted"] == 500 - len(kept)
+    assert sum(omitted["by_service"].values()) == omitted["omitted"]
+    assert result["incidents"][0]["id"] == "P0000"  # the input is not modified
+
+
+def test_reduction_keeps_high_urgency_rows_first_in_original_order():
+    reduced = reduce_result({"incidents": incidents(500)}, max_chars=3000)
+    kept = reduced["incidents"]
+    assert all(row["urgency"] == "high" for row in kept)
+    assert [row["id"] for row in kept] == sorted(row["id"] for row in kept)
+
+
+def test_lists_are_wrapped_before_reducing():
+    reduced = reduce_result(incidents(300), max_chars=3000)
+    assert "items" in reduced and "items_omitted" in reduced
+
+
+def test_unreducible_results_fall_back_to_a_preview():
+    reduced = reduce_result({"blob": "x" * 10_000}, max_chars=1000)
+    assert reduced["truncated"] is True
+    assert len(reduced["preview"]) == 500
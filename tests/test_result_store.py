@@ -0,0 +1,94 @@
+import pytest
+
+from pagerduty_sre_bot import result_store
+from pagerduty_sre_bot.result_store import PREVIEW_ROWS, offload, read
+
+
+@pytest.fixture(autouse=True)
+def small_store():
+    result_store.configure(offload_chars=500, max_entries=3)
+    result_store.store_clear()
+    yield
+    result_store.configure(offload_chars=8000, max_entries=50)
+    result_store.store_clear()
+
+
+def incidents(n):
+    return [
+        {"id": f"P{i}", "title": f"Disk full on host-{i}", "status": "resolved" if i % 2 else "triggered",
+         "service": {"id": "S1", "summary": "payments" if i % 3 else "search"}}
+        for i in range(n)
+    ]
+
+
+def test_small_results_pass_through():
+    result = {"incidents": incidents(2)}
+    assert offload("list_incidents", result) is result
+    assert result_store.store_size() == 0
+
+
+def test_errors_and_read_result_are_never_offloaded():
+    big = {"error": "x" * 1000}
+    assert offload("list_incidents", big) is big
+    page = {"rows": incidents(40)}
+    assert offload("read_result", page) is page
+    assert result_store.store_size() == 0
+
+
+def test_large_result_is_replaced_by_a_preview():
+    preview = offload("list_incidents", {"incidents": incidents(40), "total": 40})
+    assert len(preview["incidents"]) == PREVIEW_ROWS
+    assert preview["incidents_counts"]["total"] == 40
+    assert preview["incidents_counts"]["by_status"] == {"triggered": 20, "resolved": 20}
+    assert preview["stored_lists"] == {"incidents": 40}
+    assert preview["total"] == 40
+    assert result_store.get(preview["result_handle"])["tool"] == "list_incidents"
+
+
+def test_top_level_record_list_is_pageable_as_items():
+    preview = offload("list_incidents", incidents(40))
+    assert preview["stored_lists"] == {"items": 40}
+    assert len(preview["items"]) == PREVIEW_ROWS
+
+
+def test_lists_of_scalars_are_not_pageable():
+    scalars = [f"host-{i}.example.com" for i in range(200)]
+    assert offload("list_hosts", scalars) is scalars
+    assert offload("list_hosts", {"hosts": scalars}) == {"hosts": scalars}
+    assert result_store.store_size() == 0
+
+
+def test_read_pages_through_the_largest_list():
+    result = {"incident": {"alerts": incidents(3)}, "log_entries": incidents(45)}
+    handle = offload("get_incident", result)["result_handle"]
+    first = read(handle, limit=20)
+    assert first["path"] == "log_entries"
+    assert [r["id"] for r in first["rows"]] == [f"P{i}" for i in range(20)]
+    assert first["next_offset"] == 20
+    last = read(handle, offset=40, limit=20)
+    assert len(last["rows"]) == 5
+    assert "next_offset" not in last
+    assert read(handle, path="incident.alerts")["total"] == 3
+
+
+def test_read_filters_on_reference_labels_and_projects_fields():
+    handle = offload("list_incidents", {"incidents": incidents(40)})["result_handle"]
+    out = read(handle, filters={"service": "SEARCH", "status": "trig"}, fields=["id", "status"])
+    assert out["total"] == 40
+    assert out["matched"] == len([i for i in range(40) if i % 3 == 0 and i % 2 == 0])
+    assert all(set(r) == {"id", "status"} for r in out["rows"])
+    assert all(r["status"] == "triggered" for r in out["rows"])
+
+
+def test_read_reports_bad_handles_and_paths():
+    assert "error" in read("r999")
+    handle = offload("list_incidents", {"incidents": incidents(40)})["result_handle"]
+    out = read(handle, path="nope")
+    assert out["available_paths"] == ["incidents"]
+
+
+def test_oldest_entries_are_evicted():
+    handles = [offload("list_incidents", {"incidents": incidents(40)})["result_handle"] for _ in range(4)]
+    assert result_store.store_size() == 3
+    assert "error" in read(handles[0])
+    assert "error" not in read(handles[-1])
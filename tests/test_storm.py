@@ -0,0 +1,88 @@
+import pytest
+
+from pagerduty_sre_bot.storm import StormCoalescer, title_template
+
+
+def incident(i: int, service: str = "api", title: str | None = None) -> dict:
+    return {"id": f"P{i}", "title": title or f"High latency on host-{i}", "service": {"summary": service}}
+
+
+def storm(threshold: int = 3, **kwargs) -> StormCoalescer:
+    return StormCoalescer(threshold=threshold, window_seconds=60, interval_seconds=30, **kwargs)
+
+
+def test_title_template_masks_variable_parts():
+    assert title_template("Disk 91% full on host-12 (id 3fa85f64-5717)") == "Disk #% full on host-# (id #)"
+
+
+def test_below_threshold_everything_is_announced():
+    s = storm()
+    assert [s.offer(incident(i), ["r"], now=100 + i) for i in range(3)] == ["announce"] * 3
+    assert not s.storming
+    assert s.flush(now=200) is None
+
+
+def test_threshold_crossing_starts_a_storm_and_buffers():
+    s = storm()
+    outcomes = [s.offer(incident(i), ["r"], now=100) for i in range(6)]
+    assert outcomes == ["announce"] * 3 + ["storm_started", "buffered", "buffered"]
+    assert s.storming
+
+
+def test_arrivals_outside_the_window_do_not_count():
+    s = storm()
+    assert [s.offer(incident(i), ["r"], now=100 + 40 * i) for i in range(6)] == ["announce"] * 6
+
+
+def test_flush_waits_for_the_interval_then_digests_groups():
+    s = storm()
+    for i in range(4):
+        s.offer(incident(i, "api"), ["r1"], now=100)
+    for i in range(4, 7):
+        s.offer(incident(i, "db"), ["r2"], now=101)
+    assert s.flush(now=110) is None
+    digest = s.flush(now=131)
+    assert digest["total"] == 4
+    assert [(g["key"], g["count"]) for g in digest["groups"]] == [("db", 3), ("api", 1)]
+    assert digest["groups"][0]["rules"] == ["r2"]
+    assert digest["groups"][0]["examples"] == [{"example": "High latency on host-#", "count": 3, "id": "P4"}]
+    assert digest["ended"] is False  # still more than 3 arrivals in the last 60s
+
+
+def test_storm_ends_once_the_rate_drops():
+    s = storm()
+    for i in range(5):
+        s.offer(incident(i), ["r"], now=100)
+    digest = s.flush(now=200)
+    assert digest["ended"] is True and digest["total"] == 2
+    assert not s.storming
+    assert s.offer(incident(9), ["r"], now=201) == "announce"
+
+
+def test_forced_flush_ends_the_storm():
+    s = storm()
+    for i in range(5):
+        s.offer(incident(i), ["r"], now=100)
+    digest = s.flush(now=101, force=True)
+    assert digest["ended"] is True
+    assert s.flush(now=102, force=True) is None
+
+
+def test_grouping_by_title_template():
+    s = storm(threshold=1, group_by="title")
+    s.offer(incident(0), ["r"], now=100)
+    for i, svc in enumerate(["api", "api", "db"], start=1):
+        s.offer(incident(i, svc), ["r"], now=100)
+    digest = s.flush(now=131, force=True)
+    assert [(g["key"], g["count"]) for g in digest["groups"]] == [("High latency on host-#", 3)]
+    assert [e["example"] for e in digest["groups"][0]["examples"]] == ["api", "db"]
+
+
+def test_threshold_zero_disables_coalescing():
+    s = storm(threshold=0)
+    assert all(s.offer(incident(i), ["r"], now=100) == "announce" for i in range(50))
+
+
+def test_invalid_group_by_is_rejected():
+    with pytest.raises(ValueError):
+        storm(group_by="team")
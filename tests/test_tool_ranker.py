@@ -0,0 +1,56 @@
+from pagerduty_sre_bot.tool_ranker import build_index, rank_tools, tokenize
+from pagerduty_sre_bot.tool_router import _select_groups
+
+TOOLS = [
+    {"name": "list_incidents", "description": "List incidents filtered by status, urgency and time window.",
+     "input_schema": {"properties": {"since": {}, "until": {}, "statuses": {}}}},
+    {"name": "list_oncalls", "description": "Who is on call now for each escalation policy and schedule.",
+     "input_schema": {"properties": {"schedule_ids": {}}}},
+    {"name": "create_schedule_override", "description": "Override a schedule so another user covers a shift.",
+     "input_schema": {"properties": {"schedule_id": {}, "user_id": {}, "start": {}, "end": {}}}},
+    {"name": "generate_postmortem", "description": "Draft a postmortem document for a resolved incident.",
+     "input_schema": {"properties": {"incident_id": {}}}},
+]
+
+
+def names(ranked):
+    return [name for name, _ in ranked]
+
+
+def test_tokenize_stems_and_drops_stopwords():
+    assert tokenize("Show the incidents from last week") == tokenize("incident")
+    assert tokenize("list_incidents") == tokenize("list incident")
+
+
+def test_name_match_ranks_first():
+    index = build_index(TOOLS)
+    assert names(rank_tools(index, "list incidents"))[0] == "list_incidents"
+
+
+def test_synonyms_expand_query_terms():
+    index = build_index(TOOLS)
+    assert names(rank_tools(index, "write an rca"))[0] == "generate_postmortem"
+    assert names(rank_tools(index, "swap my shift"))[0] == "create_schedule_override"
+
+
+def test_scores_are_positive_and_sorted():
+    ranked = rank_tools(build_index(TOOLS), "incident schedule override")
+    scores = [score for _, score in ranked]
+    assert scores and all(s > 0 for s in scores)
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_rarer_terms_weigh_more():
+    index = build_index(TOOLS)
+    assert index["idf"][tokenize("postmortem")[0]] > index["idf"][tokenize("incident")[0]]
+
+
+def test_unmatched_or_empty_query_ranks_nothing():
+    index = build_index(TOOLS)
+    assert rank_tools(index, "the and of") == []
+    assert rank_tools(index, "kubernetes") == []
+
+
+def test_time_words_alone_do_not_select_analytics():
+    assert "analytics" not in _select_groups("who was on call over the last 3 days")
+    assert "analytics" in _select_groups("mttr report for last month")
@@ -0,0 +1,93 @@
+import copy
+import time
+
+import pytest
+
+from pagerduty_sre_bot import monitoring, webhooks
+from pagerduty_sre_bot.config import DEFAULT_CONFIG
+
+SECRET = "whsec-test"
+BODY = b'{"event":{"event_type":"incident.triggered"}}'
+
+
+def test_valid_signature_is_accepted():
+    assert webhooks.verify_signature(BODY, webhooks.sign(BODY, SECRET), SECRET)
+
+
+def test_any_signature_in_a_rotated_header_may_match():
+    header = f"v1=deadbeef, {webhooks.sign(BODY, SECRET)}"
+    assert webhooks.verify_signature(BODY, header, SECRET)
+
+
+def test_tampered_body_or_wrong_secret_is_rejected():
+    header = webhooks.sign(BODY, SECRET)
+    assert not webhooks.verify_signature(BODY + b" ", header, SECRET)
+    assert not webhooks.verify_signature(BODY, header, "other-secret")
+
+
+def test_missing_header_or_secret_is_rejected():
+    assert not webhooks.verify_signature(BODY, None, SECRET)
+    assert not webhooks.verify_signature(BODY, "", SECRET)
+    assert not webhooks.verify_signature(BODY, webhooks.sign(BODY, ""), "")
+
+
+def test_only_incident_events_pause_polling(monkeypatch):
+    pushes = []
+    monkeypatch.setattr(monitoring, "record_push", lambda: pushes.append(1))
+    monkeypatch.setattr(monitoring, "notify_incident", lambda inc: False)
+    webhooks.handle_event({"event_type": "service.updated", "resource_type": "service", "data": {}})
+    assert pushes == []
+    webhooks.handle_event({"event_type": "incident.acknowledged", "resource_type": "incident", "data": {"id": "P1"}})
+    assert pushes == [1]
+
+
+RULES = [
+    {"name": "payments", "services": ["PSVC1", "Payment API"]},
+    {"name": "platform", "teams": ["Platform"]},
+]
+
+
+def test_subscription_scope_must_cover_every_rule():
+    index = monitoring.compile_rules(RULES)
+    assert monitoring.subscription_covers(index, {})
+    assert monitoring.subscription_covers(index, {"services": ["psvc1", "payment api"], "teams": ["platform"]})
+    assert not monitoring.subscription_covers(index, {"services": ["PSVC1", "Payment API"]})
+    assert not monitoring.subscription_covers(index, {"services": ["PSVC1"], "teams": ["Platform"]})
+    unscoped = monitoring.compile_rules([{"name": "any-high", "urgencies": ["high"]}])
+    assert not monitoring.subscription_covers(unscoped, {"teams": ["Platform"]})
+
+
+@pytest.fixture(autouse=True)
+def monitor_state(monkeypatch):
+    """setup_polling() rebinds module state; restore it so other tests see webhooks off."""
+    for name in ("_rules", "_seen", "_storm", "_push_stale_after", "_push_covers_rules", "_backstop_after",
+                 "_last_push", "_last_poll"):
+        monkeypatch.setattr(monitoring, name, getattr(monitoring, name))
+
+
+def setup(tmp_path, scope, backstop=900):
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    config["monitoring"].update(rules=RULES, state_file=str(tmp_path / "state.json"))
+    config["webhooks"].update(enabled=True, scope=scope, backstop_poll_seconds=backstop)
+    return monitoring.setup_polling(config)
+
+
+def test_partially_scoped_subscription_keeps_polling(tmp_path):
+    setup(tmp_path, {"services": ["PSVC1"]})
+    monitoring.record_push()
+    assert not monitoring.push_healthy()
+    assert monitoring.poll_due()
+
+
+def test_covering_subscription_pauses_polling_until_the_backstop(tmp_path, monkeypatch):
+    state = setup(tmp_path, {})
+    monkeypatch.setattr(monitoring, "_fetch_new", lambda *args: [])
+    monitoring.record_push()
+    monitoring.poll_once(state)
+    assert monitoring.push_healthy()
+    assert not monitoring.poll_due()
+    later = time.time() + 901
+    monkeypatch.setattr(monitoring.time, "time", lambda: later)
+    monitoring.record_push()
+    assert monitoring.push_healthy()
+    assert monitoring.poll_due()